@@ -51,10 +51,12 @@ if "bpy" in locals():
     importlib.reload(pdt_library)
     importlib.reload(pdt_view)
     importlib.reload(pdt_xall)
+    importlib.reload(pdt_regions)
     importlib.reload(pdt_bix)
     importlib.reload(pdt_etof)
     importlib.reload(pdt_tangent)
     importlib.reload(pdt_trig_waves)
+    importlib.reload(pdt_api)
 else:
     from . import pdt_design
     from . import pdt_pivot_point
@@ -62,10 +64,15 @@ else:
     from . import pdt_library
     from . import pdt_view
     from . import pdt_xall
+    from . import pdt_regions
     from . import pdt_bix
     from . import pdt_etof
     from . import pdt_tangent
     from . import pdt_trig_waves
+    from . import pdt_api
+
+# Python API for PDT Commands, see pdt_api.
+api = pdt_api
 
 import bpy
 import os
@@ -75,6 +82,7 @@ from bpy.types import (
     PropertyGroup, Scene,
     WindowManager,
     Object,
+    Text,
 )
 from bpy.props import (
     BoolProperty,
@@ -114,6 +122,7 @@ from .pdt_msg_strings import (
     PDT_DES_PPTRANS,
     PDT_DES_PPWIDTH,
     PDT_DES_ROTMOVAX,
+    PDT_DES_SCRIPT,
     PDT_DES_TRIM,
     PDT_DES_VALIDLET,
     PDT_DES_WORPLANE,
@@ -159,6 +168,36 @@ class PDTPreferences(AddonPreferences):
         name="Input Rounding", default=5, description="Rounding Factor for Inputs"
     )
 
+    pdt_xall_tile_edges: IntProperty(
+        name="Intersect All Tiling Threshold",
+        default=100000,
+        min=2,
+        description="Selections of at least this many edges are intersected in tiles, "
+        "by several processes",
+    )
+
+    pdt_xall_processes: IntProperty(
+        name="Intersect All Processes",
+        default=0,
+        min=0,
+        description="Number of processes for tiled Intersect All (0 = one per CPU core)",
+    )
+
+    pdt_merge_moves: BoolProperty(
+        name="Merge Quick Moves",
+        default=False,
+        description="Merge Delta Cursor, Pivot & Grab commands sent in quick succession "
+        "into one move, with one mesh update",
+    )
+
+    pdt_merge_interval: FloatProperty(
+        name="Merge Interval",
+        default=0.1,
+        min=0.01,
+        max=2.0,
+        description="Seconds merged moves wait for more commands before they are run",
+    )
+
     def draw(self, context):
         layout = self.layout
 
@@ -168,6 +207,12 @@ class PDTPreferences(AddonPreferences):
         row1.prop(self, "debug")
         row2.prop(self, "pdt_ui_width")
         row2.prop(self, "pdt_input_round")
+        row3 = box.row()
+        row3.prop(self, "pdt_xall_tile_edges")
+        row3.prop(self, "pdt_xall_processes")
+        row4 = box.row()
+        row4.prop(self, "pdt_merge_moves")
+        row4.prop(self, "pdt_merge_interval")
 
 
 def enumlist_objects(self, context):
@@ -405,6 +450,7 @@ class PDTSceneProperties(PropertyGroup):
         name="Maths output", default=0, description=PDT_DES_OUTPUT,
     )
     error: StringProperty(name="Error", default="")
+    command_script: PointerProperty(name="Script", type=Text, description=PDT_DES_SCRIPT)
 
     # Was pivot* -- is now pivot_*
     pivot_loc: FloatVectorProperty(
@@ -517,6 +563,7 @@ classes = (
     PDTSceneProperties,
     pdt_bix.PDT_OT_LineOnBisection,
     pdt_command.PDT_OT_CommandReRun,
+    pdt_command.PDT_OT_RunScript,
     pdt_design.PDT_OT_PlacementAbs,
     pdt_design.PDT_OT_PlacementDelta,
     pdt_design.PDT_OT_PlacementDis,
@@ -568,6 +615,8 @@ classes = (
     pdt_view.PDT_OT_ViewIso,
     pdt_view.PDT_OT_Reset3DView,
     pdt_xall.PDT_OT_IntersectAllEdges,
+    pdt_xall.PDT_OT_IntersectAllModal,
+    pdt_regions.PDT_OT_FillRegions,
 )
 
 
@@ -600,6 +649,8 @@ def unregister():
 
     from bpy.utils import unregister_class
 
+    if bpy.app.timers.is_registered(pdt_command.flush_command_queue):
+        bpy.app.timers.unregister(pdt_command.flush_command_queue)
     # remove OpenGL data
     pdt_pivot_point.PDT_OT_ModalDrawOperator.handle_remove(
         pdt_pivot_point.PDT_OT_ModalDrawOperator, bpy.context
@@ -0,0 +1,292 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Intersect All Benchmarks.
+#
+# Times the three stages of Intersect All, get_valid_permutations,
+# get_intersection_dictionary and update_mesh, on generated edge sets of
+# increasing size and writes the timings to a JSON file.
+#
+# Run in background Blender:
+#     blender -b --python benchmarks/bench_xall.py -- --output blender.json
+#
+# or with plain Python, using the stand-ins in benchmarks/standins.py:
+#     python benchmarks/bench_xall.py --output standin.json
+#
+import argparse
+import importlib
+import json
+import os
+import platform
+import sys
+import time
+import types
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(BENCH_DIR)
+
+try:
+    import bpy  # noqa: F401
+    IN_BLENDER = True
+except ImportError:
+    sys.path.insert(0, BENCH_DIR)
+    import standins
+
+    standins.install()
+    IN_BLENDER = False
+
+import bmesh
+
+DEFAULT_SIZES = (100, 1000, 10000, 100000)
+GRID_LINES = 10
+
+
+def load_addon_module(name):
+    """Import one of the Add-on's Modules without registering the Add-on.
+
+    Args:
+        name: Module name, e.g. "pdt_xall"
+
+    Returns:
+        The imported Module.
+    """
+
+    if "pdt_bench" not in sys.modules:
+        package = types.ModuleType("pdt_bench")
+        package.__path__ = [ADDON_DIR]
+        sys.modules["pdt_bench"] = package
+    return importlib.import_module(f"pdt_bench.{name}")
+
+
+def grid_edges(num_edges, rng, lines=GRID_LINES):
+    """Make Tiles of N x N Orthogonal Grid Lines.
+
+    Note:
+        Each tile has N lines each way crossing at N * N points, tiles are laid out
+        side by side without touching, so crossings grow with the number of edges.
+
+    Args:
+        num_edges: Number of Edges wanted
+        rng: NumPy Random Generator, unused
+        lines: Lines each way in a tile
+
+    Returns:
+        Float Array of Edge Coordinates, shape (N, 2, 3).
+    """
+
+    num_tiles = max(num_edges // (2 * lines), 1)
+    columns = int(np.ceil(np.sqrt(num_tiles)))
+    offsets = np.arange(lines, dtype=np.float64)
+    edges = []
+    for tile in range(num_tiles):
+        origin = np.array([tile % columns, tile // columns, 0.0]) * (lines + 1)
+        for offset in offsets:
+            edges.append((origin + (-0.5, offset, 0), origin + (lines - 0.5, offset, 0)))
+            edges.append((origin + (offset, -0.5, 0), origin + (offset, lines - 0.5, 0)))
+    return np.array(edges[:num_edges], dtype=np.float64)
+
+
+def random_edges(num_edges, rng):
+    """Make a Soup of Random Unit Length Segments on the XY plane.
+
+    Note:
+        The area grows with the number of edges, so each edge crosses a few others
+        at every size.
+
+    Args:
+        num_edges: Number of Edges wanted
+        rng: NumPy Random Generator
+
+    Returns:
+        Float Array of Edge Coordinates, shape (N, 2, 3).
+    """
+
+    side = np.sqrt(num_edges)
+    start = rng.random((num_edges, 3)) * (side, side, 0.0)
+    angle = rng.random(num_edges) * 2.0 * np.pi
+    end = start + np.stack((np.cos(angle), np.sin(angle), np.zeros(num_edges)), axis=1)
+    return np.stack((start, end), axis=1)
+
+
+def near_parallel_edges(num_edges, rng):
+    """Make Pairs of Segments that cross at very small Angles.
+
+    Note:
+        Half the pairs cross at angles from 1e-7 to 1e-3 radians, around the limit
+        below which edges count as parallel, the rest are collinear overlaps. These
+        exercise the exact fallback of pdt_predicates.
+
+    Args:
+        num_edges: Number of Edges wanted
+        rng: NumPy Random Generator
+
+    Returns:
+        Float Array of Edge Coordinates, shape (N, 2, 3).
+    """
+
+    num_pairs = max(num_edges // 2, 1)
+    columns = int(np.ceil(np.sqrt(num_pairs)))
+    pair = np.arange(num_pairs)
+    origin = np.stack((pair % columns * 3.0, pair // columns * 3.0, np.zeros(num_pairs)), axis=1)
+    angle = 10.0 ** rng.uniform(-7.0, -3.0, num_pairs)
+    angle[pair % 2 == 1] = 0.0
+    half = np.stack((np.cos(angle), np.sin(angle), np.zeros(num_pairs)), axis=1)
+    flat = np.array([1.0, 0.0, 0.0])
+    first = np.stack((origin - flat, origin + flat), axis=1)
+    second = np.stack((origin - half * 0.9, origin + half * 0.9), axis=1)
+    return np.concatenate((first, second))[:num_edges]
+
+
+CASES = {
+    "grid": grid_edges,
+    "random": random_edges,
+    "near_parallel": near_parallel_edges,
+}
+
+
+def build_bmesh(coords):
+    """Make a BMesh holding the Edges, all selected.
+
+    Args:
+        coords: Float Array of Edge Coordinates, shape (N, 2, 3)
+
+    Returns:
+        BMesh and List of Edge Indices.
+    """
+
+    bm = bmesh.new()
+    for start, end in coords:
+        edge = bm.edges.new((bm.verts.new(start), bm.verts.new(end)))
+        edge.select = True
+    bm.verts.index_update()
+    bm.edges.index_update()
+    bm.verts.ensure_lookup_table()
+    bm.edges.ensure_lookup_table()
+    return bm, list(range(len(coords)))
+
+
+def time_stages(pdt_xall, coords):
+    """Time the Stages of Intersect All on one Edge Set.
+
+    Args:
+        pdt_xall: The pdt_xall Module
+        coords: Float Array of Edge Coordinates, shape (N, 2, 3)
+
+    Returns:
+        Dictionary of Timings in seconds, and Counts.
+    """
+
+    bm, edge_indices = build_bmesh(coords)
+
+    started = time.perf_counter()
+    permutations = pdt_xall.get_valid_permutations(bm, edge_indices)
+    permutations_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    int_dict = pdt_xall.get_intersection_dictionary(bm, edge_indices)
+    intersections_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    new_edges = pdt_xall.update_mesh(bm, int_dict)
+    update_time = time.perf_counter() - started
+    bm.free()
+
+    return {
+        "get_valid_permutations": permutations_time,
+        "get_intersection_dictionary": intersections_time,
+        "update_mesh": update_time,
+        "candidate_pairs": len(permutations),
+        "intersected_edges": len(int_dict),
+        "new_edges": len(new_edges),
+    }
+
+
+def run(cases, sizes, repeat, seed):
+    """Run the Benchmarks.
+
+    Args:
+        cases: Names of Cases, see CASES
+        sizes: Numbers of Edges
+        repeat: Number of runs of each, the fastest time of each stage is kept
+        seed: Random Seed
+
+    Returns:
+        List of Result Dictionaries.
+    """
+
+    pdt_xall = load_addon_module("pdt_xall")
+    results = []
+    for case in cases:
+        for size in sizes:
+            coords = CASES[case](size, np.random.default_rng(seed))
+            runs = [time_stages(pdt_xall, coords) for _ in range(repeat)]
+            result = dict(runs[0], case=case, edges=len(coords))
+            for stage in ("get_valid_permutations", "get_intersection_dictionary", "update_mesh"):
+                result[stage] = min(run_result[stage] for run_result in runs)
+            results.append(result)
+            print(
+                f"{case:>14} {len(coords):>7} edges:"
+                f" permutations {result['get_valid_permutations']:.4f}s,"
+                f" intersections {result['get_intersection_dictionary']:.4f}s,"
+                f" update_mesh {result['update_mesh']:.4f}s"
+            )
+    return results
+
+
+def main(argv):
+    """Parse Arguments, run the Benchmarks and write the JSON Report.
+
+    Args:
+        argv: Command line Arguments, after "--" when run by Blender
+
+    Returns:
+        Nothing.
+    """
+
+    parser = argparse.ArgumentParser(description="Benchmark PDT Intersect All.")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=sorted(CASES))
+    parser.add_argument("--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_xall.json")
+    args = parser.parse_args(argv)
+
+    report = {
+        "environment": {
+            "blender": bpy.app.version_string if IN_BLENDER else None,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": run(args.cases, args.sizes, args.repeat, args.seed),
+    }
+    with open(args.output, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:])
@@ -0,0 +1,251 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Pure Python stand-ins for the Blender modules PDT imports.
+#
+# Only the parts used by Intersect All are provided: a small BMesh with vertices and
+# edges, mathutils.Vector and mathutils.geometry, and empty bpy, bgl, gpu and
+# gpu_extras modules so the add-on's modules can be imported outside of Blender.
+#
+import math
+import sys
+import types
+
+
+class Vector:
+    """Stand-in for mathutils.Vector, 3D only."""
+
+    __slots__ = ("_co",)
+
+    def __init__(self, co=(0.0, 0.0, 0.0)):
+        self._co = tuple(float(value) for value in co)
+
+    def __iter__(self):
+        return iter(self._co)
+
+    def __len__(self):
+        return len(self._co)
+
+    def __getitem__(self, index):
+        return self._co[index]
+
+    def __repr__(self):
+        return f"Vector({self._co})"
+
+    def __eq__(self, other):
+        return self._co == tuple(other)
+
+    def __hash__(self):
+        return hash(self._co)
+
+    def __add__(self, other):
+        return Vector(a + b for a, b in zip(self._co, other))
+
+    def __sub__(self, other):
+        return Vector(a - b for a, b in zip(self._co, other))
+
+    def __mul__(self, scale):
+        return Vector(a * scale for a in self._co)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, scale):
+        return Vector(a / scale for a in self._co)
+
+    def __neg__(self):
+        return Vector(-a for a in self._co)
+
+    def dot(self, other):
+        return sum(a * b for a, b in zip(self._co, other))
+
+    @property
+    def length(self):
+        return math.sqrt(self.dot(self))
+
+    x = property(lambda self: self._co[0])
+    y = property(lambda self: self._co[1])
+    z = property(lambda self: self._co[2])
+
+
+def intersect_point_line(point, line_a, line_b):
+    """Stand-in for mathutils.geometry.intersect_point_line."""
+
+    point, line_a, line_b = Vector(point), Vector(line_a), Vector(line_b)
+    direction = line_b - line_a
+    length = direction.dot(direction)
+    percent = (point - line_a).dot(direction) / length if length else 0.0
+    return line_a + direction * percent, percent
+
+
+def intersect_line_line(v1, v2, v3, v4):
+    """Stand-in for mathutils.geometry.intersect_line_line."""
+
+    v1, v2, v3, v4 = Vector(v1), Vector(v2), Vector(v3), Vector(v4)
+    dir_a = v2 - v1
+    dir_b = v4 - v3
+    offset = v1 - v3
+    len_a = dir_a.dot(dir_a)
+    len_b = dir_b.dot(dir_b)
+    dot_ab = dir_a.dot(dir_b)
+    denom = len_a * len_b - dot_ab * dot_ab
+    if denom <= 1.0e-12 * len_a * len_b or not len_a or not len_b:
+        return None
+    t_a = (dot_ab * dir_b.dot(offset) - dir_a.dot(offset) * len_b) / denom
+    t_b = (len_a * dir_b.dot(offset) - dot_ab * dir_a.dot(offset)) / denom
+    return v1 + dir_a * t_a, v3 + dir_b * t_b
+
+
+class BMVert:
+    """Stand-in for bmesh.types.BMVert."""
+
+    __slots__ = ("co", "index", "select", "hide", "is_valid", "link_count")
+
+    def __init__(self, co):
+        self.co = Vector(co)
+        self.index = -1
+        self.select = False
+        self.hide = False
+        self.is_valid = True
+        self.link_count = 0
+
+
+class BMEdge:
+    """Stand-in for bmesh.types.BMEdge."""
+
+    __slots__ = ("verts", "index", "select", "hide", "is_valid")
+
+    def __init__(self, verts):
+        self.verts = tuple(verts)
+        self.index = -1
+        self.select = False
+        self.hide = False
+        self.is_valid = True
+
+
+class BMElemSeq:
+    """Stand-in for the vertex and edge sequences of a BMesh."""
+
+    def __init__(self, bm, element_type):
+        self._bm = bm
+        self._type = element_type
+        self._items = []
+
+    def __iter__(self):
+        return (item for item in self._items if item.is_valid)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __getitem__(self, index):
+        return self._items[index]
+
+    def new(self, arg):
+        item = self._type(arg)
+        item.index = len(self._items)
+        self._items.append(item)
+        if self._type is BMEdge:
+            key = frozenset(item.verts)
+            if key in self._bm.edge_map:
+                raise ValueError("edges.new(): this edge exists")
+            self._bm.edge_map[key] = item
+            for vert in item.verts:
+                vert.link_count += 1
+        return item
+
+    def get(self, verts):
+        return self._bm.edge_map.get(frozenset(verts))
+
+    def ensure_lookup_table(self):
+        self._items = [item for item in self._items if item.is_valid]
+
+    def index_update(self):
+        self.ensure_lookup_table()
+        for index, item in enumerate(self._items):
+            item.index = index
+
+
+class BMesh:
+    """Stand-in for bmesh.types.BMesh, vertices and edges only."""
+
+    def __init__(self):
+        self.edge_map = {}
+        self.verts = BMElemSeq(self, BMVert)
+        self.edges = BMElemSeq(self, BMEdge)
+
+    def normal_update(self):
+        pass
+
+    def free(self):
+        pass
+
+
+def delete(bm, geom=(), context="VERTS"):
+    """Stand-in for bmesh.ops.delete, for context "EDGES".
+
+    Note:
+        Like Blender, vertices no longer used by any edge are deleted too.
+    """
+
+    for edge in geom:
+        if not edge.is_valid:
+            continue
+        edge.is_valid = False
+        del bm.edge_map[frozenset(edge.verts)]
+        for vert in edge.verts:
+            vert.link_count -= 1
+            if vert.link_count == 0:
+                vert.is_valid = False
+    return {}
+
+
+def install():
+    """Put the Stand-in Modules into sys.modules.
+
+    Returns:
+        Nothing.
+    """
+
+    def module(name, **attributes):
+        new_module = types.ModuleType(name)
+        new_module.__dict__.update(attributes)
+        sys.modules[name] = new_module
+        return new_module
+
+    geometry = module(
+        "mathutils.geometry",
+        intersect_line_line=intersect_line_line,
+        intersect_point_line=intersect_point_line,
+    )
+    module("mathutils", Vector=Vector, Quaternion=object, Matrix=object, geometry=geometry)
+
+    bmesh_types = module("bmesh.types", BMesh=BMesh, BMVert=BMVert, BMEdge=BMEdge)
+    bmesh_ops = module("bmesh.ops", delete=delete)
+    module("bmesh", new=BMesh, types=bmesh_types, ops=bmesh_ops)
+
+    bpy_types = module("bpy.types", Operator=object, Panel=object, PropertyGroup=object)
+    module("bpy", types=bpy_types, app=types.SimpleNamespace(background=True), context=None)
+    module("bgl")
+    module("gpu")
+    gpu_batch = module("gpu_extras.batch", batch_for_shader=None)
+    module("gpu_extras", batch=gpu_batch)
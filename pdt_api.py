@@ -0,0 +1,260 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Python API for PDT Commands.
+#
+# Runs the same code as the Command Line, but from numbers, so values are neither
+# formatted into a command string, rounded, nor parsed again. Available as the
+# Add-on's "api" attribute, for example:
+#
+#     import precision_drawing_tools as pdt
+#     pdt.api.move((1.0, 0.0, 0.25), mode="d")
+#     with pdt.api.batch():
+#         pdt.api.new_vertex((0.0, 0.0, 0.0))
+#         pdt.api.extrude_vertices((2.5, 45.0), mode="i")
+#
+# Modes are those of the Command Line: "a" Absolute, "d" Delta, "i" Distance at
+# Angle and "p" Percent. The working plane and selection mode are read from the
+# PDT panel settings as for any command. Failures raise PDT_CommandFailure.
+#
+from contextlib import contextmanager
+
+import bpy
+import numpy as np
+from .pdt_command import (
+    Command,
+    OPERATION_MODES,
+    compile_command,
+    run_command,
+)
+from .pdt_functions import command_script, set_view_matrix
+from .pdt_msg_strings import PDT_ERR_NON_VALID, PDT_ERR_NO_POINTS
+
+from . import pdt_exception
+PDT_CommandFailure = pdt_exception.CommandFailure
+
+
+def execute(operation, mode, values, context=None, repeat=1):
+    """Run a Command from its Letters and Values.
+
+    Args:
+        operation: First Letter, see pdt_command.OPERATION_MODES
+        mode: Second Letter
+        values: Number, or Sequence of Numbers such as a Vector
+        context: Blender bpy.context instance, bpy.context if not given
+        repeat: Number of Copies, Duplicate and Extrude only
+
+    Returns:
+        Nothing.
+
+    Raises:
+        PDT_CommandFailure: The Command failed, the message says why.
+    """
+
+    operation = operation.upper()
+    mode = mode.lower()
+    if mode not in OPERATION_MODES.get(operation, ()):
+        raise PDT_CommandFailure(f"'{mode}' {PDT_ERR_NON_VALID} '{operation}'")
+    if isinstance(values, (int, float)):
+        values = (values,)
+    values = tuple(float(value) for value in values)
+    text = f"{operation}{mode}{','.join(str(value) for value in values)}"
+    command = Command(text, operation, mode, values, repeat=int(repeat))
+    run_command(context or bpy.context, command)
+
+
+def command(text, context=None):
+    """Run a Command String, as typed into the Command Line.
+
+    Note:
+        Use this for Commands without values, such as "intall" or "otc".
+
+    Args:
+        text: The Command String
+        context: Blender bpy.context instance, bpy.context if not given
+
+    Returns:
+        Nothing.
+
+    Raises:
+        PDT_CommandFailure: The Command failed, the message says why.
+    """
+
+    context = context or bpy.context
+    decimal_places = context.preferences.addons[__package__].preferences.pdt_input_round
+    run_command(context, compile_command(text.strip(), decimal_places))
+
+
+@contextmanager
+def batch():
+    """Run several API calls with One Mesh Update.
+
+    Note:
+        The calls share the Edit Mode Bmesh, which is only synced to the mesh when
+        the with block ends, like a Command Script.
+
+    Returns:
+        Context Manager.
+    """
+
+    command_script.start()
+    try:
+        yield
+    finally:
+        command_script.finish()
+
+
+def cursor(values, mode="a", context=None):
+    """Move the 3D Cursor, see execute."""
+    execute("C", mode, values, context)
+
+
+def pivot(values, mode="a", context=None):
+    """Move the PDT Pivot Point, see execute."""
+    execute("P", mode, values, context)
+
+
+def move(values, mode="d", context=None):
+    """Move Selected Geometry, or Selected Objects, see execute."""
+    execute("G", mode, values, context)
+
+
+def new_vertex(values, mode="a", context=None):
+    """Add a New Vertex, see execute."""
+    execute("N", mode, values, context)
+
+
+def split_edges(values, mode="p", context=None):
+    """Split Selected Edges, see execute."""
+    execute("S", mode, values, context)
+
+
+def extrude_vertices(values, mode="d", context=None):
+    """Extrude Selected Vertices Only, see execute."""
+    execute("V", mode, values, context)
+
+
+def extrude(values, mode="d", context=None, repeat=1):
+    """Extrude Selected Geometry, repeat times, see execute."""
+    execute("E", mode, values, context, repeat)
+
+
+def duplicate(values, mode="d", context=None, repeat=1):
+    """Duplicate Selected Geometry, making repeat evenly spaced copies, see execute."""
+    execute("D", mode, values, context, repeat)
+
+
+def polar_array(count, angle=360.0, context=None):
+    """Polar Array of Selected Geometry about the Pivot Point, see pdt_command.polar_array."""
+    execute("A", "p", (count, angle), context)
+
+
+def execute_array(operation, points, context=None):
+    """Run an Array Command on Absolute Points.
+
+    Args:
+        operation: First Letter, "N" or "V"
+        points: Array like of Absolute Points, shape (N, 3)
+        context: Blender bpy.context instance, bpy.context if not given
+
+    Returns:
+        Nothing.
+
+    Raises:
+        PDT_CommandFailure: The Command failed, the message says why.
+    """
+
+    points = np.array(points, dtype=np.float64).reshape(-1, 3)
+    if not len(points):
+        raise PDT_CommandFailure(f"{PDT_ERR_NO_POINTS} points")
+    points.flags.writeable = False
+    text = f"{operation}a {len(points)} points"
+    run_command(context or bpy.context, Command(text, operation, "a", (), points=points))
+
+
+def new_vertices(points, context=None):
+    """Add a New Vertex at each Absolute Point, with one Mesh Update, see execute_array."""
+    execute_array("N", points, context)
+
+
+def extrude_polyline(points, context=None):
+    """Extrude a Polyline through Absolute Points from the Selected Vertices, see execute_array."""
+    execute_array("V", points, context)
+
+
+def plot(expression, t_start, t_end, samples, context=None):
+    """Plot an Expression in t as a Polyline, see pdt_command.command_plot.
+
+    Args:
+        expression: Expression in t, e.g. "(cos(t), sin(t))"
+        t_start: First value of t
+        t_end: Last value of t
+        samples: Number of Points
+        context: Blender bpy.context instance, bpy.context if not given
+
+    Returns:
+        Nothing.
+
+    Raises:
+        PDT_CommandFailure: The Command failed, the message says why.
+    """
+
+    command(f"mt{expression};{float(t_start)!r};{float(t_end)!r};{int(samples)}", context)
+
+
+def fillet(radius, segments=1, profile=0.5, mode="v", context=None):
+    """Fillet Selected Vertices, "v", Edges, "e", or Intersect two Edges and Fillet, "i".
+
+    Args:
+        radius: Fillet Radius
+        segments: Number of Segments
+        profile: Profile, 0.5 is circular
+        mode: Fillet Mode, "v", "e" or "i"
+        context: Blender bpy.context instance, bpy.context if not given
+
+    Returns:
+        Nothing.
+
+    Raises:
+        PDT_CommandFailure: The Command failed, the message says why.
+    """
+
+    execute("F", mode, (radius, segments, profile), context)
+
+
+def view_matrix(matrix):
+    """Set the View Matrix of View Plane, "LO", Commands when there is no 3D View.
+
+    Note:
+        Needed in background Blender, where there is no Screen, see
+        pdt_functions.set_view_matrix. Pass None to clear it.
+
+    Args:
+        matrix: 4x4 View Matrix, or None
+
+    Returns:
+        Nothing.
+    """
+
+    set_view_matrix(matrix)
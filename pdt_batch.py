@@ -0,0 +1,217 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Headless Batch Runner for PDT Command Scripts.
+#
+# Runs a Command Script, one PDT command to a line, on many .blend files. Each file
+# is opened by its own background Blender, several at a time, the script is run
+# with pdt_command.run_script, the file is saved and the time taken and errors of
+# every file are written to a JSON report:
+#     python pdt_batch.py --script macro.txt --report report.json drawings/*.blend
+#
+# Each background Blender runs this file again as its worker, see run_worker. This
+# file is not imported by the Add-on and must not import bpy at the top.
+#
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ADDON_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Lines of a failed Blender's output kept in the report.
+OUTPUT_TAIL_LINES = 20
+
+
+def run_worker(script_path, result_path, mode, object_name, save):
+    """Run a Command Script on the open .blend File, inside background Blender.
+
+    Note:
+        Enables the Add-on from this folder, makes object_name, or the file's
+        active Object, active in the given mode, runs the script, returns to
+        Object mode so edits are written to the mesh and saves the file.
+
+    Args:
+        script_path: Path of the Command Script
+        result_path: Path the JSON Result is written to
+        mode: Mode to run the Commands in, "OBJECT" or "EDIT"
+        object_name: Name of the Object to make active, or None
+        save: Save the File when done
+
+    Returns:
+        Nothing.
+    """
+
+    import addon_utils
+    import bpy
+
+    started = time.perf_counter()
+    result = {"file": bpy.data.filepath, "errors": []}
+    try:
+        sys.path.insert(0, os.path.dirname(ADDON_DIR))
+        package = os.path.basename(ADDON_DIR)
+        # default_set adds the Add-on to the Preferences, where commands read its
+        # settings. Background Blender does not save the Preferences.
+        #
+        if addon_utils.enable(package, default_set=True) is None:
+            raise RuntimeError(f"Add-on {package} could not be enabled")
+        if bpy.context.preferences.addons.get(package) is None:
+            raise RuntimeError(f"Add-on {package} is not in the Preferences")
+        pdt_command = importlib.import_module(f"{package}.pdt_command")
+
+        context = bpy.context
+        obj = context.view_layer.objects.active
+        if object_name is not None:
+            obj = context.view_layer.objects[object_name]
+            context.view_layer.objects.active = obj
+        if obj is not None and obj.mode != mode:
+            bpy.ops.object.mode_set(mode=mode)
+
+        with open(script_path) as script_file:
+            script = script_file.read()
+        script_started = time.perf_counter()
+        result["errors"] = pdt_command.run_script(context, script)
+        result["script_seconds"] = time.perf_counter() - script_started
+
+        obj = context.view_layer.objects.active
+        if obj is not None and obj.mode != "OBJECT":
+            bpy.ops.object.mode_set(mode="OBJECT")
+        if save:
+            bpy.ops.wm.save_mainfile()
+    except Exception as error:
+        result["errors"].append(f"{type(error).__name__}: {error}")
+    result["worker_seconds"] = time.perf_counter() - started
+    with open(result_path, "w") as result_file:
+        json.dump(result, result_file)
+
+
+def run_file(blender, path, options):
+    """Run the Command Script on one .blend File in a background Blender.
+
+    Args:
+        blender: Blender Executable
+        path: Path of the .blend File
+        options: Parsed Arguments, see main
+
+    Returns:
+        Result Dictionary of the File.
+    """
+
+    handle, result_path = tempfile.mkstemp(suffix=".json", prefix="pdt_batch_")
+    os.close(handle)
+    command = [
+        blender, "-b", "--factory-startup", path,
+        "--python-exit-code", "1",
+        "--python", os.path.abspath(__file__), "--",
+        "--worker",
+        "--script", os.path.abspath(options.script),
+        "--result", result_path,
+        "--mode", options.mode,
+    ]
+    if options.object is not None:
+        command += ["--object", options.object]
+    if options.no_save:
+        command.append("--no-save")
+
+    started = time.perf_counter()
+    try:
+        process = subprocess.run(
+            command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            universal_newlines=True, timeout=options.timeout,
+        )
+        output, returncode = process.stdout, process.returncode
+    except (OSError, subprocess.TimeoutExpired) as error:
+        output, returncode = str(error), None
+    seconds = time.perf_counter() - started
+
+    try:
+        with open(result_path) as result_file:
+            result = json.load(result_file)
+    except (OSError, ValueError):
+        result = {"errors": ["Blender gave no result"]}
+    finally:
+        os.remove(result_path)
+
+    result.update(file=path, seconds=seconds, returncode=returncode)
+    if returncode != 0:
+        result["output"] = output.splitlines()[-OUTPUT_TAIL_LINES:]
+    return result
+
+
+def main(argv):
+    """Parse Arguments, then run the Batch, or the Worker inside Blender.
+
+    Args:
+        argv: Command line Arguments, after "--" when run by Blender
+
+    Returns:
+        Exit Status, 1 if any File had Errors.
+    """
+
+    parser = argparse.ArgumentParser(description="Run a PDT Command Script on .blend files.")
+    parser.add_argument("files", nargs="*", help=".blend files to run the script on")
+    parser.add_argument("--script", required=True, help="Command Script, one command a line")
+    parser.add_argument("--report", default="pdt_batch.json", help="JSON report written")
+    parser.add_argument("--blender", default=os.environ.get("BLENDER", "blender"))
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--mode", choices=("OBJECT", "EDIT"), default="EDIT")
+    parser.add_argument("--object", help="Object to make active, default the file's active")
+    parser.add_argument("--timeout", type=float, help="Seconds allowed for each file")
+    parser.add_argument("--no-save", action="store_true", help="Do not save the files")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    options = parser.parse_args(argv)
+
+    if options.worker:
+        run_worker(
+            options.script, options.result, options.mode, options.object, not options.no_save,
+        )
+        return 0
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(options.jobs, 1)) as pool:
+        results = list(
+            pool.map(lambda path: run_file(options.blender, path, options), options.files)
+        )
+    report = {
+        "script": os.path.abspath(options.script),
+        "jobs": options.jobs,
+        "seconds": time.perf_counter() - started,
+        "files": results,
+    }
+    with open(options.report, "w") as report_file:
+        json.dump(report, report_file, indent=2)
+
+    failed = [result["file"] for result in results if result["errors"]]
+    print(f"{len(results) - len(failed)} of {len(results)} files done without errors")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]))
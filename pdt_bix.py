@@ -32,7 +32,7 @@ from .pdt_msg_strings import (
     PDT_ERR_NCEDGES,
     PDT_ERR_EDOB_MODE,
 )
-from .pdt_functions import debug, oops
+from .pdt_functions import debug, popup_message, sync_edit_mesh
 
 
 def add_line_to_bisection(context):
@@ -58,7 +58,7 @@ def add_line_to_bisection(context):
 
         if not len(edges) == 2:
             pg.error = f"{PDT_ERR_2CPNPE}"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             return
 
         [[vector_a, vector_b], [vector_c, vector_d]] = [[v.co for v in e.verts] for e in edges]
@@ -72,7 +72,7 @@ def add_line_to_bisection(context):
 
         if not cm.test_coplanar(edge1, edge2):
             pg.error = PDT_ERR_NCEDGES
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             return
 
         # get intersect_point and pick farthest vertex from (projected) intersections
@@ -101,10 +101,10 @@ def add_line_to_bisection(context):
         bm.edges.new((vec1, vec2))
         bm.edges.new((vec2, vec3))
         bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.0001)
-        bmesh.update_edit_mesh(obj_data)
+        sync_edit_mesh(obj_data)
     else:
         pg.error = f"{PDT_ERR_EDOB_MODE},{obj.mode})"
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
         return
 
 
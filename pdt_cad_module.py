@@ -25,13 +25,19 @@
 #
 import bmesh
 from mathutils import Vector
-from mathutils.geometry import intersect_line_line, intersect_point_line
+from mathutils.geometry import intersect_line_line
 from .pdt_functions import debug
+from .pdt_predicates import lines_close, point_on_segment
 
 
 def point_on_edge(point, edge):
     """Find Point on Edge.
 
+    Note:
+        The point may be off the edge, or beyond its ends, by up to the tolerance of
+        pdt_predicates, a fraction of the edge's length. Points too close to call in
+        floating point are decided exactly.
+
     Args:
         point:    vector
         edge:     tuple containing 2 vectors.
@@ -40,9 +46,7 @@ def point_on_edge(point, edge):
         True if point happens to lie on the edge, False otherwise.
     """
 
-    intersect_point, _percent = intersect_point_line(point, *edge)
-    on_line = (intersect_point - point).length < 1.0e-5
-    return on_line and (0.0 <= _percent <= 1.0)
+    return point_on_segment(point, *edge)
 
 
 def line_from_edge_intersect(edge1, edge2):
@@ -85,20 +89,18 @@ def test_coplanar(edge1, edge2):
 
     Note:
         The line that describes the shortest line between the two edges would be short if the
-        lines intersect mathematically. If this line is longer than 1.0e-5 then they are either
-        coplanar or parallel
+        lines intersect mathematically. If this line is longer than the tolerance of
+        pdt_predicates, a fraction of the longer edge's length, then they are not coplanar.
+        Edges too close to call in floating point are decided exactly.
 
     Args:
         edge1, edge2: tuples containing 2 vectors.
 
     Returns:
-        True if edge1 and edge2 or coplanar, False otherwise.
+        True if edge1 and edge2 or coplanar, False otherwise, None if they are parallel.
     """
 
-    line = line_from_edge_intersect(edge1, edge2)
-    if line:
-        return (line[0] - line[1]).length < 1.0e-5
-    return None
+    return lines_close(edge1, edge2)
 
 
 def closest_idx(intersect_point, edge):
@@ -212,21 +214,6 @@ def get_vert_indices_from_bmedges(edges):
     return temp_edges
 
 
-def num_edges_point_lies_on(intersect_point, edges):
-    """Returns the number of edges that a point lies on.
-
-    Args:
-        intersection_point: Vector describing 3D coordinates of intersection point
-        edges: List of Bmesh edges
-
-    Returns:
-        Number of Intersecting Edges (Integer).
-    """
-
-    res = [point_on_edge(intersect_point, edge) for edge in [edges[:2], edges[2:]]]
-    return len([i for i in res if i])
-
-
 def find_intersecting_edges(bm, intersect_point, idx1, idx2):
     """Find Intercecting Edges.
 
@@ -23,19 +23,32 @@
 #
 import bpy
 import bmesh
-import math
+import numpy as np
+from collections import namedtuple
+from functools import lru_cache
 from bpy.types import Operator
 from mathutils import Vector
 from .pdt_functions import (
+    command_script,
     debug,
     intersection,
     obj_check,
-    oops,
+    popup_message,
+    rotation_matrices,
+    PDTSession,
+    selected_flags,
+    set_vertex_coords,
+    sync_edit_mesh,
     update_sel,
+    vertex_coords,
     view_coords,
     view_dir,
 )
 from .pdt_command_functions import (
+    MAX_ARRAY_POINTS,
+    array_points,
+    load_points,
+    plane_points,
     vector_build,
     join_two_vertices,
     set_angle_distance_two,
@@ -48,6 +61,9 @@ from .pdt_command_functions import (
 )
 from .pdt_msg_strings import (
     PDT_ERR_ADDVEDIT,
+    PDT_ERR_ARRAYEDIT,
+    PDT_ERR_BAD_POLAR,
+    PDT_ERR_BAD_REPEAT,
     PDT_ERR_BADFLETTER,
     PDT_ERR_CHARS_NUM,
     PDT_ERR_DUPEDIT,
@@ -60,16 +76,24 @@ from .pdt_msg_strings import (
     PDT_ERR_SEL_1_EDGEM,
     PDT_ERR_SPLITEDIT,
     PDT_ERR_BADMATHS,
+    PDT_ERR_BADPLOT,
+    PDT_ERR_MATHS_VECTOR,
+    PDT_ERR_PLOTEDIT,
     PDT_OBJ_MODE_ERROR,
     PDT_ERR_SEL_4_VERTS,
     PDT_ERR_INT_LINES,
+    PDT_LAB_MERGED_MOVE,
     PDT_LAB_PLANE,
     PDT_ERR_NO_ACT_OBJ,
     PDT_ERR_VERT_MODE,
+    PDT_ERR_NO_SCRIPT,
+    PDT_INF_SCRIPT_ERRORS,
 )
 from .pdt_bix import add_line_to_bisection
 from .pdt_etof import extend_vertex
 from .pdt_xall import intersect_all
+from .pdt_regions import fill_regions
+from .pdt_maths import assign, evaluate, plot_values
 
 from . import pdt_exception
 PDT_SelectionError = pdt_exception.SelectionError
@@ -81,6 +105,191 @@ PDT_IntersectionError = pdt_exception.IntersectionError
 PDT_NoObjectError = pdt_exception.NoObjectError
 PDT_FeatureError = pdt_exception.FeatureError
 
+# Every PDT Exception, a Command Script goes on to its next command after any of these.
+PDT_ERRORS = tuple(
+    value for value in vars(pdt_exception).values()
+    if isinstance(value, type) and issubclass(value, Exception)
+)
+
+# Number of compiled commands kept, see compile_command.
+COMMAND_CACHE_SIZE = 256
+
+# A parsed Command Line input.
+#   text: the command string, operation: first letter, upper case, mode: second letter,
+#   lower case, values: rounded floats, special: name of a special command, such as
+#   "J2V" or "NML", expression: the expression of a Maths command, points: read only
+#   array of points of an Array command, source: the Text or File an Array command
+#   reads its points from, repeat: number of copies made by a Repeat command.
+Command = namedtuple(
+    "Command",
+    (
+        "text", "operation", "mode", "values", "special", "expression", "points", "source",
+        "repeat",
+    ),
+    defaults=("", "", None, "", 1),
+)
+
+# Valid Second Letters for each First Letter.
+OPERATION_MODES = {
+    "A": {"p"},
+    "C": {"a", "d", "i", "p"},
+    "D": {"d", "i"},
+    "E": {"d", "i"},
+    "F": {"v", "e", "i"},
+    "G": {"a", "d", "i", "p"},
+    "M": {"a", "d", "i", "p", "o", "t", "x", "y", "z"},
+    "N": {"a", "d", "i", "p"},
+    "P": {"a", "d", "i", "p"},
+    "S": {"a", "d", "i", "p"},
+    "V": {"a", "d", "i", "p"},
+}
+
+# Operations that take an Array of Absolute points, see array_points.
+ARRAY_OPERATIONS = {"N", "V"}
+
+# Operations that take a Repeat count after their values, e.g. DD1,0,0*200, and the
+# largest count allowed.
+REPEAT_OPERATIONS = {"D", "E"}
+MAX_REPEAT = 10000
+
+# Operations whose Delta commands are merged by command_queue, see CommandQueue.
+MERGE_OPERATIONS = {"C", "G", "P"}
+
+# Commands run as they are, by name.
+SPECIAL_COMMANDS = {
+    "J2V": join_two_vertices,
+    "AD2": set_angle_distance_two,
+    "AD3": set_angle_distance_three,
+    "OTC": origin_to_cursor,
+    "TAP": taper,
+    "BIS": add_line_to_bisection,
+    "ETF": extend_vertex,
+    "INTALL": intersect_all,
+    "FACEALL": fill_regions,
+}
+
+# Placement commands, by the letters after the first, the first letter being the target.
+PLACEMENT_COMMANDS = {
+    "NML": placement_normal,
+    "CEN": placement_arc_centre,
+    "INT": placement_intersect,
+}
+
+
+class CommandQueue:
+    """Relative Move Commands waiting to be run as one, see command_run.
+
+    Note:
+        Consecutive Delta commands of the Cursor, Pivot Point or Selection, such as
+        GD0.1,0,0 sent many times by a macro, on the same object, selection and
+        Working Plane are summed into one command. It is run, with one mesh update
+        and one undo step, when the interval set in Preferences has passed since
+        the first, or before any other command is run.
+    """
+
+    def __init__(self):
+        self.key = None
+        self.command = None
+
+    def merge_key(self, context, command):
+        """What a Command must share with the Queued Command to be merged with it.
+
+        Args:
+            context: Blender bpy.context instance.
+            command: Command, see compile_command
+
+        Returns:
+            Tuple, or None if the Command cannot be merged.
+        """
+
+        if command.operation not in MERGE_OPERATIONS or command.mode != "d":
+            return None
+        if command.special or len(command.values) != 3 or command.repeat != 1:
+            return None
+        pg = context.scene.pdt_pg
+        # View Plane deltas depend on the view, Selected mode places from the selection.
+        if pg.plane == "LO" or (command.operation != "G" and pg.select != "REL"):
+            return None
+        obj = context.view_layer.objects.active
+        if obj is None:
+            return None if command.operation == "G" else (command.operation, pg.plane)
+        # The same selection, by vertex index or object name, not just as many.
+        if obj.mode == "EDIT" and obj.type == "MESH":
+            flags = selected_flags(bmesh.from_edit_mesh(obj.data).verts)
+            selected = np.flatnonzero(flags).tobytes()
+        elif obj.mode == "OBJECT":
+            selected = tuple(sorted(ob.name for ob in context.view_layer.objects.selected))
+        else:
+            return None
+        return (command.operation, pg.plane, obj.name, obj.mode, selected)
+
+    def add(self, context, command):
+        """Queue a Command, merging it with the Queued Command.
+
+        Args:
+            context: Blender bpy.context instance.
+            command: Command, see compile_command
+
+        Returns:
+            True if the Command was queued, False if it must be run now.
+        """
+
+        prefs = context.preferences.addons[__package__].preferences
+        if not prefs.pdt_merge_moves or bpy.app.background or command_script.running:
+            return False
+        key = self.merge_key(context, command)
+        if key is None:
+            return False
+        if key != self.key:
+            self.flush(context)
+        if self.command is None:
+            self.key = key
+            self.command = command
+            bpy.app.timers.register(flush_command_queue, first_interval=prefs.pdt_merge_interval)
+            return True
+        values = tuple(
+            round(queued + value, prefs.pdt_input_round)
+            for queued, value in zip(self.command.values, command.values)
+        )
+        text = f"{command.operation}{command.mode}{','.join(str(value) for value in values)}"
+        self.command = self.command._replace(text=text, values=values)
+        return True
+
+    def flush(self, context):
+        """Run the Queued Command, if there is one.
+
+        Args:
+            context: Blender bpy.context instance.
+
+        Returns:
+            True if a Command was run.
+        """
+
+        if self.command is None:
+            return False
+        command = self.command
+        self.key = None
+        self.command = None
+        if bpy.app.timers.is_registered(flush_command_queue):
+            bpy.app.timers.unregister(flush_command_queue)
+        command_execute(context, command)
+        return True
+
+
+command_queue = CommandQueue()
+
+
+def flush_command_queue():
+    """Run the Queued Command when its Interval has passed, as its own Undo Step.
+
+    Returns:
+        None, so the Timer is not run again.
+    """
+
+    if command_queue.flush(bpy.context):
+        bpy.ops.ed.undo_push(message=PDT_LAB_MERGED_MOVE)
+    return None
+
 
 class PDT_OT_CommandReRun(Operator):
     """Repeat Current Displayed Command."""
@@ -102,6 +311,37 @@ class PDT_OT_CommandReRun(Operator):
         return {"FINISHED"}
 
 
+class PDT_OT_RunScript(Operator):
+    """Run the Commands in a Text, one to a Line, as one Undo Step."""
+
+    bl_idname = "pdt.run_script"
+    bl_label = "Run Command Script"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        """Run the Command Script in pg.command_script.
+
+        Note:
+            Errors are reported together when the script ends, see run_script.
+
+        Args:
+            context: Blender bpy.context instance.
+
+        Returns:
+            Status Set.
+        """
+
+        pg = context.scene.pdt_pg
+        if pg.command_script is None:
+            pg.error = PDT_ERR_NO_SCRIPT
+            popup_message(context)
+            return {"CANCELLED"}
+        errors = run_script(context, pg.command_script.as_string())
+        if errors:
+            self.report({"ERROR"}, "\n".join([PDT_INF_SCRIPT_ERRORS] + errors))
+        return {"FINISHED"}
+
+
 def command_run(self, context):
     """Run Command String as input into Command Line.
 
@@ -142,6 +382,9 @@ def command_run(self, context):
             Example; madegrees(atan(3/4)) - sets PDT Angle to smallest angle of 3,4,5 Triangle;
             (36.8699 degrees)
 
+        Delta commands of C, G & P typed in quick succession are merged into one,
+        see CommandQueue.
+
     Args:
         context: Blender bpy.context instance.
 
@@ -149,165 +392,246 @@ def command_run(self, context):
         Nothing.
     """
 
-    scene = context.scene
-    pg = scene.pdt_pg
-    command = pg.command.strip()
+    pg = context.scene.pdt_pg
+    decimal_places = context.preferences.addons[__package__].preferences.pdt_input_round
+    try:
+        command = compile_command(pg.command.strip(), decimal_places)
+    except PDT_CommandFailure as error:
+        pg.error = str(error)
+        popup_message(context)
+        return
+    if command is None or command_queue.add(context, command):
+        return
+    command_queue.flush(context)
+    command_execute(context, command)
+
+
+@lru_cache(maxsize=COMMAND_CACHE_SIZE)
+def compile_command(text, decimal_places):
+    """Parse a Command String into a Command.
+
+    Note:
+        Results are cached by text and decimal places, so a command that is run
+        again, for example by PDT_OT_CommandReRun, is not parsed again.
+
+        Values that are not numbers are read as 0.0, then rounded to decimal_places.
+        For Maths commands the expression is kept as it is, in place of values.
+
+    Args:
+        text: The Command String, stripped of surrounding spaces
+        decimal_places: Rounding Factor for Inputs, from Preferences
+
+    Returns:
+        Command, or None for an empty Command String.
+
+    Raises:
+        PDT_CommandFailure: The Command String is not valid, the message says why.
+    """
+
+    if text == "":
+        return None
+    upper = text.upper()
+    if text == "?" or upper == "HELP":
+        return Command(text, "", "", (), "HELP")
+    if upper in SPECIAL_COMMANDS:
+        return Command(text, "", "", (), upper)
+    if upper[1:] in PLACEMENT_COMMANDS:
+        return Command(text, upper[0], "", (), upper[1:])
+
+    # Check Command Length
+    if len(text) < 3:
+        raise PDT_CommandFailure(PDT_ERR_CHARS_NUM)
+
+    # Check First Letter
+    operation = upper[0]
+    if operation not in OPERATION_MODES:
+        raise PDT_CommandFailure(PDT_ERR_BADFLETTER)
+
+    # Check Second Letter.
+    mode = text[1].lower()
+    if mode not in OPERATION_MODES[operation]:
+        raise PDT_CommandFailure(f"'{mode}' {PDT_ERR_NON_VALID} '{operation}'")
+
+    if operation == "M":
+        return Command(text, operation, mode, (), "", text[2:])
+    if operation in ARRAY_OPERATIONS and mode == "a":
+        array = text[2:].strip()
+        if array.startswith("@"):
+            return Command(text, operation, mode, (), source=array[1:].strip())
+        if ";" in array or ":" in array:
+            points = array_points(array, decimal_places)
+            return Command(text, operation, mode, (), points=points)
+
+    values_text = text[2:]
+    repeat = 1
+    if operation in REPEAT_OPERATIONS and "*" in values_text:
+        values_text, repeat_text = values_text.rsplit("*", 1)
+        try:
+            repeat = int(repeat_text)
+        except ValueError:
+            repeat = 0
+        if not 1 <= repeat <= MAX_REPEAT:
+            raise PDT_CommandFailure(f"{PDT_ERR_BAD_REPEAT} {MAX_REPEAT}")
+
+    values = []
+    for value in values_text.split(","):
+        try:
+            values.append(round(float(value), decimal_places))
+        except ValueError:
+            values.append(0.0)
+    return Command(text, operation, mode, tuple(values), repeat=repeat)
+
+
+def command_execute(context, command):
+    """Run a Compiled Command.
+
+    Args:
+        context: Blender bpy.context instance.
+        command: Command, see compile_command
+
+    Returns:
+        Nothing.
+    """
+
+    if command is None:
+        return
+    session = PDTSession(context)
+    pg = session.pg
 
     # Check Object Type & Mode First
-    obj = context.view_layer.objects.active
-    if obj is not None and command[0].upper() not in {"M", "?", "HELP"}:
+    obj = session.obj
+    if obj is not None and command.operation != "M" and command.special != "HELP":
         if obj.mode not in {"OBJECT", "EDIT"} or obj.type not in {"MESH", "EMPTY"}:
             pg.error = PDT_OBJ_MODE_ERROR
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_ObjectModeError
 
     # Special Cases of Command.
-    if command == "?" or command.lower() == "help":
+    if command.special == "HELP":
+        if command_script.running:
+            return
         # fmt: off
         context.window_manager.popup_menu(pdt_help, title="PDT Command Line Help", icon="INFO")
         # fmt: on
         return
-    if command == "":
-        return
-    if command.upper() == "J2V":
-        join_two_vertices(context)
-        return
-    if command.upper() == "AD2":
-        set_angle_distance_two(context)
-        return
-    if command.upper() == "AD3":
-        set_angle_distance_three(context)
-        return
-    if command.upper() == "OTC":
-        origin_to_cursor(context)
-        return
-    if command.upper() == "TAP":
-        taper(context)
-        return
-    if command.upper() == "BIS":
-        add_line_to_bisection(context)
-        return
-    if command.upper() == "ETF":
-        extend_vertex(context)
-        return
-    if command.upper() == "INTALL":
-        intersect_all(context)
+    if command.special in SPECIAL_COMMANDS:
+        SPECIAL_COMMANDS[command.special](context)
         return
-    if command.upper()[1:] == "NML":
-        placement_normal(context, command.upper()[0])
-        return
-    if command.upper()[1:] == "CEN":
-        placement_arc_centre(context, command.upper()[0])
-        return
-    if command.upper()[1:] == "INT":
-        placement_intersect(context, command.upper()[0])
-        return
-
-    # Check Command Length
-    if len(command) < 3:
-        pg.error = PDT_ERR_CHARS_NUM
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
-        return
-
-    # Check First Letter
-    operation = command[0].upper()
-    if operation not in {"C", "D", "E", "F", "G", "N", "M", "P", "V", "S"}:
-        pg.error = PDT_ERR_BADFLETTER
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
-        return
-
-    # Check Second Letter.
-    mode = command[1].lower()
-    if (
-            (operation == "F" and mode not in {"v", "e", "i"})
-            or (operation in {"D", "E"} and mode not in {"d", "i"})
-            or (operation == "M" and mode not in {"a", "d", "i", "p", "o", "x", "y", "z"})
-            or (operation not in {"D", "E", "F", "M"} and mode not in {"a", "d", "i", "p"})
-        ):
-        pg.error = f"'{mode}' {PDT_ERR_NON_VALID} '{operation}'"
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+    if command.special in PLACEMENT_COMMANDS:
+        PLACEMENT_COMMANDS[command.special](context, command.operation)
         return
 
     # --------------
     # Maths Operation
-    if operation == "M":
+    if command.operation == "M":
         try:
-            command_maths(context, mode, pg, command[2:], mode)
+            if command.mode == "t":
+                command_plot(session, command.expression)
+            else:
+                command_maths(session, command.mode, command.expression, command.mode)
             return
-        except PDT_MathsError:
+        except (PDT_MathsError, PDT_ObjectModeError):
             return
 
     # -----------------------------------------------------
-    # Not a Maths Operation, so let's parse the command line
+    # Not a Maths Operation, so let's get the selection
+    points = command.points
+    if command.source:
+        try:
+            points = load_points(context, command.source, session.plane)
+        except PDT_CommandFailure as error:
+            pg.error = str(error)
+            popup_message(context)
+            return
     try:
-        pg, values, obj, obj_loc, bm, verts = command_parse(context)
+        values, verts = command_parse(session, command)
     except PDT_SelectionError:
         return
 
-    # ---------------------
-    # Cursor or Pivot Point
-    if operation in {"C", "P"}:
-        try:
-            move_cursor_pivot(context, pg, operation, mode, obj, verts, values)
-        except PDT_CommandFailure:
-            return
+    arguments = {
+        "operation": command.operation,
+        "mode": command.mode,
+        "verts": verts,
+        "values": values,
+        "points": points,
+        "repeat": command.repeat,
+    }
+    function, names = OPERATIONS[command.operation]
+    try:
+        function(session, *[arguments[name] for name in names])
+    except PDT_CommandFailure:
+        return
 
-    # ------------------------
-    # Move Vertices or Objects
-    if operation == "G":
-        try:
-            move_entities(context, pg, operation, mode, obj, bm, verts, values)
-        except PDT_CommandFailure:
-            return
 
-    # --------------
-    # Add New Vertex
-    if operation == "N":
-        try:
-            add_new_vertex(context, pg, operation, mode, obj, bm, verts, values)
-        except PDT_CommandFailure:
-            return
+def run_command(context, command):
+    """Run a Compiled Command, raising its Errors instead of showing them.
 
-    # -----------
-    # Split Edges
-    if operation == "S":
-        try:
-            split_edges(context, pg, operation, mode, obj, obj_loc, bm, values)
-        except PDT_CommandFailure:
-            return
+    Note:
+        Runs as a Command Script of one command, so inside a running script the
+        mesh is still only synced when that script ends. A queued Command Line
+        move is run first.
 
+    Args:
+        context: Blender bpy.context instance.
+        command: Command, see compile_command
 
-    # ----------------
-    # Extrude Vertices
-    if operation == "V":
-        try:
-            extrude_vertices(context, pg, operation, mode, obj, obj_loc, bm, verts, values)
-        except PDT_CommandFailure:
-            return
+    Returns:
+        Nothing.
 
-    # ----------------
-    # Extrude Geometry
-    if operation == "E":
-        try:
-            extrude_geometry(context, pg, operation, mode, obj, bm, values)
-        except PDT_CommandFailure:
-            return
+    Raises:
+        PDT_CommandFailure: The Command failed, the message says why.
+    """
 
-    # ------------------
-    # Duplicate Geometry
-    if operation == "D":
+    command_queue.flush(context)
+    command_script.start()
+    try:
+        first = len(command_script.messages)
         try:
-            duplicate_geometry(context, pg, operation, mode, obj, bm, values)
-        except PDT_CommandFailure:
-            return
+            command_execute(context, command)
+        except PDT_ERRORS as error:
+            if len(command_script.messages) == first:
+                command_script.messages.append(str(error) or type(error).__name__)
+        messages = command_script.messages[first:]
+        del command_script.messages[first:]
+    finally:
+        command_script.finish()
+    if messages:
+        raise PDT_CommandFailure("; ".join(messages))
 
-    # ---------------
-    # Fillet Geometry
-    if operation == "F":
-        try:
-            fillet_geometry(context, pg, mode, obj, bm, verts, values)
-        except PDT_CommandFailure:
-            return
+
+def run_script(context, script):
+    """Run a Command Script, one Command to a Line.
+
+    Note:
+        Blank lines and lines starting with "#" are skipped. The commands share the
+        Edit Mode Bmesh, which is only synced to the mesh once, after the last
+        command, and pg.command is left alone, so no Undo Step is pushed for each
+        command. A command that fails does not stop the script, its error is kept
+        and the next command is run.
+
+    Args:
+        context: Blender bpy.context instance.
+        script: The Command Script, a multi-line String
+
+    Returns:
+        List of Error Messages, each starting with its line number.
+    """
+
+    decimal_places = context.preferences.addons[__package__].preferences.pdt_input_round
+    errors = []
+    command_script.start()
+    try:
+        for line_number, line in enumerate(script.splitlines(), 1):
+            text = line.strip()
+            if text == "" or text.startswith("#"):
+                continue
+            try:
+                run_command(context, compile_command(text, decimal_places))
+            except PDT_CommandFailure as error:
+                errors.append(f"{line_number}: {text}: {error}")
+    finally:
+        command_script.finish()
+    return errors
 
 
 def pdt_help(self, context):
@@ -322,13 +646,14 @@ def pdt_help(self, context):
     label = self.layout.label
     label(text="Primary Letters (Available Secondary Letters):")
     label(text="")
+    label(text="A: Polar Array about Pivot Point (p)")
     label(text="C: Cursor (a, d, i, p)")
     label(text="D: Duplicate Geometry (d, i)")
     label(text="E: Extrude Geometry (d, i)")
     label(text="F: Fillet (v, e, i)")
     label(text="G: Grab (Move) (a, d, i, p)")
     label(text="N: New Vertex (a, d, i, p)")
-    label(text="M: Maths Functions (a, d, p, o, x, y, z)")
+    label(text="M: Maths Functions (a, d, p, o, t, x, y, z)")
     label(text="P: Pivot Point (a, d, i, p)")
     label(text="V: Extrude Vertice Only (a, d, i, p)")
     label(text="S: Split Edges (a, d, i, p)")
@@ -341,6 +666,12 @@ def pdt_help(self, context):
     label(text="d: Delta (Relative) Coordinates, e.g. 0.5,0,1.2")
     label(text="i: Directional (Polar) Coordinates e.g. 2.6,45")
     label(text="p: Percent e.g. 67.5")
+    label(text="- Array Options, NA & VA only, VA joins the points into a polyline:")
+    label(text="Points split by ; with start:stop:step ranges e.g. 0,0,0;0:10:2,1,0")
+    label(text="@Text, or @File (.csv, .npy) of x,y,z, or x,y on the Working Plane")
+    label(text="- Repeat Options, D & E only, add *count e.g. dd1,0,0*200 for 200 copies")
+    label(text="- Polar Array Options:")
+    label(text="p: Count, including the original, then Total Angle, e.g. 6,360")
     label(text="- Fillet Options:")
     label(text="v: Fillet Vertices")
     label(text="e: Fillet Edges")
@@ -349,6 +680,10 @@ def pdt_help(self, context):
     label(text="x, y, z: Send result to X, Y and Z input fields in PDT Design")
     label(text="d, a, p: Send result to Distance, Angle or Percent input field in PDT Design")
     label(text="o: Send Maths Calculation to Output")
+    label(text="t: Plot expression in t;start;end;samples as a Polyline, e.g. sin(t);0;2*pi;64")
+    label(text="'- A number plots t, f(t) on the Working Plane, (x, y) or (x, y, z) as given")
+    label(text="r = expression keeps the result as variable r, (x, y, z) sends a Vector to X, Y, Z")
+    label(text="Variables: distance, angle, percent, coords, cursor, pivot and your own")
     label(text="")
     label(text="Note that commands are case-insensitive: ED = Ed = eD = ed")
     label(text="")
@@ -367,13 +702,16 @@ def pdt_help(self, context):
     label(text="https://github.com/Clockmender/Precision-Drawing-Tools/wiki")
 
 
-def command_maths(context, mode, pg, expression, output_target):
+def command_maths(session, mode, expression, output_target):
     """Evaluates Maths Input.
 
+    Note:
+        See pdt_maths for what an expression may hold, "name = expression" also
+        keeps the result as a variable for later expressions.
+
     Args:
-        context: Blender bpy.context instance.
+        session: The Command's PDTSession
         mode: The Operation Mode, e.g. a for Absolute
-        pg: PDT Parameters Group - our variables
         expression: The Maths component of the command input e.g. sqrt(56)
         output_target: The output variable box on the UI
 
@@ -381,17 +719,24 @@ def command_maths(context, mode, pg, expression, output_target):
         Nothing.
     """
 
-    namespace = {}
-    namespace.update(vars(math))
+    context = session.context
+    pg = session.pg
     try:
-        maths_result = eval(expression, namespace, namespace)
-    except:
+        maths_result = assign(expression, context)
+    except PDT_MathsError:
         pg.error = PDT_ERR_BADMATHS
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
-        raise PDT_MathsError
-
-    decimal_places = context.preferences.addons[__package__].preferences.pdt_input_round
-    if output_target == "x":
+        popup_message(context)
+        raise
+
+    decimal_places = session.decimal_places
+    if isinstance(maths_result, Vector):
+        # Vector results fill all three Cartesian Coordinates.
+        if output_target not in {"x", "y", "z"} or len(maths_result) != 3:
+            pg.error = PDT_ERR_MATHS_VECTOR
+            popup_message(context)
+            raise PDT_MathsError
+        pg.cartesian_coords = [round(value, decimal_places) for value in maths_result]
+    elif output_target == "x":
         pg.cartesian_coords.x = round(maths_result, decimal_places)
     elif output_target == "y":
         pg.cartesian_coords.y = round(maths_result, decimal_places)
@@ -408,41 +753,73 @@ def command_maths(context, mode, pg, expression, output_target):
         pg.maths_output = round(maths_result, decimal_places)
 
 
-def command_parse(context):
-    """Parse Command Input.
+def command_plot(session, expression):
+    """Plot a Function of t as a Polyline.
+
+    Note:
+        The expression is evaluated for all samples of t at once, see
+        pdt_maths.plot_values. A number gives the points t, f(t) and a Vector of two
+        gives x, y on the Working Plane, a Vector of three gives absolute x, y, z.
+        The points are added to the edit mesh in one pass and left unselected but
+        for the last, so they are not joined to the selection.
 
     Args:
-        context: Blender bpy.context instance.
+        session: The Command's PDTSession
+        expression: Expression in t, then start, end and samples split by ";",
+            e.g. (cos(t), sin(t));0;2*pi;64
+
+    Returns:
+        Nothing.
+    """
+
+    context = session.context
+    pg = session.pg
+    if not session.edit_mesh:
+        pg.error = PDT_ERR_PLOTEDIT
+        popup_message(context)
+        raise PDT_ObjectModeError
+
+    try:
+        parts = expression.split(";")
+        if len(parts) != 4:
+            raise PDT_MathsError(expression)
+        t_start, t_end, samples = (evaluate(part, context) for part in parts[1:])
+        if isinstance(t_start, Vector) or isinstance(t_end, Vector):
+            raise PDT_MathsError(expression)
+        if isinstance(samples, Vector) or not 2 <= samples <= MAX_ARRAY_POINTS:
+            raise PDT_MathsError(expression)
+        t_values, values = plot_values(parts[0], t_start, t_end, int(samples), context)
+        if values.ndim == 1:
+            values = np.stack((t_values, values), axis=1)
+        elif values.shape[1] not in {2, 3}:
+            raise PDT_MathsError(expression)
+    except PDT_MathsError:
+        pg.error = PDT_ERR_BADPLOT
+        popup_message(context)
+        raise
+
+    points = plane_points(values, session.plane)
+    add_vertex_array(session, points, chain=True, extrude=False)
+
+
+def command_parse(session, command):
+    """Gather the Selection a Command works on.
+
+    Args:
+        session: The Command's PDTSession
+        command: Command, see compile_command
 
     Returns:
-        pg: PDT Parameters Group - our variables
         values_out: The Output Values as a list of numbers
-        obj: The Active Object
-        obj_loc: The object's location in 3D space
-        bm: The object's Bmesh
         verts: The object's selected vertices, or selected history vertices.
     """
-    scene = context.scene
-    pg = scene.pdt_pg
-    command = pg.command.strip()
-    operation = command[0].upper()
-    mode = command[1].lower()
-    values = command[2:].split(",")
+    context = session.context
+    pg = session.pg
+    operation = command.operation
+    mode = command.mode
+    values_out = list(command.values)
     mode_sel = pg.select
-    obj = context.view_layer.objects.active
-    ind = 0
-    for v in values:
-        try:
-            _ = float(v)
-            good = True
-        except ValueError:
-            values[ind] = "0.0"
-        ind = ind + 1
-    # Apply System Rounding
-    decimal_places = context.preferences.addons[__package__].preferences.pdt_input_round
-    values_out = [str(round(float(v), decimal_places)) for v in values]
-    bm = "No Bmesh"
-    obj_loc = Vector((0,0,0))
+    obj = session.obj
     verts = []
 
     if mode_sel == 'REL' and operation not in {"C", "P"}:
@@ -455,50 +832,45 @@ def command_parse(context):
             pg.select = 'SEL'
             mode_sel = 'SEL'
         if obj is not None:
-            if obj.mode == "EDIT":
-                bm = bmesh.from_edit_mesh(obj.data)
-                obj_loc = obj.matrix_world.decompose()[0]
-                verts = []
-            else:
-                if operation != "G":
-                    pg.error = PDT_OBJ_MODE_ERROR
-                    context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
-                    raise PDT_ObjectModeError
+            if obj.mode != "EDIT" and operation != "G":
+                pg.error = PDT_OBJ_MODE_ERROR
+                popup_message(context)
+                raise PDT_ObjectModeError
         else:
             pg.error = PDT_ERR_NO_ACT_OBJ
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_NoObjectError
 
-    if mode_sel == 'SEL' and mode not in {"a"}:
+    if mode_sel == 'SEL' and mode not in {"a"} and (obj is not None or operation not in {"C", "P"}):
         # All other options except Cursor or Pivot by Absolute
         # These options require no object, etc.
-        bm, good = obj_check(obj, scene, operation)
-        if good and obj.mode == 'EDIT':
-            obj_loc = obj.matrix_world.decompose()[0]
+        bm, good = obj_check(session, operation)
+        if not good:
+            # obj_check has shown the error.
+            raise PDT_SelectionError
+        if obj.mode == 'EDIT':
             if len(bm.select_history) == 0 or operation == "G":
-                verts = [v for v in bm.verts if v.select]
+                verts = session.selection.verts
                 if len(verts) == 0:
                     pg.error = PDT_ERR_NO_SEL_GEOM
-                    context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+                    popup_message(context)
                     raise PDT_SelectionError
             else:
                 verts = bm.select_history
 
     debug(f"command: {operation}{mode}{values_out}")
-    debug(f"obj: {obj}, bm: {bm}, obj_loc: {obj_loc}")
+    debug(f"obj: {obj}, bm: {session.bm}, obj_loc: {session.obj_loc}")
 
-    return pg, values_out, obj, obj_loc, bm, verts
+    return values_out, verts
 
 
-def move_cursor_pivot(context, pg, operation, mode, obj, verts, values):
+def move_cursor_pivot(session, operation, mode, verts, values):
     """Moves Cursor & Pivot Point.
 
     Args:
-        context: Blender bpy.context instance.
-        pg: PDT Parameters Group - our variables
+        session: The Command's PDTSession
         operation: The Operation e.g. Create New Vertex
         mode: The Operation Mode, e.g. a for Absolute
-        obj: The Active Object
         verts: The object's selected vertices, or selected history vertices
         values: The parameters passed e.g. 1,4,3 for Cartesian Coordinates
 
@@ -506,31 +878,33 @@ def move_cursor_pivot(context, pg, operation, mode, obj, verts, values):
         Nothing.
     """
 
+    context = session.context
+    pg = session.pg
+    obj = session.obj
+
     # Absolute/Global Coordinates, or Delta/Relative Coordinates
     if mode in {"a", "d"}:
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 3)
+            vector_delta = vector_build(session, operation, values, 3)
         except:
             raise PDT_InvalidVector
     # Direction/Polar Coordinates
     elif mode == "i":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 2)
+            vector_delta = vector_build(session, operation, values, 2)
         except:
             raise PDT_InvalidVector
     # Percent Options
     else:
         # Must be Percent
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 1)
+            vector_delta = vector_build(session, operation, values, 1)
         except:
             raise PDT_InvalidVector
 
     scene = context.scene
     mode_sel = pg.select
-    obj_loc = Vector((0,0,0))
-    if obj is not None:
-        obj_loc = obj.matrix_world.decompose()[0]
+    obj_loc = session.obj_loc
 
     if mode == "a":
         if operation == "C":
@@ -572,16 +946,13 @@ def move_cursor_pivot(context, pg, operation, mode, obj, verts, values):
                 pg.pivot_loc = vector_delta
 
 
-def move_entities(context, pg, operation, mode, obj, bm, verts, values):
+def move_entities(session, operation, mode, verts, values):
     """Moves Entities.
 
     Args:
-        context: Blender bpy.context instance.
-        pg: PDT Parameters Group - our variables
+        session: The Command's PDTSession
         operation: The Operation e.g. Create New Vertex
         mode: The Operation Mode, e.g. a for Absolute
-        obj: The Active Object
-        bm: The object's Bmesh
         verts: The object's selected vertices, or selected history vertices
         values: The parameters passed e.g. 1,4,3 for Cartesian Coordinates
 
@@ -589,20 +960,23 @@ def move_entities(context, pg, operation, mode, obj, bm, verts, values):
         Nothing.
     """
 
-    obj_loc = obj.matrix_world.decompose()[0]
+    context = session.context
+    pg = session.pg
+    obj = session.obj
+    bm = session.bm
+    selection = session.selection
+    obj_loc = session.obj_loc
 
     # Absolute/Global Coordinates
     if mode == "a":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 3)
+            vector_delta = vector_build(session, operation, values, 3)
         except:
             raise PDT_InvalidVector
         if obj.mode == "EDIT":
             for v in verts:
                 v.co = vector_delta - obj_loc
-            bmesh.ops.remove_doubles(
-                bm, verts=[v for v in bm.verts if v.select], dist=0.0001
-            )
+            bmesh.ops.remove_doubles(bm, verts=selection.verts, dist=0.0001)
         if obj.mode == "OBJECT":
             for ob in context.view_layer.objects.selected:
                 ob.location = vector_delta
@@ -611,13 +985,13 @@ def move_entities(context, pg, operation, mode, obj, bm, verts, values):
         if mode == "d":
             # Delta/Relative Coordinates
             try:
-                vector_delta = vector_build(context, pg, obj, operation, values, 3)
+                vector_delta = vector_build(session, operation, values, 3)
             except:
                 raise PDT_InvalidVector
         else:
             # Direction/Polar Coordinates
             try:
-                vector_delta = vector_build(context, pg, obj, operation, values, 2)
+                vector_delta = vector_build(session, operation, values, 2)
             except:
                 raise PDT_InvalidVector
 
@@ -627,16 +1001,14 @@ def move_entities(context, pg, operation, mode, obj, bm, verts, values):
             vector_delta = view_dir(pg.distance, pg.angle)
 
         if obj.mode == "EDIT":
-            bmesh.ops.translate(
-                bm, verts=[v for v in bm.verts if v.select], vec=vector_delta
-            )
+            bmesh.ops.translate(bm, verts=selection.verts, vec=vector_delta)
         if obj.mode == "OBJECT":
             for ob in context.view_layer.objects.selected:
                 ob.location = obj_loc + vector_delta
     # Percent Options Only Other Choice
     else:
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 1)
+            vector_delta = vector_build(session, operation, values, 1)
         except:
             raise PDT_InvalidVector
         if obj.mode == 'EDIT':
@@ -644,43 +1016,52 @@ def move_entities(context, pg, operation, mode, obj, bm, verts, values):
         if obj.mode == "OBJECT":
             obj.location = vector_delta
     if obj.mode == 'EDIT':
-        bmesh.update_edit_mesh(obj.data)
+        sync_edit_mesh(obj.data)
         bm.select_history.clear()
 
 
-def add_new_vertex(context, pg, operation, mode, obj, bm, verts, values):
+def add_new_vertex(session, operation, mode, verts, values, points=None):
     """Add New Vertex.
 
     Args:
-        context: Blender bpy.context instance.
-        pg, operation, mode, obj, bm, verts, values
+        session: The Command's PDTSession
+        operation, mode, verts, values
+        points: Array of Absolute Points of an Array Command, or None
 
     Returns:
         Nothing.
     """
 
-    obj_loc = obj.matrix_world.decompose()[0]
+    context = session.context
+    pg = session.pg
+    obj = session.obj
+    bm = session.bm
+    selection = session.selection
+    obj_loc = session.obj_loc
 
     if not obj.mode == "EDIT":
         pg.error = PDT_ERR_ADDVEDIT
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
         raise PDT_SelectionError
+    if points is not None:
+        add_vertex_array(session, points, chain=False)
+        return
     if mode not in {"a"}:
         if not isinstance(verts[0], bmesh.types.BMVert):
             pg.error = PDT_ERR_VERT_MODE
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_FeatureError
     # Absolute/Global Coordinates
     if mode == "a":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 3)
+            vector_delta = vector_build(session, operation, values, 3)
         except:
             raise PDT_InvalidVector
         new_vertex = bm.verts.new(vector_delta - obj_loc)
     # Delta/Relative Coordinates
     elif mode == "d":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 3)
+            vector_delta = vector_build(session, operation, values, 3)
         except:
             raise PDT_InvalidVector
         if pg.plane == "LO":
@@ -689,7 +1070,7 @@ def add_new_vertex(context, pg, operation, mode, obj, bm, verts, values):
     # Direction/Polar Coordinates
     elif mode == "i":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 2)
+            vector_delta = vector_build(session, operation, values, 2)
         except:
             raise PDT_InvalidVector
         if pg.plane == "LO":
@@ -698,29 +1079,62 @@ def add_new_vertex(context, pg, operation, mode, obj, bm, verts, values):
     # Percent Options Only Other Choice
     else:
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 1)
+            vector_delta = vector_build(session, operation, values, 1)
         except:
             raise PDT_InvalidVector
         new_vertex = bm.verts.new(vector_delta)
 
-    for v in [v for v in bm.verts if v.select]:
-        v.select_set(False)
+    selection.deselect()
     new_vertex.select_set(True)
-    bmesh.update_edit_mesh(obj.data)
+    sync_edit_mesh(obj.data)
     bm.select_history.clear()
 
 
-def split_edges(context, pg, operation, mode, obj, obj_loc, bm, values):
+def add_vertex_array(session, points, chain, extrude=True):
+    """Add Vertices at an Array of Absolute Points in one pass.
+
+    Note:
+        The mesh is synced once, for all the points. When chained, the points are
+        joined into a polyline, extruded from each selected vertex like VA unless
+        extrude is False, and only its last vertex is left selected, otherwise all
+        new vertices are.
+
+    Args:
+        session: The Command's PDTSession
+        points: Float Array of Absolute Points, shape (N, 3)
+        chain: Join the Points into a Polyline
+        extrude: Join a chained Polyline to the Selected Vertices
+
+    Returns:
+        Nothing.
+    """
+
+    obj = session.obj
+    bm = session.bm
+    obj_loc = np.array(session.obj_loc)
+    selected = session.selection.verts
+    session.selection.deselect()
+    new_verts = [bm.verts.new(co) for co in (points - obj_loc).tolist()]
+    if chain:
+        for v in selected if extrude else ():
+            bm.edges.new([v, new_verts[0]])
+        for v_start, v_end in zip(new_verts, new_verts[1:]):
+            bm.edges.new([v_start, v_end])
+        new_verts[-1].select_set(True)
+    else:
+        for v in new_verts:
+            v.select_set(True)
+    sync_edit_mesh(obj.data)
+    bm.select_history.clear()
+
+
+def split_edges(session, operation, mode, values):
     """Split Edges.
 
     Args:
-        context: Blender bpy.context instance.
-        pg: PDT Parameters Group - our variables
+        session: The Command's PDTSession
         operation: The Operation e.g. Create New Vertex
         mode: The Operation Mode, e.g. a for Absolute
-        obj: The Active Object
-        obj_loc: The object's location in 3D space
-        bm: The object's Bmesh
         verts: The object's selected vertices, or selected history vertices
         values: The parameters passed e.g. 1,4,3 for Cartesian Coordinates
 
@@ -728,20 +1142,27 @@ def split_edges(context, pg, operation, mode, obj, obj_loc, bm, values):
         Nothing.
     """
 
+    context = session.context
+    pg = session.pg
+    obj = session.obj
+    obj_loc = session.obj_loc
+    bm = session.bm
+    selection = session.selection
+
     if not obj.mode == "EDIT":
         pg.error = PDT_ERR_SPLITEDIT
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
         return
     # Absolute/Global Coordinates
     if mode == "a":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 3)
+            vector_delta = vector_build(session, operation, values, 3)
         except:
             raise PDT_InvalidVector
-        edges = [e for e in bm.edges if e.select]
+        edges = selection.edges
         if len(edges) != 1:
             pg.error = f"{PDT_ERR_SEL_1_EDGE} {len(edges)})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             return
         geom = bmesh.ops.subdivide_edges(bm, edges=edges, cuts=1)
         new_verts = [v for v in geom["geom_split"] if isinstance(v, bmesh.types.BMVert)]
@@ -750,18 +1171,18 @@ def split_edges(context, pg, operation, mode, obj, obj_loc, bm, values):
     # Delta/Relative Coordinates
     elif mode == "d":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 3)
+            vector_delta = vector_build(session, operation, values, 3)
         except:
             raise PDT_InvalidVector
-        edges = [e for e in bm.edges if e.select]
-        faces = [f for f in bm.faces if f.select]
+        edges = selection.edges
+        faces = selection.faces
         if len(faces) != 0:
             pg.error = PDT_ERR_FACE_SEL
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             return
         if len(edges) < 1:
             pg.error = f"{PDT_ERR_SEL_1_EDGEM} {len(edges)})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             return
         geom = bmesh.ops.subdivide_edges(bm, edges=edges, cuts=1)
         new_verts = [v for v in geom["geom_split"] if isinstance(v, bmesh.types.BMVert)]
@@ -769,18 +1190,18 @@ def split_edges(context, pg, operation, mode, obj, obj_loc, bm, values):
     # Directional/Polar Coordinates
     elif mode == "i":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 2)
+            vector_delta = vector_build(session, operation, values, 2)
         except:
             raise PDT_InvalidVector
-        edges = [e for e in bm.edges if e.select]
-        faces = [f for f in bm.faces if f.select]
+        edges = selection.edges
+        faces = selection.faces
         if len(faces) != 0:
             pg.error = PDT_ERR_FACE_SEL
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             return
         if len(edges) < 1:
             pg.error = f"{PDT_ERR_SEL_1_EDGEM} {len(edges)})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             return
         geom = bmesh.ops.subdivide_edges(bm, edges=edges, cuts=1)
         new_verts = [v for v in geom["geom_split"] if isinstance(v, bmesh.types.BMVert)]
@@ -788,73 +1209,76 @@ def split_edges(context, pg, operation, mode, obj, obj_loc, bm, values):
     # Percent Options
     elif mode == "p":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 1)
+            vector_delta = vector_build(session, operation, values, 1)
         except:
             raise PDT_InvalidVector
-        edges = [e for e in bm.edges if e.select]
-        faces = [f for f in bm.faces if f.select]
+        edges = selection.edges
+        faces = selection.faces
         if len(faces) != 0:
             pg.error = PDT_ERR_FACE_SEL
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             return
         if len(edges) != 1:
             pg.error = f"{PDT_ERR_SEL_1_EDGEM} {len(edges)})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             return
         geom = bmesh.ops.subdivide_edges(bm, edges=edges, cuts=1)
         new_verts = [v for v in geom["geom_split"] if isinstance(v, bmesh.types.BMVert)]
         new_vertex = new_verts[0]
         new_vertex.co = vector_delta
 
-    for v in [v for v in bm.verts if v.select]:
-        v.select_set(False)
-    for v in new_verts:
-        v.select_set(False)
-    bmesh.update_edit_mesh(obj.data)
+    # Splitting added edges and vertices, so the selection is read again.
+    selection.refresh()
+    selection.deselect()
+    sync_edit_mesh(obj.data)
     bm.select_history.clear()
 
 
-def extrude_vertices(context, pg, operation, mode, obj, obj_loc, bm, verts, values):
+def extrude_vertices(session, operation, mode, verts, values, points=None):
     """Extrude Vertices.
 
     Args:
-        context: Blender bpy.context instance.
-        pg: PDT Parameters Group - our variables
+        session: The Command's PDTSession
         operation: The Operation e.g. Create New Vertex
         mode: The Operation Mode, e.g. a for Absolute
-        obj: The Active Object
-        obj_loc: The object's location in 3D space
-        bm: The object's Bmesh
         verts: The object's selected vertices, or selected history vertices
         values: The parameters passed e.g. 1,4,3 for Cartesian Coordinates
+        points: Array of Absolute Points of an Array Command, or None
 
     Returns:
         Nothing.
     """
 
+    context = session.context
+    pg = session.pg
+    obj = session.obj
+    obj_loc = session.obj_loc
+    bm = session.bm
+    selection = session.selection
+
     if not obj.mode == "EDIT":
         pg.error = PDT_ERR_EXTEDIT
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
+        return
+    if points is not None:
+        add_vertex_array(session, points, chain=True)
         return
     # Absolute/Global Coordinates
     if mode == "a":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 3)
+            vector_delta = vector_build(session, operation, values, 3)
         except:
             raise PDT_InvalidVector
         new_vertex = bm.verts.new(vector_delta - obj_loc)
-        verts = [v for v in bm.verts if v.select].copy()
-        for v in verts:
+        for v in selection.verts:
             bm.edges.new([v, new_vertex])
-            v.select_set(False)
+        selection.deselect()
         new_vertex.select_set(True)
-        bmesh.ops.remove_doubles(
-            bm, verts=[v for v in bm.verts if v.select], dist=0.0001
-        )
+        bmesh.ops.remove_doubles(bm, verts=[new_vertex], dist=0.0001)
     # Delta/Relative Coordinates
     elif mode == "d":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 3)
+            vector_delta = vector_build(session, operation, values, 3)
         except:
             raise PDT_InvalidVector
         if pg.plane == "LO":
@@ -868,7 +1292,7 @@ def extrude_vertices(context, pg, operation, mode, obj, obj_loc, bm, verts, valu
     # Direction/Polar Coordinates
     elif mode == "i":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 2)
+            vector_delta = vector_build(session, operation, values, 2)
         except:
             raise PDT_InvalidVector
         if pg.plane == "LO":
@@ -883,149 +1307,251 @@ def extrude_vertices(context, pg, operation, mode, obj, obj_loc, bm, verts, valu
     elif mode == "p":
         extend_all  = pg.extend
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 1)
+            vector_delta = vector_build(session, operation, values, 1)
         except:
             raise PDT_InvalidVector
-        verts = [v for v in bm.verts if v.select].copy()
+        verts = selection.verts
         new_vertex = bm.verts.new(vector_delta)
         if extend_all:
-            for v in [v for v in bm.verts if v.select]:
+            for v in verts:
                 bm.edges.new([v, new_vertex])
-                v.select_set(False)
+            selection.deselect()
         else:
             bm.edges.new([verts[-1], new_vertex])
         new_vertex.select_set(True)
 
-    bmesh.update_edit_mesh(obj.data)
+    sync_edit_mesh(obj.data)
+
 
+def repeat_offsets(vector_delta, repeat):
+    """Offsets of each Copy of a Repeat command.
+
+    Args:
+        vector_delta: Offset of the first Copy
+        repeat: Number of Copies
 
-def extrude_geometry(context, pg, operation, mode, obj, bm, values):
+    Returns:
+        Float Array, shape (repeat, 3), the i-th row being i times vector_delta,
+        counting from 1.
+    """
+
+    steps = np.arange(1, repeat + 1, dtype=np.float64)[:, None]
+    return steps * np.array(vector_delta, dtype=np.float64)
+
+
+def extrude_geometry(session, operation, mode, values, repeat=1):
     """Extrude Geometry.
 
+    Note:
+        With a Repeat count the geometry is extruded that many times, each step
+        from the last, and the selection and mesh are only updated once.
+
     Args:
-        context: Blender bpy.context instance.
-        pg: PDT Parameters Group - our variables
+        session: The Command's PDTSession
         operation: The Operation e.g. Create New Vertex
         mode: The Operation Mode, e.g. a for Absolute
-        obj: The Active Object
-        bm: The object's Bmesh
         values: The parameters passed e.g. 1,4,3 for Cartesian Coordinates
+        repeat: Number of Extrusions
 
     Returns:
         Nothing.
     """
 
+    context = session.context
+    pg = session.pg
+    obj = session.obj
+    bm = session.bm
+    selection = session.selection
+
     if not obj.mode == "EDIT":
         pg.error = PDT_ERR_EXTEDIT
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
         return
     # Delta/Relative Coordinates
     if mode == "d":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 3)
+            vector_delta = vector_build(session, operation, values, 3)
         except:
             raise PDT_InvalidVector
     # Direction/Polar Coordinates
     elif mode == "i":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 2)
+            vector_delta = vector_build(session, operation, values, 2)
         except:
             raise PDT_InvalidVector
 
-    ret = bmesh.ops.extrude_face_region(
-        bm,
-        geom=(
-            [f for f in bm.faces if f.select]
-            + [e for e in bm.edges if e.select]
-            + [v for v in bm.verts if v.select]
-        ),
-        use_select_history=True,
-    )
-    geom_extr = ret["geom"]
-    verts_extr = [v for v in geom_extr if isinstance(v, bmesh.types.BMVert)]
-    edges_extr = [e for e in geom_extr if isinstance(e, bmesh.types.BMEdge)]
-    faces_extr = [f for f in geom_extr if isinstance(f, bmesh.types.BMFace)]
-    del ret
-
     if pg.plane == "LO" and mode == "d":
         vector_delta = view_coords(vector_delta.x, vector_delta.y, vector_delta.z)
     elif pg.plane == "LO" and mode == "i":
         vector_delta = view_dir(pg.distance, pg.angle)
 
-    bmesh.ops.translate(bm, verts=verts_extr, vec=vector_delta)
-    update_sel(bm, verts_extr, edges_extr, faces_extr)
-    bmesh.update_edit_mesh(obj.data)
+    # Each step is extruded from the last one, which has already been moved, and
+    # extrude_face_region gives no vertex map, so each step is translated in turn.
+    geom_extr = selection.geometry
+    for _ in range(repeat):
+        ret = bmesh.ops.extrude_face_region(bm, geom=geom_extr, use_select_history=True)
+        geom_extr = ret["geom"]
+        del ret
+        verts_extr = [v for v in geom_extr if isinstance(v, bmesh.types.BMVert)]
+        bmesh.ops.translate(bm, verts=verts_extr, vec=vector_delta)
+    edges_extr = [e for e in geom_extr if isinstance(e, bmesh.types.BMEdge)]
+    faces_extr = [f for f in geom_extr if isinstance(f, bmesh.types.BMFace)]
+    update_sel(selection, verts_extr, edges_extr, faces_extr)
+    sync_edit_mesh(obj.data)
     bm.select_history.clear()
 
 
-def duplicate_geometry(context, pg, operation, mode, obj, bm, values):
+def duplicate_geometry(session, operation, mode, values, repeat=1):
     """Duplicate Geometry.
 
+    Note:
+        With a Repeat count that many copies are made, evenly spaced, and the
+        selection and mesh are only updated once, the last copy is left selected.
+
     Args:
-        context: Blender bpy.context instance.
-        pg: PDT Parameters Group - our variables
+        session: The Command's PDTSession
         operation: The Operation e.g. Create New Vertex
         mode: The Operation Mode, e.g. a for Absolute
-        obj: The Active Object
-        bm: The object's Bmesh
         values: The parameters passed e.g. 1,4,3 for Cartesian Coordinates
+        repeat: Number of Copies
 
     Returns:
         Nothing.
     """
 
+    context = session.context
+    pg = session.pg
+    obj = session.obj
+    bm = session.bm
+    selection = session.selection
+
     if not obj.mode == "EDIT":
         pg.error = PDT_ERR_DUPEDIT
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
         return
     # Delta/Relative Coordinates
     if mode == "d":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 3)
+            vector_delta = vector_build(session, operation, values, 3)
         except:
             raise PDT_InvalidVector
     # Direction/Polar Coordinates
     elif mode == "i":
         try:
-            vector_delta = vector_build(context, pg, obj, operation, values, 2)
+            vector_delta = vector_build(session, operation, values, 2)
         except:
             raise PDT_InvalidVector
 
-    ret = bmesh.ops.duplicate(
-        bm,
-        geom=(
-            [f for f in bm.faces if f.select]
-            + [e for e in bm.edges if e.select]
-            + [v for v in bm.verts if v.select]
-        ),
-        use_select_history=True,
-    )
-    geom_dupe = ret["geom"]
-    verts_dupe = [v for v in geom_dupe if isinstance(v, bmesh.types.BMVert)]
-    edges_dupe = [e for e in geom_dupe if isinstance(e, bmesh.types.BMEdge)]
-    faces_dupe = [f for f in geom_dupe if isinstance(f, bmesh.types.BMFace)]
-    del ret
-
     if pg.plane == "LO" and mode == "d":
         vector_delta = view_coords(vector_delta.x, vector_delta.y, vector_delta.z)
     elif pg.plane == "LO" and mode == "i":
         vector_delta = view_dir(pg.distance, pg.angle)
 
-    bmesh.ops.translate(bm, verts=verts_dupe, vec=vector_delta)
-    update_sel(bm, verts_dupe, edges_dupe, faces_dupe)
-    bmesh.update_edit_mesh(obj.data)
+    # Every copy is made from the original geometry, the coordinates of all the
+    # copies are worked out at once as one block, then written through each
+    # copy's vertex map.
+    geom = selection.geometry
+    verts = [v for v in geom if isinstance(v, bmesh.types.BMVert)]
+    coords = vertex_coords(verts)
+    blocks = coords[np.newaxis] + repeat_offsets(vector_delta, repeat)[:, np.newaxis]
+    for block in blocks:
+        ret = bmesh.ops.duplicate(bm, geom=geom, use_select_history=True)
+        geom_dupe = ret["geom"]
+        vert_map = ret["vert_map"]
+        del ret
+        set_vertex_coords([vert_map[v] for v in verts], block)
+        verts_dupe = [v for v in geom_dupe if isinstance(v, bmesh.types.BMVert)]
+    edges_dupe = [e for e in geom_dupe if isinstance(e, bmesh.types.BMEdge)]
+    faces_dupe = [f for f in geom_dupe if isinstance(f, bmesh.types.BMFace)]
+    update_sel(selection, verts_dupe, edges_dupe, faces_dupe)
+    sync_edit_mesh(obj.data)
 
 
-def fillet_geometry(context, pg, mode, obj, bm, verts, values):
+def polar_array(session, values):
+    """Polar Array of Selected Geometry about the Pivot Point.
+
+    Note:
+        Values are the number of items, counting the original, and the total angle,
+        360 if left out. A full circle spaces the items evenly, any other angle puts
+        the last item at that angle. The axis is the normal of the Working Plane, or
+        the View direction for the View plane. The rotation is done in World space,
+        so rotated and scaled objects are arrayed about the right centre and axis.
+        All the copies are rotated at once as one coordinate block, and the mesh is
+        updated once.
+
+    Args:
+        session: The Command's PDTSession
+        values: The parameters passed e.g. 6,360
+
+    Returns:
+        Nothing.
+    """
+
+    context = session.context
+    pg = session.pg
+    obj = session.obj
+    bm = session.bm
+    selection = session.selection
+
+    if not obj.mode == "EDIT":
+        pg.error = PDT_ERR_ARRAYEDIT
+        popup_message(context)
+        return
+    count = int(values[0])
+    angle = values[1] if len(values) > 1 and values[1] != 0 else 360.0
+    if count < 2 or len(values) > 2:
+        pg.error = PDT_ERR_BAD_POLAR
+        popup_message(context)
+        return
+
+    if pg.plane == "LO":
+        axis = view_coords(0, 0, 1)
+    else:
+        a1, a2, _ = session.axes
+        axis = np.cross(np.eye(3)[a1], np.eye(3)[a2])
+    if abs(angle) >= 360.0:
+        step = angle / count
+    else:
+        step = angle / (count - 1)
+    matrices = rotation_matrices(axis, np.radians(step * np.arange(1, count)))
+
+    geom = selection.geometry
+    verts = [v for v in geom if isinstance(v, bmesh.types.BMVert)]
+    if len(verts) == 0:
+        pg.error = PDT_ERR_NO_SEL_GEOM
+        popup_message(context)
+        return
+    # The rotation is about the Pivot Point in World space, in the object's own
+    # space this is A^-1 R A about the Pivot, A being the object's 3x3 matrix.
+    centre = np.array(session.matrix_world_inverted @ pg.pivot_loc)
+    to_world = np.array(session.matrix_world.to_3x3())
+    to_local = np.array(session.matrix_world_inverted.to_3x3())
+    matrices = to_local @ matrices @ to_world
+    coords = np.array([v.co for v in verts], dtype=np.float64).reshape(-1, 3) - centre
+    blocks = np.einsum("kij,nj->kni", matrices, coords) + centre
+
+    new_geom = []
+    for block in blocks.tolist():
+        ret = bmesh.ops.duplicate(bm, geom=geom)
+        vert_map = ret["vert_map"]
+        for v, co in zip(verts, block):
+            vert_map[v].co = co
+        new_geom.extend(ret["geom"])
+        del ret
+    for element in new_geom:
+        element.select_set(True)
+    bm.normal_update()
+    sync_edit_mesh(obj.data)
+    bm.select_history.clear()
+
+
+def fillet_geometry(session, mode, verts, values):
     """Fillet Geometry.
 
     Args:
-        context: Blender bpy.context instance.
-        pg: PDT Parameters Group - our variables
+        session: The Command's PDTSession
         operation: The Operation e.g. Create New Vertex
         mode: The Operation Mode, e.g. a for Absolute
-        obj: The Active Object
-        bm: The object's Bmesh
         verts: The object's selected vertices, or selected history vertices
         values: The parameters passed e.g. 1,4,3 for Cartesian Coordinates
 
@@ -1033,9 +1559,15 @@ def fillet_geometry(context, pg, mode, obj, bm, verts, values):
         Nothing.
     """
 
+    context = session.context
+    pg = session.pg
+    obj = session.obj
+    bm = session.bm
+    selection = session.selection
+
     if not obj.mode == "EDIT":
         pg.error = PDT_ERR_FILEDIT
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
         return
     if mode in {"i", "v"}:
         vert_bool = True
@@ -1054,8 +1586,8 @@ def fillet_geometry(context, pg, mode, obj, bm, verts, values):
     if mode == "i":
         # Fillet & Intersect Two Edges
         # Always use Current Selection
-        verts = [v for v in bm.verts if v.select]
-        edges = [e for e in bm.edges if e.select]
+        verts = selection.verts
+        edges = selection.edges
         if len(edges) == 2 and len(verts) == 4:
             plane = pg.plane
             v_active = edges[0].verts[0]
@@ -1070,7 +1602,7 @@ def fillet_geometry(context, pg, mode, obj, bm, verts, values):
                                               )
             if not done:
                 pg.error = f"{PDT_ERR_INT_LINES} {plane}  {PDT_LAB_PLANE}"
-                context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+                popup_message(context)
                 raise PDT_IntersectionError
             if (v_active.co - vector_delta).length < (v_other.co - vector_delta).length:
                 v_active.co = vector_delta
@@ -1087,7 +1619,7 @@ def fillet_geometry(context, pg, mode, obj, bm, verts, values):
             bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.0001)
         else:
             pg.error = f"{PDT_ERR_SEL_4_VERTS} {len(verts)} Vert(s), {len(edges)} Edge(s))"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_SelectionError
 
     bpy.ops.mesh.bevel(
@@ -1097,3 +1629,18 @@ def fillet_geometry(context, pg, mode, obj, bm, verts, values):
         profile=_profile,
         vertex_only=vert_bool
     )
+
+
+# Function for each First Letter, with the arguments it takes after the PDTSession.
+OPERATIONS = {
+    "C": (move_cursor_pivot, ("operation", "mode", "verts", "values")),
+    "P": (move_cursor_pivot, ("operation", "mode", "verts", "values")),
+    "G": (move_entities, ("operation", "mode", "verts", "values")),
+    "N": (add_new_vertex, ("operation", "mode", "verts", "values", "points")),
+    "S": (split_edges, ("operation", "mode", "values")),
+    "V": (extrude_vertices, ("operation", "mode", "verts", "values", "points")),
+    "E": (extrude_geometry, ("operation", "mode", "values", "repeat")),
+    "D": (duplicate_geometry, ("operation", "mode", "values", "repeat")),
+    "F": (fillet_geometry, ("mode", "verts", "values")),
+    "A": (polar_array, ("values",)),
+}
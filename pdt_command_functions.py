@@ -21,6 +21,8 @@
 # Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
 # -----------------------------------------------------------------------
 #
+import io
+import bpy
 import bmesh
 import numpy as np
 from math import sqrt, tan, pi
@@ -28,16 +30,19 @@ from mathutils import Vector
 from mathutils.geometry import intersect_point_line
 from .pdt_functions import (
     set_mode,
-    oops,
+    popup_message,
+    sync_edit_mesh,
     get_percent,
     dis_ang,
     check_selection,
     arc_centre,
     intersection,
     view_coords_i,
-    view_coords,
-    view_dir,
+    view_transform,
     set_axis,
+    vertex_coords,
+    set_vertex_coords,
+    SelectionSnapshot,
 )
 
 from . import pdt_exception
@@ -50,11 +55,15 @@ PDT_IntersectionError = pdt_exception.IntersectionError
 PDT_InvalidOperation = pdt_exception.InvalidOperation
 PDT_VerticesConnected = pdt_exception.VerticesConnected
 PDT_InvalidAngle = pdt_exception.InvalidAngle
+PDT_CommandFailure = pdt_exception.CommandFailure
 
 from .pdt_msg_strings import (
     PDT_ERR_BAD3VALS,
     PDT_ERR_BAD2VALS,
     PDT_ERR_BAD1VALS,
+    PDT_ERR_BAD_ARRAY,
+    PDT_ERR_ARRAY_SIZE,
+    PDT_ERR_NO_POINTS,
     PDT_ERR_CONNECTED,
     PDT_ERR_SEL_2_VERTS,
     PDT_ERR_EDOB_MODE,
@@ -81,14 +90,144 @@ from .pdt_msg_strings import (
     PDT_LAB_PLANE,
 )
 
+# Most Points one Array Command may make, see array_points and load_points.
+MAX_ARRAY_POINTS = 1000000
 
-def vector_build(context, pg, obj, operation, values, num_values):
-    """Build Movement Vector from Input Fields.
+
+def axis_range(axis, item):
+    """Read one Coordinate of an Array Point, a Number or a Range.
+
+    Args:
+        axis: The Coordinate, a number, or start:stop or start:stop:step
+        item: The whole Point, for error messages
+
+    Returns:
+        Float Array of Coordinate values, stop is included when a step lands on it.
+
+    Raises:
+        PDT_CommandFailure: The Coordinate is not valid.
+    """
+
+    parts = axis.split(":")
+    try:
+        if len(parts) == 1:
+            return np.array([float(axis) if axis.strip() else 0.0])
+        if len(parts) > 3:
+            raise ValueError
+        start, stop = float(parts[0]), float(parts[1])
+        step = float(parts[2]) if len(parts) == 3 else 1.0
+    except ValueError:
+        raise PDT_CommandFailure(f"{PDT_ERR_BAD_ARRAY} '{item}'")
+    if step == 0.0 or (stop - start) * step < 0.0:
+        raise PDT_CommandFailure(f"{PDT_ERR_BAD_ARRAY} '{item}'")
+    count = int(np.floor(round((stop - start) / step, 9))) + 1
+    if count > MAX_ARRAY_POINTS:
+        raise PDT_CommandFailure(f"{PDT_ERR_ARRAY_SIZE} {MAX_ARRAY_POINTS}")
+    return start + step * np.arange(count)
+
+
+def array_points(text, decimal_places):
+    """Read an Array of Points from the Values of an Array Command.
+
+    Note:
+        Points are separated by ";", each is x,y,z and any coordinate may be a
+        range, start:stop:step, giving a grid of points, one for each combination.
+        For example "0,0,0;0:10:2,5,0" gives 7 points.
+
+    Args:
+        text: The Values part of the Command String
+        decimal_places: Rounding Factor for Inputs, from Preferences
+
+    Returns:
+        Read only Float Array of Points, shape (N, 3).
+
+    Raises:
+        PDT_CommandFailure: The Values are not valid, the message says why.
+    """
+
+    points = []
+    total = 0
+    for item in text.split(";"):
+        if item.strip() == "":
+            continue
+        axes = item.split(",")
+        if len(axes) != 3:
+            raise PDT_CommandFailure(f"{PDT_ERR_BAD_ARRAY} '{item}'")
+        axis_values = [axis_range(axis, item) for axis in axes]
+        total += int(np.prod([len(values) for values in axis_values]))
+        if total > MAX_ARRAY_POINTS:
+            raise PDT_CommandFailure(f"{PDT_ERR_ARRAY_SIZE} {MAX_ARRAY_POINTS}")
+        grid = np.meshgrid(*axis_values, indexing="ij")
+        points.append(np.stack(grid, axis=-1).reshape(-1, 3))
+    if not points:
+        raise PDT_CommandFailure(f"{PDT_ERR_BAD_ARRAY} '{text}'")
+    points = np.round(np.concatenate(points), decimal_places)
+    points.flags.writeable = False
+    return points
+
+
+def load_points(context, source, plane):
+    """Read an Array of Points from a Text or File.
+
+    Note:
+        A Text is read as CSV, a file ending .npy as a NumPy array and any other
+        file as CSV. Each row is x,y,z, or x,y on the Working Plane.
 
     Args:
         context: Blender bpy.context instance.
-        pg: PDT Parameters Group - our variables
-        obj: The Active Object
+        source: Name of a Text, or path of a File, "//" is the .blend file's folder
+        plane: Working Plane, for points with two coordinates
+
+    Returns:
+        Float Array of Points, shape (N, 3).
+
+    Raises:
+        PDT_CommandFailure: The Points cannot be read, the message says why.
+    """
+
+    texts = context.blend_data.texts
+    try:
+        if source in texts:
+            data = np.loadtxt(io.StringIO(texts[source].as_string()), delimiter=",", ndmin=2)
+        elif source.lower().endswith(".npy"):
+            data = np.load(bpy.path.abspath(source))
+        else:
+            data = np.loadtxt(bpy.path.abspath(source), delimiter=",", ndmin=2)
+    except (OSError, ValueError):
+        raise PDT_CommandFailure(f"{PDT_ERR_NO_POINTS} {source}")
+    data = np.asarray(data, dtype=np.float64)
+    if data.ndim != 2 or data.shape[1] not in {2, 3} or len(data) == 0:
+        raise PDT_CommandFailure(f"{PDT_ERR_NO_POINTS} {source}")
+    if len(data) > MAX_ARRAY_POINTS:
+        raise PDT_CommandFailure(f"{PDT_ERR_ARRAY_SIZE} {MAX_ARRAY_POINTS}")
+    return plane_points(data, plane)
+
+
+def plane_points(data, plane):
+    """Make 3D Points of Rows of x,y on the Working Plane, or x,y,z.
+
+    Args:
+        data: Float Array of Coordinates, shape (N, 2) or (N, 3)
+        plane: Working Plane, see set_mode
+
+    Returns:
+        Float Array of Points, shape (N, 3).
+    """
+
+    if data.shape[1] == 3:
+        return data
+    a1, a2, _ = set_mode(plane)
+    points = np.zeros((len(data), 3))
+    points[:, a1] = data[:, 0]
+    points[:, a2] = data[:, 1]
+    return points
+
+
+def vector_build(session, operation, values, num_values):
+    """Build Movement Vector from Input Fields.
+
+    Args:
+        session: The Command's PDTSession
         operation: The Operation e.g. Create New Vertex
         values: The paramters passed e.g. 1,4,3 for Cartesian Coordinates
         num_values: The number of values passed - determines the function
@@ -97,20 +236,18 @@ def vector_build(context, pg, obj, operation, values, num_values):
         Vector to position, or offset, items.
     """
 
-    scene = context.scene
-    plane = pg.plane
+    pg = session.pg
     flip_angle = pg.flip_angle
-    flip_percent= pg.flip_percent
 
     # Cartesian 3D coordinates
     if num_values == 3 and len(values) == 3:
         output_vector = Vector((float(values[0]), float(values[1]), float(values[2])))
     # Polar 2D coordinates
     elif num_values == 2 and len(values) == 2:
-        output_vector = dis_ang(values, flip_angle, plane, scene)
+        output_vector = dis_ang(values, flip_angle, session.plane, session.scene)
     # Percentage of imaginary line between two 3D coordinates
     elif num_values == 1 and len(values) == 1:
-        output_vector = get_percent(obj, flip_percent, float(values[0]), operation, scene)
+        output_vector = get_percent(session, float(values[0]), operation)
     else:
         if num_values == 3:
             pg.error = PDT_ERR_BAD3VALS
@@ -118,7 +255,7 @@ def vector_build(context, pg, obj, operation, values, num_values):
             pg.error = PDT_ERR_BAD2VALS
         else:
             pg.error = PDT_ERR_BAD1VALS
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(session.context)
         raise PDT_InvalidVector
     return output_vector
 
@@ -142,25 +279,26 @@ def placement_normal(context, operation):
     if obj.mode == "EDIT":
         if obj is None:
             pg.error = PDT_ERR_NO_ACT_OBJ
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_ObjectModeError
         obj_loc = obj.matrix_world.decompose()[0]
         bm = bmesh.from_edit_mesh(obj.data)
+        selection = SelectionSnapshot(bm)
         if len(bm.select_history) == 3:
-            vector_a, vector_b, vector_c = check_selection(3, bm, obj)
+            vector_a, vector_b, vector_c = check_selection(3, bm, obj, selection)
             if vector_a is None:
                 pg.error = PDT_ERR_VERT_MODE
-                context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+                popup_message(context)
                 raise PDT_FeatureError
         else:
             pg.error = f"{PDT_ERR_SEL_3_VERTIO} {len(bm.select_history)})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_SelectionError
     elif obj.mode == "OBJECT":
         objs = context.view_layer.objects.selected
         if len(objs) != 3:
             pg.error = f"{PDT_ERR_SEL_3_OBJS} {len(objs)})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_SelectionError
         objs_s = [ob for ob in objs if ob.name != obj.name]
         vector_a = obj.matrix_world.decompose()[0]
@@ -180,44 +318,42 @@ def placement_normal(context, operation):
     elif operation == "G":
         if obj.mode == "EDIT":
             if extend_all:
-                for v in [v for v in bm.verts if v.select]:
+                for v in selection.verts:
                     v.co = vector_delta
                 bm.select_history.clear()
-                bmesh.ops.remove_doubles(bm, verts=[v for v in bm.verts if v.select], dist=0.0001)
+                bmesh.ops.remove_doubles(bm, verts=selection.verts, dist=0.0001)
             else:
                 bm.select_history[-1].co = vector_delta
                 bm.select_history.clear()
-            bmesh.update_edit_mesh(obj.data)
+            sync_edit_mesh(obj.data)
         elif obj.mode == "OBJECT":
             context.view_layer.objects.active.location = vector_delta
     elif operation == "N":
         if obj.mode == "EDIT":
             vertex_new = bm.verts.new(vector_delta)
-            bmesh.update_edit_mesh(obj.data)
+            sync_edit_mesh(obj.data)
             bm.select_history.clear()
-            for v in [v for v in bm.verts if v.select]:
-                v.select_set(False)
+            selection.deselect()
             vertex_new.select_set(True)
         else:
             pg.error = f"{PDT_ERR_EDIT_MODE} {obj.mode})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             return
     elif operation == "V" and obj.mode == "EDIT":
         vector_new = vector_delta
         vertex_new = bm.verts.new(vector_new)
         if extend_all:
-            for v in [v for v in bm.verts if v.select]:
+            for v in selection.verts:
                 bm.edges.new([v, vertex_new])
         else:
             bm.edges.new([bm.select_history[-1], vertex_new])
-        for v in [v for v in bm.verts if v.select]:
-            v.select_set(False)
+        selection.deselect()
         vertex_new.select_set(True)
-        bmesh.update_edit_mesh(obj.data)
+        sync_edit_mesh(obj.data)
         bm.select_history.clear()
     else:
         pg.error = f"{operation} {PDT_ERR_NON_VALID} {PDT_LAB_NOR}"
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
 
 
 def placement_arc_centre(context, operation):
@@ -239,15 +375,16 @@ def placement_arc_centre(context, operation):
     if obj.mode == "EDIT":
         if obj is None:
             pg.error = PDT_ERR_NO_ACT_OBJ
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_ObjectModeError
         obj = context.view_layer.objects.active
         obj_loc = obj.matrix_world.decompose()[0]
         bm = bmesh.from_edit_mesh(obj.data)
-        verts = [v for v in bm.verts if v.select]
+        selection = SelectionSnapshot(bm)
+        verts = selection.verts
         if len(verts) != 3:
             pg.error = f"{PDT_ERR_SEL_3_VERTS} {len(verts)})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_SelectionError
         vector_a = verts[0].co
         vector_b = verts[1].co
@@ -255,7 +392,7 @@ def placement_arc_centre(context, operation):
         vector_delta, radius = arc_centre(vector_a, vector_b, vector_c)
         if str(radius) == "inf":
             pg.error = PDT_ERR_STRIGHT_LINE
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_InfRadius
         pg.distance = radius
         if operation == "C":
@@ -265,43 +402,42 @@ def placement_arc_centre(context, operation):
         elif operation == "N":
             vector_new = vector_delta
             vertex_new = bm.verts.new(vector_new)
-            for v in [v for v in bm.verts if v.select]:
-                v.select_set(False)
+            selection.deselect()
             vertex_new.select_set(True)
-            bmesh.update_edit_mesh(obj.data)
+            sync_edit_mesh(obj.data)
             bm.select_history.clear()
             vertex_new.select_set(True)
         elif operation == "G":
             if extend_all:
-                for v in [v for v in bm.verts if v.select]:
+                for v in selection.verts:
                     v.co = vector_delta
                 bm.select_history.clear()
-                bmesh.ops.remove_doubles(bm, verts=[v for v in bm.verts if v.select], dist=0.0001)
+                bmesh.ops.remove_doubles(bm, verts=selection.verts, dist=0.0001)
             else:
                 bm.select_history[-1].co = vector_delta
                 bm.select_history.clear()
-            bmesh.update_edit_mesh(obj.data)
+            sync_edit_mesh(obj.data)
         elif operation == "V":
             vertex_new = bm.verts.new(vector_delta)
             if extend_all:
-                for v in [v for v in bm.verts if v.select]:
+                for v in verts:
                     bm.edges.new([v, vertex_new])
-                    v.select_set(False)
+                selection.deselect()
                 vertex_new.select_set(True)
                 bm.select_history.clear()
-                bmesh.ops.remove_doubles(bm, verts=[v for v in bm.verts if v.select], dist=0.0001)
-                bmesh.update_edit_mesh(obj.data)
+                bmesh.ops.remove_doubles(bm, verts=[vertex_new], dist=0.0001)
+                sync_edit_mesh(obj.data)
             else:
                 bm.edges.new([bm.select_history[-1], vertex_new])
-                bmesh.update_edit_mesh(obj.data)
+                sync_edit_mesh(obj.data)
                 bm.select_history.clear()
         else:
             pg.error = f"{operation} {PDT_ERR_NON_VALID} {PDT_LAB_ARCCENTRE}"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
     elif obj.mode == "OBJECT":
         if len(context.view_layer.objects.selected) != 3:
             pg.error = f"{PDT_ERR_SEL_3_OBJS} {len(context.view_layer.objects.selected)})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_SelectionError
         vector_a = context.view_layer.objects.selected[0].matrix_world.decompose()[0]
         vector_b = context.view_layer.objects.selected[1].matrix_world.decompose()[0]
@@ -316,7 +452,7 @@ def placement_arc_centre(context, operation):
             context.view_layer.objects.active.location = vector_delta
         else:
             pg.error = f"{operation} {PDT_ERR_NON_VALID} {PDT_LAB_ARCCENTRE}"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
 
 
 def placement_intersect(context, operation):
@@ -337,11 +473,12 @@ def placement_intersect(context, operation):
     if obj.mode == "EDIT":
         if obj is None:
             pg.error = PDT_ERR_NO_ACT_OBJ
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_NoObjectError
         obj_loc = obj.matrix_world.decompose()[0]
         bm = bmesh.from_edit_mesh(obj.data)
-        edges = [e for e in bm.edges if e.select]
+        selection = SelectionSnapshot(bm)
+        edges = selection.edges
         extend_all = pg.extend
 
         if len(edges) == 2:
@@ -358,7 +495,7 @@ def placement_intersect(context, operation):
                     + str(len(edges))
                     + " Edges)"
                 )
-                context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+                popup_message(context)
                 raise PDT_SelectionError
             vertex_a = bm.select_history[-1]
             vertex_b = bm.select_history[-2]
@@ -368,7 +505,7 @@ def placement_intersect(context, operation):
         vector_delta, done = intersection(vertex_a.co, vertex_b.co, vertex_c.co, vertex_d.co, plane)
         if not done:
             pg.error = f"{PDT_ERR_INT_LINES} {plane}  {PDT_LAB_PLANE}"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_IntersectionError
 
         if operation == "C":
@@ -378,14 +515,9 @@ def placement_intersect(context, operation):
         elif operation == "N":
             vector_new = vector_delta
             vertex_new = bm.verts.new(vector_new)
-            for v in [v for v in bm.verts if v.select]:
-                v.select_set(False)
-            for f in bm.faces:
-                f.select_set(False)
-            for e in bm.edges:
-                e.select_set(False)
+            selection.deselect()
             vertex_new.select_set(True)
-            bmesh.update_edit_mesh(obj.data)
+            sync_edit_mesh(obj.data)
             bm.select_history.clear()
         elif operation in {"G", "V"}:
             vertex_new = None
@@ -427,31 +559,28 @@ def placement_intersect(context, operation):
 
             if not process and not extend_all:
                 pg.error = PDT_ERR_INT_NO_ALL
-                context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
-                bmesh.update_edit_mesh(obj.data)
+                popup_message(context)
+                sync_edit_mesh(obj.data)
                 return
-            for v in bm.verts:
-                v.select_set(False)
-            for f in bm.faces:
-                f.select_set(False)
-            for e in bm.edges:
-                e.select_set(False)
+            # Doubles were removed, so the selection is read again.
+            selection.refresh()
+            selection.deselect()
 
             if vertex_new is not None:
                 vertex_new.select_set(True)
             for v in bm.select_history:
                 if v is not None:
                     v.select_set(True)
-            bmesh.update_edit_mesh(obj.data)
+            sync_edit_mesh(obj.data)
         else:
             pg.error = f"{operation} {PDT_ERR_NON_VALID} {PDT_LAB_INTERSECT}"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_InvalidOperation
 
     elif obj.mode == "OBJECT":
         if len(context.view_layer.objects.selected) != 4:
             pg.error = f"{PDT_ERR_SEL_4_OBJS} {len(context.view_layer.objects.selected)})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_SelectionError
         order = pg.object_order.split(",")
         objs = sorted(context.view_layer.objects.selected, key=lambda x: x.name)
@@ -465,7 +594,7 @@ def placement_intersect(context, operation):
             + ", "
             + objs[3].name
         )
-        context.window_manager.popup_menu(oops, title="Info", icon="INFO")
+        popup_message(context, title="Info", icon="INFO")
 
         vector_a = objs[int(order[0]) - 1].matrix_world.decompose()[0]
         vector_b = objs[int(order[1]) - 1].matrix_world.decompose()[0]
@@ -474,7 +603,7 @@ def placement_intersect(context, operation):
         vector_delta, done = intersection(vector_a, vector_b, vector_c, vector_d, plane)
         if not done:
             pg.error = f"{PDT_ERR_INT_LINES} {plane}  {PDT_LAB_PLANE}"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_IntersectionError
         if operation == "C":
             scene.cursor.location = vector_delta
@@ -483,10 +612,10 @@ def placement_intersect(context, operation):
         elif operation == "G":
             context.view_layer.objects.active.location = vector_delta
             pg.error = f"{PDT_INF_OBJ_MOVED} {context.view_layer.objects.active.name}"
-            context.window_manager.popup_menu(oops, title="Info", icon="INFO")
+            popup_message(context, title="Info", icon="INFO")
         else:
             pg.error = f"{operation} {PDT_ERR_NON_VALID} {PDT_LAB_INTERSECT}"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
         return
     else:
         return
@@ -512,24 +641,25 @@ def join_two_vertices(context):
     obj = context.view_layer.objects.active
     if all([bool(obj), obj.type == "MESH", obj.mode == "EDIT"]):
         bm = bmesh.from_edit_mesh(obj.data)
-        verts = [v for v in bm.verts if v.select]
+        selection = SelectionSnapshot(bm)
+        verts = selection.verts
         if len(verts) == 2:
             try:
                 bm.edges.new([verts[-1], verts[-2]])
-                bmesh.update_edit_mesh(obj.data)
+                sync_edit_mesh(obj.data)
                 bm.select_history.clear()
                 return
             except ValueError:
                 pg.error = PDT_ERR_CONNECTED
-                context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+                popup_message(context)
                 raise PDT_VerticesConnected
         else:
             pg.error = f"{PDT_ERR_SEL_2_VERTS} {len(verts)})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_SelectionError
     else:
         pg.error = f"{PDT_ERR_EDOB_MODE},{obj.mode})"
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
         raise PDT_ObjectModeError
 
 
@@ -555,31 +685,32 @@ def set_angle_distance_two(context):
     obj = context.view_layer.objects.active
     if obj is None:
         pg.error = PDT_ERR_NO_ACT_OBJ
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
         return
     if obj.mode == "EDIT":
         bm = bmesh.from_edit_mesh(obj.data)
-        verts = [v for v in bm.verts if v.select]
+        selection = SelectionSnapshot(bm)
+        verts = selection.verts
         if len(verts) == 2:
             if len(bm.select_history) == 2:
-                vector_a, vector_b = check_selection(2, bm, obj)
+                vector_a, vector_b = check_selection(2, bm, obj, selection)
                 if vector_a is None:
                     pg.error = PDT_ERR_VERT_MODE
-                    context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+                    popup_message(context)
                     raise PDT_FeatureError
             else:
                 pg.error = f"{PDT_ERR_SEL_2_VERTIO} {len(bm.select_history)})"
-                context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+                popup_message(context)
                 raise PDT_SelectionError
         else:
             pg.error = f"{PDT_ERR_SEL_2_VERTIO} {len(verts)})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_SelectionError
     elif obj.mode == "OBJECT":
         objs = context.view_layer.objects.selected
         if len(objs) < 2:
             pg.error = f"{PDT_ERR_SEL_2_OBJS} {len(objs)})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_SelectionError
         objs_s = [ob for ob in objs if ob.name != obj.name]
         vector_a = obj.matrix_world.decompose()[0]
@@ -634,31 +765,32 @@ def set_angle_distance_three(context):
     obj = context.view_layer.objects.active
     if obj is None:
         pg.error = PDT_ERR_NO_ACT_OBJ
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
         raise PDT_NoObjectError
     if obj.mode == "EDIT":
         bm = bmesh.from_edit_mesh(obj.data)
-        verts = [v for v in bm.verts if v.select]
+        selection = SelectionSnapshot(bm)
+        verts = selection.verts
         if len(verts) == 3:
             if len(bm.select_history) == 3:
-                vector_a, vector_b, vector_c = check_selection(3, bm, obj)
+                vector_a, vector_b, vector_c = check_selection(3, bm, obj, selection)
                 if vector_a is None:
                     pg.error = PDT_ERR_VERT_MODE
-                    context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+                    popup_message(context)
                     raise PDT_FeatureError
             else:
                 pg.error = f"{PDT_ERR_SEL_3_VERTIO} {len(bm.select_history)})"
-                context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+                popup_message(context)
                 raise PDT_SelectionError
         else:
             pg.error = f"{PDT_ERR_SEL_3_VERTIO} {len(verts)})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_SelectionError
     elif obj.mode == "OBJECT":
         objs = context.view_layer.objects.selected
         if len(objs) < 3:
             pg.error = PDT_ERR_SEL_3_OBJS + str(len(objs))
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_SelectionError
         objs_s = [ob for ob in objs if ob.name != obj.name]
         vector_a = obj.matrix_world.decompose()[0]
@@ -704,7 +836,7 @@ def origin_to_cursor(context):
     obj = context.view_layer.objects.active
     if obj is None:
         pg.error = PDT_ERR_NO_ACT_OBJ
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
         return
     obj_loc = obj.matrix_world.decompose()[0]
     cur_loc = scene.cursor.location
@@ -714,7 +846,7 @@ def origin_to_cursor(context):
         for v in bm.verts:
             v.co = v.co + diff_v
         obj.location = cur_loc
-        bmesh.update_edit_mesh(obj.data)
+        sync_edit_mesh(obj.data)
         bm.select_history.clear()
     elif obj.mode == "OBJECT":
         for v in obj.data.vertices:
@@ -722,7 +854,7 @@ def origin_to_cursor(context):
         obj.location = cur_loc
     else:
         pg.error = f"{PDT_ERR_EDOB_MODE} {obj.mode})"
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
         raise PDT_ObjectModeError
 
 
@@ -753,36 +885,42 @@ def taper(context):
     if all([bool(obj), obj.type == "MESH", obj.mode == "EDIT"]):
         if ang_v > 80 or ang_v < -80:
             pg.error = f"{PDT_ERR_TAPER_ANG} {ang_v})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_InvalidAngle
         if obj is None:
             pg.error = PDT_ERR_NO_ACT_OBJ
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_NoObjectError
         _, a2, a3 = set_axis(tap_ax)
         bm = bmesh.from_edit_mesh(obj.data)
         if len(bm.select_history) >= 1:
             rotate_vertex = bm.select_history[-1]
-            view_vector = view_coords(rotate_vertex.co.x, rotate_vertex.co.y, rotate_vertex.co.z)
         else:
             pg.error = f"{PDT_ERR_TAPER_SEL} {len(bm.select_history)})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             raise PDT_SelectionError
-        for v in [v for v in bm.verts if v.select]:
-            if pg.plane == "LO":
-                v_loc = view_coords(v.co.x, v.co.y, v.co.z)
-                dis_v = sqrt((view_vector.x - v_loc.x) ** 2 + (view_vector.y - v_loc.y) ** 2)
-                x_loc = dis_v * tan(ang_v * pi / 180)
-                view_matrix = view_dir(x_loc, 0)
-                v.co = v.co - view_matrix
-            else:
-                dis_v = sqrt(
-                    (rotate_vertex.co[a3] - v.co[a3]) ** 2 + (rotate_vertex.co[a2] - v.co[a2]) ** 2
-                )
-                v.co[a2] = v.co[a2] - (dis_v * tan(ang_v * pi / 180))
-        bmesh.update_edit_mesh(obj.data)
+        # All selected vertices are sheared at once, each by its distance from the
+        # Active Vertex times the tangent of the angle.
+        #
+        verts = SelectionSnapshot(bm).verts
+        coords = vertex_coords(verts)
+        rotate_co = np.array(rotate_vertex.co, dtype=np.float64)
+        shear = tan(ang_v * pi / 180)
+        if pg.plane == "LO":
+            transform = view_transform()
+            if transform is not None:
+                view_locs = transform.to_world(coords)
+                view_vector = transform.to_world(rotate_co[np.newaxis])[0]
+                dis_v = np.hypot(*(view_vector[:2] - view_locs[:, :2]).T)
+                view_x = transform.to_world([(1.0, 0.0, 0.0)])[0]
+                coords -= np.outer(dis_v * shear, view_x)
+        else:
+            dis_v = np.hypot(rotate_co[a3] - coords[:, a3], rotate_co[a2] - coords[:, a2])
+            coords[:, a2] -= dis_v * shear
+        set_vertex_coords(verts, coords)
+        sync_edit_mesh(obj.data)
         bm.select_history.clear()
     else:
         pg.error = f"{PDT_ERR_EDOB_MODE},{obj.mode})"
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
         raise PDT_ObjectModeError
@@ -28,7 +28,7 @@ import bmesh
 import bgl
 import gpu
 import numpy as np
-from mathutils import Vector, Quaternion
+from mathutils import Matrix, Quaternion, Vector
 from gpu_extras.batch import batch_for_shader
 from math import cos, sin, pi
 from .pdt_msg_strings import (
@@ -106,6 +106,104 @@ def oops(self, context):
     self.layout.label(text=pg.error)
 
 
+class CommandScript:
+    """State of the running Command Script, see pdt_command.run_script.
+
+    Note:
+        While a script runs, error messages are kept in messages instead of being
+        shown in a popup, and meshes are only synced to their Edit Mesh when it ends.
+        Scripts may be nested, for example pdt_api calls made in a script, the
+        meshes are synced when the outermost one finishes.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.messages = []
+        self.meshes = {}
+
+    @property
+    def running(self):
+        """Check whether a Command Script is running.
+
+        Returns:
+            Boolean.
+        """
+
+        return self.depth > 0
+
+    def start(self):
+        """Start a Command Script.
+
+        Returns:
+            Nothing.
+        """
+
+        if self.depth == 0:
+            self.messages.clear()
+            self.meshes.clear()
+        self.depth += 1
+
+    def finish(self):
+        """Finish a Command Script, syncing all Edit Meshes changed if it is the outermost.
+
+        Returns:
+            Nothing.
+        """
+
+        self.depth -= 1
+        if self.depth > 0:
+            return
+        for mesh in self.meshes.values():
+            bmesh.update_edit_mesh(mesh)
+        self.meshes.clear()
+
+
+command_script = CommandScript()
+
+
+def popup_message(context, title="Error", icon="ERROR"):
+    """Show pg.error in a Popup.
+
+    Note:
+        While a Command Script runs, errors are kept in command_script.messages
+        and other messages are dropped.
+
+    Args:
+        context: Blender bpy.context instance.
+        title: Popup Title
+        icon: Popup Icon
+
+    Returns:
+        Nothing.
+    """
+
+    if command_script.running:
+        if icon == "ERROR":
+            command_script.messages.append(context.scene.pdt_pg.error)
+        return
+    context.window_manager.popup_menu(oops, title=title, icon=icon)
+
+
+def sync_edit_mesh(mesh):
+    """Update an Edit Mesh from its Bmesh.
+
+    Note:
+        While a Command Script runs, the update is left until the script finishes,
+        the Bmesh from bmesh.from_edit_mesh is the same for every command.
+
+    Args:
+        mesh: Object Data of a Mesh in Edit Mode
+
+    Returns:
+        Nothing.
+    """
+
+    if command_script.running:
+        command_script.meshes[mesh.as_pointer()] = mesh
+        return
+    bmesh.update_edit_mesh(mesh)
+
+
 def set_mode(mode_pl):
     """Sets Active Axes for View Orientation.
 
@@ -157,7 +255,7 @@ def set_axis(mode_pl):
     return order[mode_pl]
 
 
-def check_selection(num, bm, obj):
+def check_selection(num, bm, obj, selection=None):
     """Check that the Object's select_history has sufficient entries.
 
     Note:
@@ -167,6 +265,7 @@ def check_selection(num, bm, obj):
         num: The number of entries required for each operation
         bm: The Bmesh from the Object
         obj: The Object
+        selection: SelectionSnapshot of bm, read here if not given
 
     Returns:
         list of 3D points as Vectors.
@@ -192,22 +291,238 @@ def check_selection(num, bm, obj):
             vector_d = bm.select_history[-4].co
             return vector_a, vector_b, vector_c, vector_d
     else:
-        for f in bm.faces:
-            f.select_set(False)
-        for e in bm.edges:
-            e.select_set(False)
-        for v in bm.verts:
-            v.select_set(False)
-        bmesh.update_edit_mesh(obj.data)
+        (selection or SelectionSnapshot(bm)).deselect()
+        sync_edit_mesh(obj.data)
         bm.select_history.clear()
     return None
 
 
-def update_sel(bm, verts, edges, faces):
+def selected_flags(elements):
+    """Read the Select Flags of a Bmesh Sequence in one pass.
+
+    Args:
+        elements: bm.verts, bm.edges or bm.faces
+
+    Returns:
+        Boolean Array, one Flag per Element.
+    """
+
+    return np.fromiter((element.select for element in elements), dtype=bool, count=len(elements))
+
+
+def vertex_coords(verts):
+    """Read the Coordinates of Vertices into one Array.
+
+    Note:
+        BMesh sequences have no foreach_get, the coordinates are read in one pass
+        straight into the array.
+
+    Args:
+        verts: List of BMesh Vertices
+
+    Returns:
+        Float Array, shape (N, 3).
+    """
+
+    coords = np.fromiter(
+        (value for vert in verts for value in vert.co), dtype=np.float64, count=3 * len(verts)
+    )
+    return coords.reshape(-1, 3)
+
+
+def set_vertex_coords(verts, coords):
+    """Write an Array of Coordinates back to Vertices in one pass.
+
+    Args:
+        verts: List of BMesh Vertices
+        coords: Float Array, shape (N, 3)
+
+    Returns:
+        Nothing.
+    """
+
+    for vert, co in zip(verts, np.asarray(coords).tolist()):
+        vert.co = co
+
+
+class SelectionSnapshot:
+    """Selected Vertices, Edges and Faces of a Bmesh, read once.
+
+    Note:
+        The select flags of a sequence are read in one pass into a flag array the
+        first time that sequence is asked for, so a command that only uses the
+        selected vertices never reads the edges or faces. The selected elements are
+        then looked up by index only when asked for. BMesh sequences have no
+        foreach_get, so the flags are read by iteration.
+
+        Selection changes made through deselect and select keep the snapshot up to
+        date, call refresh after adding or removing geometry.
+    """
+
+    def __init__(self, bm):
+        self.bm = bm
+        self.flags = {}
+        self._elements = {}
+
+    def refresh(self):
+        """Forget what was read, so the Selection is read again when next asked for.
+
+        Returns:
+            Nothing.
+        """
+
+        self.flags.clear()
+        self._elements.clear()
+
+    def _flags(self, name):
+        """Read the Select Flags of bm.verts, bm.edges or bm.faces by name, once."""
+        if name not in self.flags:
+            self.flags[name] = selected_flags(getattr(self.bm, name))
+        return self.flags[name]
+
+    def _selected(self, name):
+        """Look up the Selected Elements of bm.verts, bm.edges or bm.faces by name, once."""
+        if name not in self._elements:
+            elements = getattr(self.bm, name)
+            elements.ensure_lookup_table()
+            indices = np.flatnonzero(self._flags(name)).tolist()
+            self._elements[name] = [elements[i] for i in indices]
+        return self._elements[name]
+
+    @property
+    def verts(self):
+        """List of Selected Vertices."""
+        return self._selected("verts")
+
+    @property
+    def edges(self):
+        """List of Selected Edges."""
+        return self._selected("edges")
+
+    @property
+    def faces(self):
+        """List of Selected Faces."""
+        return self._selected("faces")
+
+    @property
+    def geometry(self):
+        """List of Selected Faces, Edges and Vertices, the geom of bmesh.ops."""
+        return self.faces + self.edges + self.verts
+
+    def deselect(self):
+        """Deselect Everything, leaving nothing selected.
+
+        Note:
+            A selected edge or face always has all its vertices selected, so only
+            the selected vertices and the edges and faces using them are visited,
+            the edge and face sequences are not read. The flags are written
+            directly, without select_set flushing each element.
+
+        Returns:
+            Nothing.
+        """
+
+        for vert in self.verts:
+            for face in vert.link_faces:
+                face.select = False
+            for edge in vert.link_edges:
+                edge.select = False
+            vert.select = False
+        for name, flags in self.flags.items():
+            flags[:] = False
+            self._elements[name] = []
+
+    def select(self, verts=(), edges=(), faces=()):
+        """Select Elements, writing their Flags directly.
+
+        Note:
+            Give every vertex and edge of the faces and edges selected, as the
+            geom returned by bmesh.ops does, the selection is not flushed.
+
+        Args:
+            verts: Vertices to select
+            edges: Edges to select
+            faces: Faces to select
+
+        Returns:
+            Nothing.
+        """
+
+        for elements in (verts, edges, faces):
+            for element in elements:
+                element.select = True
+        self.refresh()
+
+
+class PDTSession:
+    """What a Command works on, read once when it starts.
+
+    Note:
+        Made once per command by pdt_command.command_execute and passed to every
+        handler, so the Bmesh, the Active Object's matrices, the Working Plane axes
+        and the Preferences are not looked up again by each function it calls.
+        The Bmesh and its Selection are only read when first asked for.
+
+    Args:
+        context: Blender bpy.context instance.
+    """
+
+    def __init__(self, context):
+        self.context = context
+        self.scene = context.scene
+        self.pg = context.scene.pdt_pg
+        self.obj = context.view_layer.objects.active
+        prefs = context.preferences.addons[__package__].preferences
+        self.decimal_places = prefs.pdt_input_round
+        self.plane = self.pg.plane
+        self.axes = set_mode(self.plane)
+        if self.obj is None:
+            self.matrix_world = Matrix.Identity(4)
+            self.matrix_local = Matrix.Identity(4)
+        else:
+            self.matrix_world = self.obj.matrix_world.copy()
+            self.matrix_local = self.obj.matrix_local.copy()
+        self.matrix_world_inverted = self.matrix_world.inverted_safe()
+        self.matrix_local_inverted = self.matrix_local.inverted_safe()
+        self.obj_loc = self.matrix_world.decompose()[0]
+        self._bm = None
+        self._selection = None
+
+    @property
+    def edit_mesh(self):
+        """Check whether the Active Object is a Mesh in Edit Mode.
+
+        Returns:
+            Boolean.
+        """
+
+        return self.obj is not None and self.obj.type == "MESH" and self.obj.mode == "EDIT"
+
+    @property
+    def bm(self):
+        """The Active Object's Edit Mode Bmesh, None if it is not in Edit Mode."""
+        if self._bm is None and self.edit_mesh:
+            self._bm = bmesh.from_edit_mesh(self.obj.data)
+        return self._bm
+
+    @property
+    def selection(self):
+        """Selection of the Bmesh, see SelectionSnapshot, None if not in Edit Mode."""
+        if self._selection is None and self.bm is not None:
+            self._selection = SelectionSnapshot(self.bm)
+        return self._selection
+
+
+def update_sel(selection, verts, edges, faces):
     """Updates Vertex, Edge and Face Selections following a function.
 
+    Note:
+        The function has changed the geometry, so the selected vertices are read
+        again, then everything is deselected and the given elements are selected,
+        see SelectionSnapshot.deselect and SelectionSnapshot.select.
+
     Args:
-        bm: Object Bmesh
+        selection: SelectionSnapshot of the Object Bmesh
         verts: New Selection for Vertices
         edges: The Edges on which to operate
         faces: The Faces on which to operate
@@ -215,18 +530,169 @@ def update_sel(bm, verts, edges, faces):
     Returns:
         Nothing.
     """
-    for f in bm.faces:
-        f.select_set(False)
-    for e in bm.edges:
-        e.select_set(False)
-    for v in bm.verts:
-        v.select_set(False)
-    for v in verts:
-        v.select_set(True)
-    for e in edges:
-        e.select_set(True)
-    for f in faces:
-        f.select_set(True)
+
+    selection.refresh()
+    selection.deselect()
+    selection.select(verts, edges, faces)
+
+
+def view_areas(screen):
+    """Return the 3D View Areas of a Screen.
+
+    Note:
+        There is no Screen when Blender runs in the background, for example when
+        running a Command Script with pdt_batch, so there are no 3D Views either.
+
+    Args:
+        screen: Blender Screen, or None
+
+    Returns:
+        List of Areas.
+    """
+
+    if screen is None:
+        return []
+    return [a for a in screen.areas if a.type == "VIEW_3D"]
+
+
+class ViewTransform:
+    """Rotation between View and World Space of a 3D View.
+
+    Note:
+        Made from a View Matrix, normalized and inverted once, see view_transform.
+        The Array methods transform whole (N, 3) blocks of coordinates at once.
+
+    Args:
+        view_matrix: 4x4 View Matrix, Region 3D view_matrix
+    """
+
+    def __init__(self, view_matrix):
+        self.world_to_view = Matrix(view_matrix).to_3x3().normalized()
+        self.view_to_world = self.world_to_view.inverted()
+        self._world_to_view = np.array(self.world_to_view, dtype=np.float64)
+        self._view_to_world = np.array(self.view_to_world, dtype=np.float64)
+
+    def to_world(self, coords):
+        """Convert View Oriented Coordinates to World Coordinates.
+
+        Args:
+            coords: Float Array, shape (N, 3)
+
+        Returns:
+            Float Array, shape (N, 3).
+        """
+
+        return np.asarray(coords, dtype=np.float64) @ self._view_to_world.T
+
+    def to_view(self, coords):
+        """Convert World Coordinates to View Oriented Coordinates.
+
+        Args:
+            coords: Float Array, shape (N, 3)
+
+        Returns:
+            Float Array, shape (N, 3).
+        """
+
+        return np.asarray(coords, dtype=np.float64) @ self._world_to_view.T
+
+
+class ViewCache:
+    """The View Transform of the first 3D View, kept until its View Matrix changes.
+
+    Note:
+        The Area of the first 3D View is remembered, so the Screen's Areas are
+        only searched again when the Screen changes or that Area is no longer a 3D
+        View. The view matrix is compared with the one the transform was made
+        from, and a new ViewTransform is only made when it differs.
+    """
+
+    def __init__(self):
+        self.screen = None
+        self.area_index = None
+        self.headless_matrix = None
+        self.matrix = None
+        self.transform = None
+
+    def view_matrix(self, screen):
+        """The View Matrix of the first 3D View of a Screen.
+
+        Args:
+            screen: Blender Screen, or None
+
+        Returns:
+            4x4 View Matrix, or the matrix given to set_view_matrix if there is no
+            3D View.
+        """
+
+        if screen is None:
+            return self.headless_matrix
+        areas = screen.areas
+        index = self.area_index
+        if (
+            screen != self.screen
+            or index is None
+            or index >= len(areas)
+            or areas[index].type != "VIEW_3D"
+        ):
+            index = next((i for i, a in enumerate(areas) if a.type == "VIEW_3D"), None)
+            self.screen = screen
+            self.area_index = index
+        if index is None:
+            return self.headless_matrix
+        return areas[index].spaces.active.region_3d.view_matrix
+
+    def transform_of(self, matrix):
+        """The View Transform of a View Matrix, made again only if the Matrix changed.
+
+        Args:
+            matrix: 4x4 View Matrix
+
+        Returns:
+            ViewTransform.
+        """
+
+        if self.transform is None or matrix != self.matrix:
+            self.matrix = Matrix(matrix).copy()
+            self.transform = ViewTransform(self.matrix)
+        return self.transform
+
+
+view_cache = ViewCache()
+
+
+def set_view_matrix(matrix):
+    """Set the View Matrix View Plane commands use when there is no 3D View.
+
+    Args:
+        matrix: 4x4 View Matrix, or None to clear it
+
+    Returns:
+        Nothing.
+    """
+
+    view_cache.headless_matrix = None if matrix is None else Matrix(matrix).copy()
+
+
+def view_transform(matrix=None):
+    """The View Transform of a View Matrix, or of the first 3D View.
+
+    Note:
+        See ViewCache, without a 3D View the matrix given to set_view_matrix is
+        used.
+
+    Args:
+        matrix: 4x4 View Matrix, or None for the first 3D View's
+
+    Returns:
+        ViewTransform, or None if there is no View Matrix.
+    """
+
+    if matrix is None:
+        matrix = view_cache.view_matrix(bpy.context.screen)
+    if matrix is None:
+        return None
+    return view_cache.transform_of(matrix)
 
 
 def view_coords(x_loc, y_loc, z_loc):
@@ -241,15 +707,10 @@ def view_coords(x_loc, y_loc, z_loc):
         Vector adjusted to View's Inverted Tranformation Matrix.
     """
 
-    areas = [a for a in bpy.context.screen.areas if a.type == "VIEW_3D"]
-    if len(areas) > 0:
-        view_matrix = areas[0].spaces.active.region_3d.view_matrix
-        view_matrix = view_matrix.to_3x3().normalized().inverted()
-        view_location = Vector((x_loc, y_loc, z_loc))
-        new_view_location = view_matrix @ view_location
-        return new_view_location
-
-    return Vector((0, 0, 0))
+    transform = view_transform()
+    if transform is None:
+        return Vector((0, 0, 0))
+    return transform.view_to_world @ Vector((x_loc, y_loc, z_loc))
 
 
 def view_coords_i(x_loc, y_loc, z_loc):
@@ -267,15 +728,10 @@ def view_coords_i(x_loc, y_loc, z_loc):
         Vector adjusted to View's Transformation Matrix.
     """
 
-    areas = [a for a in bpy.context.screen.areas if a.type == "VIEW_3D"]
-    if len(areas) > 0:
-        view_matrix = areas[0].spaces.active.region_3d.view_matrix
-        view_matrix = view_matrix.to_3x3().normalized()
-        view_location = Vector((x_loc, y_loc, z_loc))
-        new_view_location = view_matrix @ view_location
-        return new_view_location
-
-    return Vector((0, 0, 0))
+    transform = view_transform()
+    if transform is None:
+        return Vector((0, 0, 0))
+    return transform.world_to_view @ Vector((x_loc, y_loc, z_loc))
 
 
 def view_dir(dis_v, ang_v):
@@ -293,17 +749,11 @@ def view_dir(dis_v, ang_v):
         World Vector.
     """
 
-    areas = [a for a in bpy.context.screen.areas if a.type == "VIEW_3D"]
-    if len(areas) > 0:
-        view_matrix = areas[0].spaces.active.region_3d.view_matrix
-        view_matrix = view_matrix.to_3x3().normalized().inverted()
-        view_location = Vector((0, 0, 0))
-        view_location.x = dis_v * cos(ang_v * pi / 180)
-        view_location.y = dis_v * sin(ang_v * pi / 180)
-        new_view_location = view_matrix @ view_location
-        return new_view_location
-
-    return Vector((0, 0, 0))
+    transform = view_transform()
+    if transform is None:
+        return Vector((0, 0, 0))
+    view_location = Vector((dis_v * cos(ang_v * pi / 180), dis_v * sin(ang_v * pi / 180), 0))
+    return transform.view_to_world @ view_location
 
 
 def euler_to_quaternion(roll, pitch, yaw):
@@ -331,6 +781,26 @@ def euler_to_quaternion(roll, pitch, yaw):
     return Quaternion((quat_w, quat_x, quat_y, quat_z))
 
 
+def rotation_matrices(axis, angles):
+    """Rotation Matrices about an Axis through the Origin, for many Angles at once.
+
+    Args:
+        axis: Rotation Axis, any length
+        angles: Angles in Radians
+
+    Returns:
+        Float Array of 3x3 Matrices, shape (N, 3, 3), anticlockwise looking down the axis.
+    """
+
+    axis = np.asarray(axis, dtype=np.float64)
+    axis = axis / np.linalg.norm(axis)
+    cross = np.array(
+        [[0.0, -axis[2], axis[1]], [axis[2], 0.0, -axis[0]], [-axis[1], axis[0], 0.0]]
+    )
+    angles = np.asarray(angles, dtype=np.float64)[:, None, None]
+    return np.eye(3) + np.sin(angles) * cross + (1.0 - np.cos(angles)) * (cross @ cross)
+
+
 def arc_centre(vector_a, vector_b, vector_c):
     """Calculates Centre of Arc from 3 Vector Locations using standard Numpy routine
 
@@ -430,7 +900,7 @@ def intersection(vertex_a, vertex_b, vertex_c, vertex_d, plane):
     return vector_delta, True
 
 
-def get_percent(obj, flip_percent, per_v, data, scene):
+def get_percent(session, per_v, data):
     """Calculates a Percentage Distance between 2 Vectors.
 
     Note:
@@ -441,31 +911,31 @@ def get_percent(obj, flip_percent, per_v, data, scene):
         or 2 selected objects in Object mode.
 
     Args:
-        obj: The Object under consideration
-        flip_percent: Setting this to True measures the percentage starting from the second vector
+        session: The Command's PDTSession, pg.flip_percent measures the percentage
+            starting from the second vector
         per_v: Percentage Input Value
         data: pg.flip, pg.percent scene variables & Operational Mode
-        scene: Context Scene
 
     Returns:
         World Vector.
     """
 
-    pg = scene.pdt_pg
+    pg = session.pg
+    obj = session.obj
+    flip_percent = pg.flip_percent
 
     if obj.mode == "EDIT":
-        bm = bmesh.from_edit_mesh(obj.data)
-        verts = [v for v in bm.verts if v.select]
+        verts = session.selection.verts
         if len(verts) == 2:
             vector_a = verts[0].co
             vector_b = verts[1].co
             if vector_a is None:
                 pg.error = PDT_ERR_VERT_MODE
-                bpy.context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+                popup_message(bpy.context)
                 return None
         else:
             pg.error = PDT_ERR_SEL_2_V_1_E + str(len(verts)) + " Vertices"
-            bpy.context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(bpy.context)
             return None
         coord_a = np.array([vector_a.x, vector_a.y, vector_a.z])
         coord_b = np.array([vector_b.x, vector_b.y, vector_b.z])
@@ -473,22 +943,10 @@ def get_percent(obj, flip_percent, per_v, data, scene):
         objs = bpy.context.view_layer.objects.selected
         if len(objs) != 2:
             pg.error = PDT_ERR_SEL_2_OBJS + str(len(objs)) + ")"
-            bpy.context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(bpy.context)
             return None
-        coord_a = np.array(
-            [
-                objs[-1].matrix_world.decompose()[0].x,
-                objs[-1].matrix_world.decompose()[0].y,
-                objs[-1].matrix_world.decompose()[0].z,
-            ]
-        )
-        coord_b = np.array(
-            [
-                objs[-2].matrix_world.decompose()[0].x,
-                objs[-2].matrix_world.decompose()[0].y,
-                objs[-2].matrix_world.decompose()[0].z,
-            ]
-        )
+        coord_a = np.array(objs[-1].matrix_world.decompose()[0])
+        coord_b = np.array(objs[-2].matrix_world.decompose()[0])
     coord_c = coord_b - coord_a
     coord_d = np.array([0, 0, 0])
     _per_v = per_v
@@ -498,12 +956,11 @@ def get_percent(obj, flip_percent, per_v, data, scene):
     return Vector((coord_out[0], coord_out[1], coord_out[2]))
 
 
-def obj_check(obj, scene, operation):
+def obj_check(session, operation):
     """Check Object & Selection Validity.
 
     Args:
-        obj: Active Object
-        scene: Active Scene
+        session: The Command's PDTSession
         operation: The Operation e.g. Create New Vertex
 
     Returns:
@@ -511,32 +968,31 @@ def obj_check(obj, scene, operation):
         Validity Boolean.
     """
 
-    pg = scene.pdt_pg
+    pg = session.pg
+    obj = session.obj
     _operation = operation.upper()
 
     if obj is None:
         pg.error = PDT_ERR_NO_ACT_OBJ
-        bpy.context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(session.context)
         return None, False
     if obj.mode == "EDIT":
-        bm = bmesh.from_edit_mesh(obj.data)
+        bm = session.bm
         if _operation == "S":
             if len(bm.edges) < 1:
                 pg.error = f"{PDT_ERR_SEL_1_EDGEM} {len(bm.edges)})"
-                bpy.context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+                popup_message(session.context)
                 return None, False
             return bm, True
         if len(bm.select_history) >= 1:
             vector_a = None
-            if _operation not in {"D", "E", "F", "G", "N", "S"}:
-                vector_a = check_selection(1, bm, obj)
-            else:
-                verts = [v for v in bm.verts if v.select]
-                if len(verts) > 0:
-                    vector_a = verts[0]
+            if _operation not in {"A", "D", "E", "F", "G", "N", "S"}:
+                vector_a = check_selection(1, bm, obj, session.selection)
+            elif obj.data.total_vert_sel > 0:
+                vector_a = bm.select_history[-1]
             if vector_a is None:
                 pg.error = PDT_ERR_VERT_MODE
-                bpy.context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+                popup_message(session.context)
                 return None, False
         return bm, True
     return None, True
@@ -0,0 +1,332 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Maths Expressions for the M command.
+#
+# Expressions are parsed and checked against a whitelist of syntax and names, then
+# compiled once and cached by their text, so running one again is a dictionary
+# lookup and a code call. Only numbers, arithmetic, the functions and constants of
+# the math module, abs, min, max and round, and variables are allowed. Values in
+# brackets separated by commas, (1, 2, 3), are Vectors, as are the variables
+# coords, cursor and pivot, whose x, y, z and length may be read.
+#
+# Variables are named by assigning to them, "r = 2.5", in any M command.
+#
+# The same compiled expressions are used to plot functions of a parameter t, see
+# plot_values, evaluated over all the samples at once with NumPy functions in place
+# of the math module.
+#
+import ast
+import math
+from functools import lru_cache
+import numpy as np
+from mathutils import Vector
+
+from . import pdt_exception
+PDT_MathsError = pdt_exception.MathsError
+
+# Number of compiled expressions kept, see compile_expression.
+MATHS_CACHE_SIZE = 256
+
+# Names an expression may call or read, besides variables.
+# Factorials are left out, they can take a very long time.
+FUNCTIONS = {
+    name: value for name, value in vars(math).items()
+    if not name.startswith("_") and name not in {"factorial", "comb", "perm"}
+}
+FUNCTIONS.update(abs=abs, min=min, max=max, round=round, Vector=Vector)
+
+# NumPy functions used in place of math functions when plotting, by name, the names
+# left out here are the same in NumPy, functions without a NumPy version are vectorized.
+NUMPY_NAMES = {
+    "acos": "arccos", "acosh": "arccosh", "asin": "arcsin", "asinh": "arcsinh",
+    "atan": "arctan", "atan2": "arctan2", "atanh": "arctanh", "pow": "power",
+    "min": "minimum", "max": "maximum",
+}
+
+
+def stack_components(components):
+    """Stack the Components of a Vector of Arrays, for plotting.
+
+    Args:
+        components: Tuple of Numbers or Arrays
+
+    Returns:
+        Float Array, shape (N, number of components).
+    """
+
+    return np.stack(np.broadcast_arrays(*components), axis=-1).astype(np.float64)
+
+
+def numpy_function(name, value):
+    """The NumPy version of a Function or Constant, for plotting.
+
+    Args:
+        name: Name of the Function
+        value: The math module Function, or a Constant
+
+    Returns:
+        NumPy Function, vectorized Function, or the Constant.
+    """
+
+    if not callable(value):
+        return value
+    if name == "log":
+        return lambda x, base=math.e: np.log(x) / np.log(base)
+    function = getattr(np, NUMPY_NAMES.get(name, name), None)
+    if isinstance(function, np.ufunc) or name in NUMPY_NAMES:
+        return function
+    return np.vectorize(value, otypes=[np.float64])
+
+
+
+# Vector attributes an expression may read.
+ATTRIBUTES = {"x", "y", "z", "length"}
+
+# Variables taken from PDT's settings, they cannot be assigned to.
+PDT_VARIABLES = {"distance", "angle", "percent", "coords", "cursor", "pivot"}
+
+# Syntax allowed in an expression.
+ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Call, ast.Name, ast.Load, ast.Attribute,
+    ast.Tuple, ast.Num, ast.Constant,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UAdd, ast.USub,
+)
+
+# Variables named by the user, see assign.
+user_variables = {}
+
+
+def power(base, exponent):
+    """Raise to a Power in Floats, so large powers overflow instead of growing without end.
+
+    Args:
+        base: Number, or Array when plotting
+        exponent: Number, or Array when plotting
+
+    Returns:
+        Float, or Array.
+    """
+
+    if isinstance(base, int):
+        base = float(base)
+    if isinstance(exponent, int):
+        exponent = float(exponent)
+    return base ** exponent
+
+
+class VectorLiterals(ast.NodeTransformer):
+    """Make Tuples Vectors and Powers Float Powers.
+
+    Note:
+        Integers are kept, so functions such as round(x, 2) or gcd(4, 6) get the
+        integers they need, only the operands of ** are made floats, see power.
+    """
+
+    def visit_BinOp(self, node):
+        """Make Powers calls of power."""
+        self.generic_visit(node)
+        if not isinstance(node.op, ast.Pow):
+            return node
+        call = ast.Call(
+            func=ast.Name(id="_power", ctx=ast.Load()), args=[node.left, node.right], keywords=[]
+        )
+        return ast.copy_location(call, node)
+
+    def visit_Tuple(self, node):
+        """Make Tuples Vectors."""
+        self.generic_visit(node)
+        vector = ast.Call(func=ast.Name(id="Vector", ctx=ast.Load()), args=[node], keywords=[])
+        return ast.copy_location(vector, node)
+
+
+
+# Globals of every evaluation, nothing else is reachable. Names starting with "_"
+# cannot be written in an expression, only added by VectorLiterals.
+NAMESPACE = dict(FUNCTIONS, _power=power, __builtins__={})
+
+# Globals of plot evaluations.
+PLOT_NAMESPACE = {name: numpy_function(name, value) for name, value in FUNCTIONS.items()}
+PLOT_NAMESPACE.update(Vector=stack_components, _power=power, __builtins__={})
+
+def check_node(node):
+    """Check a Node of an Expression is Allowed.
+
+    Args:
+        node: AST Node
+
+    Returns:
+        Nothing.
+
+    Raises:
+        PDT_MathsError: The node is not allowed.
+    """
+
+    if not isinstance(node, ALLOWED_NODES):
+        raise PDT_MathsError(type(node).__name__)
+    if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+        raise PDT_MathsError(repr(node.value))
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS or node.keywords:
+            raise PDT_MathsError("call")
+    if isinstance(node, ast.Attribute) and node.attr not in ATTRIBUTES:
+        raise PDT_MathsError(node.attr)
+    if isinstance(node, ast.Name) and node.id.startswith("_"):
+        raise PDT_MathsError(node.id)
+
+
+@lru_cache(maxsize=MATHS_CACHE_SIZE)
+def compile_expression(expression):
+    """Check and Compile an Expression.
+
+    Args:
+        expression: The Expression, e.g. "sqrt(3**2 + 4**2)"
+
+    Returns:
+        Code Object.
+
+    Raises:
+        PDT_MathsError: The expression is not valid, or not allowed.
+    """
+
+    try:
+        tree = ast.parse(expression.strip(), mode="eval")
+    except SyntaxError:
+        raise PDT_MathsError(expression)
+    for node in ast.walk(tree):
+        check_node(node)
+    tree = ast.fix_missing_locations(VectorLiterals().visit(tree))
+    return compile(tree, "<pdt maths>", "eval")
+
+
+def pdt_variables(context):
+    """Variables taken from PDT's Settings.
+
+    Args:
+        context: Blender bpy.context instance.
+
+    Returns:
+        Dictionary of Values by Name.
+    """
+
+    pg = context.scene.pdt_pg
+    return {
+        "distance": pg.distance,
+        "angle": pg.angle,
+        "percent": pg.percent,
+        "coords": Vector(pg.cartesian_coords),
+        "cursor": context.scene.cursor.location.copy(),
+        "pivot": Vector(pg.pivot_loc),
+    }
+
+
+def evaluate(expression, context):
+    """Evaluate an Expression.
+
+    Args:
+        expression: The Expression
+        context: Blender bpy.context instance.
+
+    Returns:
+        Float, or Vector.
+
+    Raises:
+        PDT_MathsError: The expression is not valid, or fails.
+    """
+
+    code = compile_expression(expression)
+    variables = dict(user_variables)
+    variables.update(pdt_variables(context))
+    try:
+        result = eval(code, NAMESPACE, variables)
+    except (ArithmeticError, ValueError, TypeError, NameError, AttributeError) as error:
+        raise PDT_MathsError(str(error))
+    if isinstance(result, Vector):
+        return result
+    if isinstance(result, (int, float)):
+        return float(result)
+    raise PDT_MathsError(type(result).__name__)
+
+
+def plot_values(expression, t_start, t_end, samples, context):
+    """Evaluate an Expression in t over all Samples at once.
+
+    Args:
+        expression: The Expression in t, giving a number or a Vector of 2 or 3
+        t_start: First value of t
+        t_end: Last value of t
+        samples: Number of values of t, evenly spaced
+        context: Blender bpy.context instance.
+
+    Returns:
+        Float Array of t, shape (N,), and Float Array of Values, shape (N,) or (N, K).
+
+    Raises:
+        PDT_MathsError: The expression is not valid, or fails, or gives values that
+            are not finite.
+    """
+
+    code = compile_expression(expression)
+    t_values = np.linspace(t_start, t_end, samples)
+    variables = dict(user_variables)
+    variables.update(pdt_variables(context))
+    variables["t"] = t_values
+    try:
+        with np.errstate(all="ignore"):
+            result = np.asarray(eval(code, PLOT_NAMESPACE, variables), dtype=np.float64)
+    except (ArithmeticError, ValueError, TypeError, NameError, AttributeError) as error:
+        raise PDT_MathsError(str(error))
+    if result.ndim == 0:
+        result = np.full(samples, float(result))
+    elif result.ndim == 1 and len(result) in {2, 3} and len(result) != samples:
+        result = np.broadcast_to(result, (samples, len(result)))
+    if result.shape[0] != samples or result.ndim > 2 or not np.all(np.isfinite(result)):
+        raise PDT_MathsError(expression)
+    return t_values, result
+
+
+def assign(expression, context):
+    """Evaluate an Expression, Assigning it to a Variable if it starts with "name =".
+
+    Args:
+        expression: The Expression, e.g. "r = 2.5" or "r * 2"
+        context: Blender bpy.context instance.
+
+    Returns:
+        Float, or Vector.
+
+    Raises:
+        PDT_MathsError: The expression is not valid, or fails, or the name is not valid.
+    """
+
+    name, equals, value = expression.partition("=")
+    name = name.strip()
+    if not equals or value.startswith("=") or not name.isidentifier():
+        return evaluate(expression, context)
+    if name.startswith("_") or name in FUNCTIONS or name in PDT_VARIABLES:
+        raise PDT_MathsError(name)
+    result = evaluate(value, context)
+    user_variables[name] = result
+    return result
@@ -41,6 +41,8 @@ from .pdt_msg_strings import (
     PDT_LAB_FLIPPERCENT,
     PDT_LAB_INTERSECT,
     PDT_LAB_INTERSETALL,
+    PDT_LAB_INTERSETALLMODAL,
+    PDT_LAB_FILLREGIONS,
     PDT_LAB_JOIN2VERTS,
     PDT_LAB_MODE,
     PDT_LAB_NOR,
@@ -57,6 +59,7 @@ from .pdt_msg_strings import (
     PDT_LAB_PLANE,
     PDT_LAB_PROFILE,
     PDT_LAB_RADIUS,
+    PDT_LAB_RUNSCRIPT,
     PDT_LAB_SEGMENTS,
     PDT_LAB_TAPER,
     PDT_LAB_TAPERAXES,
@@ -207,6 +210,9 @@ class PDT_PT_PanelTools(Panel):
         row = layout.row()
         row.operator("pdt.edge_to_face", text=PDT_LAB_EDGETOEFACE)
         row.operator("pdt.intersectall", text=PDT_LAB_INTERSETALL)
+        row = layout.row()
+        row.operator("pdt.intersectall_modal", text=PDT_LAB_INTERSETALLMODAL)
+        row.operator("pdt.fillregions", text=PDT_LAB_FILLREGIONS)
         #
         # Taper tool
         box = layout.box()
@@ -416,6 +422,9 @@ class PDT_PT_PanelCommandLine(Panel):
         row.operator("pdt.command_rerun", text="", icon="LOOP_BACK")
         row = layout.row()
         row.prop(pdt_pg, "maths_output", text="Maths Output")
+        row = layout.row()
+        row.prop(pdt_pg, "command_script", text="")
+        row.operator("pdt.run_script", text=PDT_LAB_RUNSCRIPT, icon="TEXT")
 
 class PDT_PT_PanelTangent(Panel):
     bl_idname = "PDT_PT_PanelTangent"
@@ -68,6 +68,10 @@ PDT_LAB_AD3D = "Set A/D 3D"
 PDT_LAB_TAPERAXES = ""  # Intentionally left blank
 PDT_LAB_TAPER = "Taper"
 PDT_LAB_INTERSETALL = "Intersect All"
+PDT_LAB_INTERSETALLMODAL = "Intersect All (Modal)"
+PDT_LAB_FILLREGIONS = "Fill Regions"
+PDT_LAB_RUNSCRIPT = "Run Script"
+PDT_LAB_MERGED_MOVE = "PDT Merged Moves"
 PDT_LAB_BISECT = "Bisect"
 PDT_LAB_EDGETOEFACE = "Edge-To-Face"
 PDT_LAB_FILLET = "Fillet"
@@ -111,11 +115,13 @@ PDT_ERR_SEL_1_E_1_F = "Select 1 Face and 1 Detached Edge"
 
 PDT_ERR_SEL_1_EDGE = "Select Exactly 1 Edge (Currently selected:"
 PDT_ERR_SEL_1_EDGEM = "Select at least 1 Edge (Currently selected:"
+PDT_ERR_SEL_3_EDGES = "Select at least 3 Edges (Currently selected:"
 
 PDT_ERR_SEL_1_OBJ = "Select Exactly 1 Object (Currently selected:"
 PDT_ERR_SEL_2_OBJS = "Select Exactly 2 Objects (Currently selected:"
 PDT_ERR_SEL_3_OBJS = "Select Exactly 3 Objects (Currently selected:"
 PDT_ERR_SEL_4_OBJS = "Select Exactly 4 Objects (Currently selected:"
+PDT_ERR_SEL_2_MESHES = "Select at least 2 Mesh Objects (Currently selected:"
 
 PDT_ERR_FACE_SEL = "You have a Face Selected, this would have ruined the Topology"
 
@@ -134,16 +140,25 @@ PDT_ERR_NO3DVIEW = "View3D not found, cannot run operator"
 PDT_ERR_SCALEZERO = "Scale Distance is 0"
 
 PDT_ERR_CHARS_NUM = "Bad Command Format, not enough Characters"
-PDT_ERR_BADFLETTER = "Bad Operator (1st Letter); C D E F G N M P S V or ? only"
+PDT_ERR_BADFLETTER = "Bad Operator (1st Letter); A C D E F G N M P S V or ? only"
 PDT_ERR_BADMATHS = "Not a Valid Mathematical Expression!"
+PDT_ERR_MATHS_VECTOR = "A Vector result can only be sent to the X, Y & Z fields (mx)"
+PDT_ERR_BADPLOT = "Bad Plot - give expression in t;start;end;samples e.g. sin(t);0;2*pi;64"
+PDT_ERR_PLOTEDIT = "Only Plot Functions in Edit Mode"
 PDT_ERR_BADCOORDL = "X Y & Z Not permitted in anything other than Maths Operations"
 PDT_ERR_BAD1VALS = "Bad Command - 1 Value needed"
 PDT_ERR_BAD2VALS = "Bad Command - 2 Values needed"
 PDT_ERR_BAD3VALS = "Bad Command - 3 Coords needed"
+PDT_ERR_BAD_ARRAY = "Bad Array - use x,y,z;x,y,z with start:stop:step ranges, or @Text, at"
+PDT_ERR_ARRAY_SIZE = "Too many Points in Array, the most allowed is"
+PDT_ERR_NO_POINTS = "Cannot read x,y,z or x,y Points from"
+PDT_ERR_BAD_REPEAT = "Bad Repeat, give a whole number of copies after *, from 1 to"
 PDT_ERR_ADDVEDIT = "Only Add New Vertices in Edit Mode"
 PDT_ERR_SPLITEDIT = "Only Split Edges in Edit Mode"
 PDT_ERR_EXTEDIT = "Only Extrude Vertices in Edit Mode"
 PDT_ERR_DUPEDIT = "Only Duplicate Geometry in Edit Mode"
+PDT_ERR_ARRAYEDIT = "Only Array Geometry in Edit Mode"
+PDT_ERR_BAD_POLAR = "Bad Polar Array - give count of 2 or more, then total angle, e.g. 6,360"
 PDT_ERR_FILEDIT = "Only Fillet Geometry in Edit Mode"
 PDT_ERR_NOCOMMAS = "No commas allowed in Maths Command"
 
@@ -151,6 +166,8 @@ PDT_ERR_2CPNPE = "Select 2 Co-Planar Non-Parallel Edges"
 PDT_ERR_NCEDGES = "Edges must be Co-Planar Non-Parallel Edges, Selected Edges aren't"
 PDT_ERR_1EDGE1FACE = "Select 1 face and 1 Detached Edge"
 PDT_ERR_NOINT = "No Intersection Found"
+PDT_ERR_NO_REGIONS = "No Unfilled Enclosed Regions Found"
+PDT_ERR_NO_SCRIPT = "Choose a Text holding the Command Script, one Command to a Line"
 PDT_ERR_BADDISTANCE = "Invalid Distance (Separtion) Error; Chosen Points too Close"
 PDT_ERR_MATHSERROR = "Maths Error - Check Working Plane"
 PDT_ERR_SAMERADII = "Circles have the same radius - Just offset the Edge between centres"
@@ -158,6 +175,8 @@ PDT_ERR_SAMERADII = "Circles have the same radius - Just offset the Edge between
 # Info messages
 #
 PDT_INF_OBJ_MOVED = "Active Object Moved to Intersection, "
+PDT_INF_SCRIPT_ERRORS = "Command Script Errors:"
+PDT_INF_ISLAND_REGIONS = "Regions with Islands inside left unfilled:"
 
 # Confirm Messages
 #
@@ -182,8 +201,9 @@ PDT_DES_LIBMATS = "Materials in Library"
 PDT_DES_LIBMODE = "Library Mode"
 PDT_DES_LIBSER = "Enter A Search String (Contained)"
 PDT_DES_OBORDER = "Object Order to Lines"
-PDT_DES_VALIDLET = "Valid 1st letters; C D E G N P S V, Valid 2nd letters: A D I O P"
+PDT_DES_VALIDLET = "Valid 1st letters; A C D E G N P S V, Valid 2nd letters: A D I O P"
 PDT_DES_OUTPUT = "Output for Maths Operations"
+PDT_DES_SCRIPT = "Text holding a Command Script, one Command to a Line, run as one Undo Step"
 PDT_DES_PPLOC = "Location of PivotPoint"
 PDT_DES_PPSCALEFAC = "Scale Factors"
 PDT_DES_PPSIZE = "Pivot Size Factor"
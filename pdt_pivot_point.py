@@ -23,10 +23,18 @@
 #
 import bpy
 import bmesh
+import numpy as np
 from bpy.types import Operator, SpaceView3D
 from mathutils import Vector, Matrix
 from math import pi
-from .pdt_functions import view_coords, draw_callback_3d
+from .pdt_functions import (
+    view_coords,
+    view_transform,
+    draw_callback_3d,
+    vertex_coords,
+    set_vertex_coords,
+    SelectionSnapshot,
+)
 from .pdt_msg_strings import (
     PDT_CON_AREYOURSURE,
     PDT_ERR_EDIT_MODE,
@@ -204,14 +212,16 @@ class PDT_OT_ViewPlaneScale(Operator):
         """Scales Selected Vertices about Pivot Point.
 
         Note:
-            Scales any selected vertices about the Pivot Point
-            in View Oriented coordinates, works in any view orientation
+            Scales any selected vertices about the Pivot Point, along the Object's
+            axes, or along the View's axes, Horizontal, Vertical and Depth, when the
+            Working Plane is View, "LO". All vertices are scaled at once by one
+            matrix, made from the pivot in object space and the cached View Matrix.
 
         Args:
             context: Blender bpy.context instance.
 
         Note:
-            Uses pg.pivot_loc, pg.pivot_scale scene variables
+            Uses pg.pivot_loc, pg.pivot_scale & pg.plane scene variables
 
         Returns:
             Status Set.
@@ -227,20 +237,22 @@ class PDT_OT_ViewPlaneScale(Operator):
             error_message = f"{PDT_ERR_EDIT_MODE} {obj.mode})"
             self.report({"ERROR"}, error_message)
             return {"FINISHED"}
+        scale = np.diag(np.array(pg.pivot_scale, dtype=np.float64))
+        if pg.plane == "LO":
+            # Scale along the View's axes, then turn back to the Object's.
+            #
+            transform = view_transform()
+            if transform is None:
+                self.report({"ERROR"}, PDT_ERR_NO3DVIEW)
+                return {"FINISHED"}
+            rotation = np.array(obj.matrix_world.to_3x3(), dtype=np.float64)
+            to_view = np.array(transform.world_to_view, dtype=np.float64) @ rotation
+            scale = np.linalg.pinv(to_view) @ scale @ to_view
+        pivot = np.array(obj.matrix_world.inverted_safe() @ pg.pivot_loc, dtype=np.float64)
         bm = bmesh.from_edit_mesh(obj.data)
-        verts = verts = [v for v in bm.verts if v.select]
-        for v in verts:
-            delta_x = (pg.pivot_loc.x - obj.matrix_world.decompose()[0].x - v.co.x) * (
-                1 - pg.pivot_scale.x
-            )
-            delta_y = (pg.pivot_loc.y - obj.matrix_world.decompose()[0].y - v.co.y) * (
-                1 - pg.pivot_scale.y
-            )
-            delta_z = (pg.pivot_loc.z - obj.matrix_world.decompose()[0].z - v.co.z) * (
-                1 - pg.pivot_scale.z
-            )
-            delta_v = Vector((delta_x, delta_y, delta_z))
-            v.co = v.co + delta_v
+        verts = SelectionSnapshot(bm).verts
+        coords = vertex_coords(verts)
+        set_vertex_coords(verts, pivot + (coords - pivot) @ scale.T)
         bmesh.update_edit_mesh(obj.data)
         return {"FINISHED"}
 
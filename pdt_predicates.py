@@ -0,0 +1,371 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Robust geometric predicates for edge intersection.
+#
+# Each predicate is the sign of a polynomial in the input coordinates. It is first
+# worked out in floating point, carrying a bound on the rounding error, and only
+# the rows where the error bound is larger than the value are worked out again
+# exactly, using fractions. Tolerances are relative to the length of the edges,
+# so the answers do not depend on the scale of the drawing.
+#
+# Nothing in here may import bpy, bmesh or mathutils, inputs are NumPy arrays of
+# shape (M, 3), or anything that converts to one, such as a mathutils Vector.
+#
+from fractions import Fraction
+
+import numpy as np
+
+# Distances below this fraction of the length of the longer edge count as touching.
+TOLERANCE = 1.0e-5
+
+# Edges whose directions differ by less than this angle, in radians, are parallel.
+PARALLEL_TOLERANCE = 1.0e-6
+
+# Rounding error of one floating point operation, relative to its result. Twice the
+# unit roundoff, so that rounding in the error bounds themselves is also covered.
+UNIT_ERROR = 2.0 ** -52
+
+
+class Bounded:
+    """Floating Point Values that carry an upper Bound on their Rounding Error."""
+
+    __slots__ = ("value", "error")
+
+    def __init__(self, value, error=0.0):
+        self.value = value
+        self.error = error
+
+    def __add__(self, other):
+        value = self.value + other.value
+        return Bounded(value, self.error + other.error + UNIT_ERROR * np.abs(value))
+
+    def __sub__(self, other):
+        value = self.value - other.value
+        return Bounded(value, self.error + other.error + UNIT_ERROR * np.abs(value))
+
+    def __mul__(self, other):
+        value = self.value * other.value
+        error = (
+            np.abs(self.value) * other.error
+            + np.abs(other.value) * self.error
+            + self.error * other.error
+        )
+        return Bounded(value, error + UNIT_ERROR * np.abs(value))
+
+
+def maximum(first, second):
+    """Return the larger of two Values, Bounded or exact.
+
+    Args:
+        first, second: Bounded Values or Fractions
+
+    Returns:
+        Bounded Value or Fraction.
+    """
+
+    if isinstance(first, Bounded):
+        return Bounded(np.maximum(first.value, second.value), np.maximum(first.error, second.error))
+    return max(first, second)
+
+
+def constant(value, exact):
+    """Return a Constant in the same form as the Values it is used with.
+
+    Args:
+        value: Float Constant
+        exact: True for a Fraction, False for a Bounded Value
+
+    Returns:
+        Bounded Value or Fraction.
+    """
+
+    return Fraction(value) if exact else Bounded(value)
+
+
+def sub(vector_a, vector_b):
+    """Subtract two Vectors given as Tuples of Components."""
+
+    return tuple(comp_a - comp_b for comp_a, comp_b in zip(vector_a, vector_b))
+
+
+def dot(vector_a, vector_b):
+    """Dot Product of two Vectors given as Tuples of Components."""
+
+    return vector_a[0] * vector_b[0] + vector_a[1] * vector_b[1] + vector_a[2] * vector_b[2]
+
+
+def cross(vector_a, vector_b):
+    """Cross Product of two Vectors given as Tuples of Components."""
+
+    return (
+        vector_a[1] * vector_b[2] - vector_a[2] * vector_b[1],
+        vector_a[2] * vector_b[0] - vector_a[0] * vector_b[2],
+        vector_a[0] * vector_b[1] - vector_a[1] * vector_b[0],
+    )
+
+
+def sign(expression, *points):
+    """Return the exact Sign of a Polynomial Expression for each Row of Points.
+
+    Note:
+        The expression is first evaluated on Bounded Values, rows where the value is
+        further from zero than its error bound are certain. Only the other rows are
+        evaluated again with Fractions, which is exact for any float input.
+
+    Args:
+        expression: Function of Points, each a Tuple of 3 Components, and a Boolean
+            that is True when the Components are Fractions
+        points: Arrays of Coordinates, each of shape (M, 3)
+
+    Returns:
+        Integer Array of -1, 0 or 1, shape (M,).
+    """
+
+    points = [np.asarray(point, dtype=np.float64).reshape(-1, 3) for point in points]
+    bounded = expression(
+        *[tuple(Bounded(point[:, k]) for k in range(3)) for point in points], False
+    )
+    value = np.broadcast_to(bounded.value, (len(points[0]),))
+    error = np.broadcast_to(bounded.error, value.shape)
+    result = np.sign(value).astype(np.int64)
+    for row in np.flatnonzero(~(np.abs(value) > error)):
+        exact = expression(
+            *[tuple(Fraction(float(point[row, k])) for k in range(3)) for point in points], True
+        )
+        result[row] = (exact > 0) - (exact < 0)
+    return result
+
+
+def not_parallel_expression(start_a, end_a, start_b, end_b, exact):
+    """Positive when the Directions of two Edges differ by more than PARALLEL_TOLERANCE."""
+
+    dir_a = sub(end_a, start_a)
+    dir_b = sub(end_b, start_b)
+    normal = cross(dir_a, dir_b)
+    limit = constant(PARALLEL_TOLERANCE ** 2, exact)
+    return dot(normal, normal) - limit * dot(dir_a, dir_a) * dot(dir_b, dir_b)
+
+
+def line_gap_expression(start_a, end_a, start_b, end_b, exact):
+    """Not Positive when the Lines through two Edges pass within tolerance of each other."""
+
+    dir_a = sub(end_a, start_a)
+    dir_b = sub(end_b, start_b)
+    normal = cross(dir_a, dir_b)
+    along = dot(sub(start_a, start_b), normal)
+    scale = maximum(dot(dir_a, dir_a), dot(dir_b, dir_b))
+    return along * along - constant(TOLERANCE ** 2, exact) * scale * dot(normal, normal)
+
+
+def crossing_terms(start_a, end_a, start_b, end_b, exact):
+    """Return the Polynomials that decide whether two Edges cross.
+
+    Note:
+        The lines cross at parameter numerator / denominator along each edge, the
+        denominator being the squared length of the cross product of the directions.
+        For each end of each edge there is a side term, positive when the crossing
+        is beyond that end, and a reach term, not positive when it is still within
+        tolerance of the end.
+
+    Args:
+        start_a, end_a, start_b, end_b: Edge Coordinates, Tuples of 3 Components
+        exact: True when the Components are Fractions
+
+    Returns:
+        Dictionary of Terms by name.
+    """
+
+    dir_a = sub(end_a, start_a)
+    dir_b = sub(end_b, start_b)
+    offset = sub(start_a, start_b)
+    len_a = dot(dir_a, dir_a)
+    len_b = dot(dir_b, dir_b)
+    dot_ab = dot(dir_a, dir_b)
+    dot_ao = dot(dir_a, offset)
+    dot_bo = dot(dir_b, offset)
+    normal = cross(dir_a, dir_b)
+    denom = dot(normal, normal)
+    along = dot(offset, normal)
+    scale = maximum(len_a, len_b)
+    tolerance = constant(TOLERANCE ** 2, exact) * scale
+    limit = tolerance * denom * denom
+
+    terms = {
+        "parallel": constant(PARALLEL_TOLERANCE ** 2, exact) * len_a * len_b - denom,
+        "gap": along * along - tolerance * denom,
+    }
+    numerators = (
+        ("a", dot_ab * dot_bo - dot_ao * len_b, len_a),
+        ("b", len_a * dot_bo - dot_ab * dot_ao, len_b),
+    )
+    zero = constant(0.0, exact)
+    for edge, numerator, length in numerators:
+        past_end = numerator - denom
+        terms["before_" + edge] = zero - numerator
+        terms["after_" + edge] = past_end
+        terms["reach_start_" + edge] = numerator * numerator * length - limit
+        terms["reach_end_" + edge] = past_end * past_end * length - limit
+    return terms
+
+
+def crossing_rule(terms, negative, not_positive):
+    """Combine the Terms of crossing_terms into the Decision whether two Edges cross.
+
+    Args:
+        terms: Dictionary of Terms, see crossing_terms
+        negative, not_positive: Functions testing the sign of a Term
+
+    Returns:
+        Result of the tests, combined with & and |.
+    """
+
+    result = negative(terms["parallel"]) & not_positive(terms["gap"])
+    for edge in ("a", "b"):
+        result = result & (
+            not_positive(terms["before_" + edge]) | not_positive(terms["reach_start_" + edge])
+        )
+        result = result & (
+            not_positive(terms["after_" + edge]) | not_positive(terms["reach_end_" + edge])
+        )
+    return result
+
+
+class Decision:
+    """Decisions that are known True, known False, or neither, for each Row."""
+
+    __slots__ = ("true", "false")
+
+    def __init__(self, true, false):
+        self.true = true
+        self.false = false
+
+    def __and__(self, other):
+        return Decision(self.true & other.true, self.false | other.false)
+
+    def __or__(self, other):
+        return Decision(self.true | other.true, self.false & other.false)
+
+
+def segments_cross(start_a, end_a, start_b, end_b):
+    """Test whether Pairs of Edges cross, within tolerance.
+
+    Note:
+        Parallel edges never cross, otherwise the lines through the edges must pass
+        within tolerance of each other and their crossing must lie on both edges, or
+        within tolerance of their ends. Rows that the Bounded terms cannot decide
+        are worked out again with Fractions.
+
+    Args:
+        start_a, end_a, start_b, end_b: Arrays of Coordinates of the two Edges, (M, 3)
+
+    Returns:
+        Boolean Array, shape (M,).
+    """
+
+    points = [np.asarray(point, dtype=np.float64).reshape(-1, 3)
+              for point in (start_a, end_a, start_b, end_b)]
+    terms = crossing_terms(
+        *[tuple(Bounded(point[:, k]) for k in range(3)) for point in points], False
+    )
+
+    def bounded_sign(term):
+        # A certain term is never zero, so "negative" and "not positive" agree here.
+        certain = np.abs(term.value) > term.error
+        return Decision(certain & (term.value < 0.0), certain & (term.value > 0.0))
+
+    decision = crossing_rule(terms, bounded_sign, bounded_sign)
+    result = decision.true.copy()
+    for row in np.flatnonzero(~(decision.true | decision.false)):
+        exact = crossing_terms(
+            *[tuple(Fraction(float(point[row, k])) for k in range(3)) for point in points], True
+        )
+        result[row] = crossing_rule(exact, lambda term: term < 0, lambda term: term <= 0)
+    return result
+
+
+def lines_close(edge1, edge2):
+    """Test whether the Lines through two Edges pass within tolerance of each other.
+
+    Args:
+        edge1, edge2: Tuples of 2 Coordinates
+
+    Returns:
+        True or False, or None when the Edges are parallel.
+    """
+
+    points = (edge1[0], edge1[1], edge2[0], edge2[1])
+    if sign(not_parallel_expression, *points)[0] <= 0:
+        return None
+    return bool(sign(line_gap_expression, *points)[0] <= 0)
+
+
+def point_on_segment(point, start, end):
+    """Test whether a Point lies within tolerance of an Edge.
+
+    Note:
+        The tolerance is relative to the length of the edge, so a point on a zero
+        length edge must match its end exactly.
+
+    Args:
+        point: Coordinates of the Point
+        start, end: Coordinates of the Edge's Vertices
+
+    Returns:
+        Boolean.
+    """
+
+    def before_expression(point, start, end, exact):
+        return dot(sub(point, start), sub(end, start))
+
+    def after_expression(point, start, end, exact):
+        return dot(sub(point, end), sub(start, end))
+
+    def end_expression(near):
+        def distance_expression(point, start, end, exact):
+            offset = sub(point, near(start, end))
+            direction = sub(end, start)
+            limit = constant(TOLERANCE ** 2, exact) * dot(direction, direction)
+            return dot(offset, offset) - limit
+
+        return distance_expression
+
+    def line_expression(point, start, end, exact):
+        offset = sub(point, start)
+        direction = sub(end, start)
+        length = dot(direction, direction)
+        along = dot(offset, direction)
+        limit = constant(TOLERANCE ** 2, exact) * length * length
+        return dot(offset, offset) * length - along * along - limit
+
+    points = (point, start, end)
+    if tuple(start) == tuple(end):
+        expression = end_expression(lambda start, end: start)
+    elif sign(before_expression, *points)[0] < 0:
+        expression = end_expression(lambda start, end: start)
+    elif sign(after_expression, *points)[0] < 0:
+        expression = end_expression(lambda start, end: end)
+    else:
+        expression = line_expression
+    return bool(sign(expression, *points)[0] <= 0)
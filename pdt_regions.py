@@ -0,0 +1,311 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Fill the regions enclosed by selected planar edges with faces.
+#
+# The edges are projected onto the working plane and built into a half-edge
+# arrangement, walking its half-edges gives every face of the arrangement at once.
+# Use Intersect All first, so that crossing edges share a vertex.
+#
+import bpy
+import bmesh
+import numpy as np
+from .pdt_functions import popup_message, set_mode, sync_edit_mesh, view_transform
+from .pdt_msg_strings import (
+    PDT_ERR_EDIT_MODE,
+    PDT_ERR_NO3DVIEW,
+    PDT_ERR_NO_REGIONS,
+    PDT_ERR_SEL_3_EDGES,
+    PDT_INF_ISLAND_REGIONS,
+)
+
+# Regions with less area than this fraction of the squared size of the selection
+# are taken to be slivers made by rounding, and are not filled.
+AREA_TOLERANCE = 1.0e-10
+
+
+def prune_dangling(num_verts, edges):
+    """Remove Edges that cannot bound a Region.
+
+    Note:
+        Repeatedly removes edges with a vertex used by no other edge, until every
+        vertex left is used at least twice.
+
+    Args:
+        num_verts: Number of Vertices
+        edges: Integer Array of Vertex pairs, shape (N, 2)
+
+    Returns:
+        Integer Array of the Edges left, shape (M, 2).
+    """
+
+    keep = np.ones(len(edges), dtype=bool)
+    while True:
+        degree = np.bincount(edges[keep].ravel(), minlength=num_verts)
+        dangling = keep & ((degree[edges[:, 0]] < 2) | (degree[edges[:, 1]] < 2))
+        if not dangling.any():
+            return edges[keep]
+        keep &= ~dangling
+
+
+def region_cycles(coords, edges):
+    """Find the Bounded Regions of a Planar Arrangement of Edges.
+
+    Note:
+        Each edge gives two half-edges, 2i from edges[i, 0] and 2i + 1 back again.
+        The half-edges leaving each vertex are sorted by angle, the half-edge after
+        u->v is then the one leaving v just clockwise of v->u. Following these links
+        walks round each region with the region on the left, so bounded regions come
+        out anticlockwise, with positive area, and the outside of each connected
+        part comes out clockwise. Regions are not cut by islands lying inside them,
+        see island_regions.
+
+    Args:
+        coords: Array of 2D Vertex Coordinates, shape (V, 2)
+        edges: Integer Array of Vertex pairs, shape (N, 2), without duplicates
+
+    Returns:
+        List of Lists of Vertex indices, one for each bounded region, anticlockwise.
+    """
+
+    coords = np.asarray(coords, dtype=np.float64)
+    edges = prune_dangling(len(coords), np.asarray(edges, dtype=np.int64).reshape(-1, 2))
+    if not len(edges):
+        return []
+
+    origin = edges.ravel()
+    target = edges[:, ::-1].ravel()
+    direction = coords[target] - coords[origin]
+    angle = np.arctan2(direction[:, 1], direction[:, 0])
+
+    # Sort the half-edges by vertex, then anticlockwise by angle around it.
+    order = np.lexsort((angle, origin))
+    position = np.empty_like(order)
+    position[order] = np.arange(len(order))
+    sorted_origin = origin[order]
+    first = np.searchsorted(sorted_origin, sorted_origin, side="left")
+    count = np.searchsorted(sorted_origin, sorted_origin, side="right") - first
+
+    # The half-edge just clockwise of each twin, wrapping round at each vertex.
+    twin = position[np.arange(len(origin)) ^ 1]
+    following = order[first[twin] + (twin - first[twin] - 1) % count[twin]].tolist()
+
+    cycles = []
+    cycle_of = np.empty(len(origin), dtype=np.int64)
+    visited = [False] * len(origin)
+    for start in range(len(origin)):
+        if visited[start]:
+            continue
+        cycle = []
+        half_edge = start
+        while not visited[half_edge]:
+            visited[half_edge] = True
+            cycle.append(half_edge)
+            half_edge = following[half_edge]
+        cycle_of[cycle] = len(cycles)
+        cycles.append(cycle)
+
+    # Shoelace area of every cycle at once.
+    start_co = coords[origin]
+    end_co = coords[target]
+    twice_area = start_co[:, 0] * end_co[:, 1] - start_co[:, 1] * end_co[:, 0]
+    area = 0.5 * np.bincount(cycle_of, weights=twice_area, minlength=len(cycles))
+    min_area = AREA_TOLERANCE * float(np.ptp(start_co, axis=0).max()) ** 2
+    return [origin[cycle].tolist() for cycle, size in zip(cycles, area) if size > min_area]
+
+
+def island_regions(coords, cycles):
+    """Find the Regions that have an Island inside them.
+
+    Note:
+        The regions of one connected set of edges have no vertices inside them, so
+        a vertex of one region lying inside another belongs to an island, such as
+        a column standing in a room. Faces cannot have holes, so a face filling the
+        outer region would cover the island's own faces.
+
+    Args:
+        coords: Array of 2D Vertex Coordinates, shape (V, 2)
+        cycles: List of Lists of Vertex indices, as given by region_cycles
+
+    Returns:
+        Boolean Array, shape (R,), True for the regions holding an island.
+    """
+
+    coords = np.asarray(coords, dtype=np.float64)
+    found = np.zeros(len(cycles), dtype=bool)
+    if len(cycles) < 2:
+        return found
+    used = np.unique(np.concatenate(cycles))
+    for index, cycle in enumerate(cycles):
+        start = coords[cycle]
+        end = np.roll(start, -1, axis=0)
+        points = coords[np.setdiff1d(used, cycle)]
+        inside_box = np.all((points > start.min(axis=0)) & (points < start.max(axis=0)), axis=1)
+        points = points[inside_box]
+        if not len(points):
+            continue
+        # Count the edges crossed by a ray from each point along +X, odd is inside.
+        above_start = start[:, None, 1] > points[None, :, 1]
+        above_end = end[:, None, 1] > points[None, :, 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ray_x = start[:, None, 0] + (points[None, :, 1] - start[:, None, 1]) * (
+                end[:, None, 0] - start[:, None, 0]
+            ) / (end[:, None, 1] - start[:, None, 1])
+        crossings = ((above_start != above_end) & (points[None, :, 0] < ray_x)).sum(axis=0)
+        found[index] = bool((crossings % 2).any())
+    return found
+
+
+def plane_coordinates(context, obj, verts):
+    """Return 2D Coordinates of Vertices on the Working Plane.
+
+    Note:
+        For the View plane, "LO", the vertices' world locations are turned to face
+        the view, otherwise the local coordinates on the chosen plane's axes are used.
+        Returns None for the View plane when there is no 3D View.
+
+    Args:
+        context: Blender bpy.context instance.
+        obj: Active Object
+        verts: List of Bmesh Vertices
+
+    Returns:
+        Float Array, shape (V, 2), or None.
+    """
+
+    pg = context.scene.pdt_pg
+    coords = np.array([vert.co for vert in verts], dtype=np.float64).reshape(-1, 3)
+    if pg.plane == "LO":
+        transform = view_transform()
+        if transform is None:
+            return None
+        coords = transform.to_view(coords @ np.array(obj.matrix_world.to_3x3()).T)
+    a1, a2, _ = set_mode(pg.plane)
+    return coords[:, [a1, a2]]
+
+
+def fill_regions(context):
+    """Fill all Regions enclosed by the Selected Edges with Faces.
+
+    Note:
+        Faces are only made for regions that have no face yet, regions whose
+        boundary touches itself at a vertex are left unfilled. Regions with an
+        island inside them are left unfilled too, and the user is told how many.
+
+    Args:
+        context: Blender bpy.context instance.
+
+    Returns:
+        Nothing.
+    """
+
+    pg = context.scene.pdt_pg
+    obj = context.active_object
+    if obj is None or obj.type != "MESH" or obj.mode != "EDIT":
+        pg.error = f"{PDT_ERR_EDIT_MODE} {obj.mode if obj else None})"
+        popup_message(context)
+        return
+
+    bm = bmesh.from_edit_mesh(obj.data)
+    edges = [edge for edge in bm.edges if edge.select and not edge.hide]
+    if len(edges) < 3:
+        pg.error = f"{PDT_ERR_SEL_3_EDGES} {len(edges)})"
+        popup_message(context)
+        return
+
+    verts = list(dict.fromkeys(vert for edge in edges for vert in edge.verts))
+    vert_position = {vert: position for position, vert in enumerate(verts)}
+    pairs = np.array(
+        [(vert_position[edge.verts[0]], vert_position[edge.verts[1]]) for edge in edges],
+        dtype=np.int64,
+    )
+    coords = plane_coordinates(context, obj, verts)
+    if coords is None:
+        pg.error = PDT_ERR_NO3DVIEW
+        popup_message(context)
+        return
+    cycles = region_cycles(coords, pairs)
+    islands = island_regions(coords, cycles)
+
+    new_faces = []
+    for cycle, island in zip(cycles, islands):
+        if island:
+            continue
+        face_verts = [verts[position] for position in cycle]
+        if len(set(face_verts)) != len(face_verts) or bm.faces.get(face_verts) is not None:
+            continue
+        new_faces.append(bm.faces.new(face_verts))
+
+    if not new_faces and not islands.any():
+        pg.error = PDT_ERR_NO_REGIONS
+        popup_message(context)
+        return
+
+    for face in new_faces:
+        face.select = True
+    bm.normal_update()
+    sync_edit_mesh(obj.data)
+    if islands.any():
+        pg.error = f"{PDT_INF_ISLAND_REGIONS} {int(islands.sum())}"
+        popup_message(context, title="Info", icon="INFO")
+
+
+class PDT_OT_FillRegions(bpy.types.Operator):
+    """Fill All Regions Enclosed by Selected Edges with Faces."""
+
+    bl_idname = "pdt.fillregions"
+    bl_label = "Fill Regions"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        """Check to see object is in correct condition.
+
+        Args:
+            context: Blender bpy.context instance.
+
+        Returns:
+            Boolean
+        """
+        obj = context.active_object
+        if obj is None:
+            return False
+        return obj.type == "MESH" and obj.mode == "EDIT"
+
+    def execute(self, context):
+        """Fill All Regions Enclosed by Selected Edges with Faces.
+
+        Note:
+            Works on the Working Plane, or the View plane, see fill_regions.
+
+        Args:
+            context: Blender bpy.context instance.
+
+        Returns:
+            Status Set.
+        """
+
+        pg = context.scene.pdt_pg
+        pg.command = "faceall"
+        return {"FINISHED"}
@@ -23,6 +23,7 @@
 #
 import bpy
 import bmesh
+import numpy as np
 from math import sqrt, floor, asin, sin, cos, pi
 from mathutils import Vector
 from bpy.types import Operator
@@ -33,6 +34,7 @@ from .pdt_functions import (
     set_mode,
     view_coords,
     view_coords_i,
+    view_transform,
 )
 
 from .pdt_msg_strings import (
@@ -187,23 +189,17 @@ def make_vectors(coords, a1, a2, a3, pg):
     tangent_vector_o4[a2] = coords[7]
     tangent_vector_o4[a3] = coords[8]
 
+    tangent_vectors = (tangent_vector_o1, tangent_vector_o2, tangent_vector_o3, tangent_vector_o4)
     if pg.plane == "LO":
-        # Reset coordinates from view local (Horiz, Vert, depth) to World XYZ.
+        # Reset coordinates from view local (Horiz, Vert, depth) to World XYZ, all four at once.
         #
-        tangent_vector_o1 = view_coords(
-            tangent_vector_o1[a1], tangent_vector_o1[a2], tangent_vector_o1[a3]
-        )
-        tangent_vector_o2 = view_coords(
-            tangent_vector_o2[a1], tangent_vector_o2[a2], tangent_vector_o2[a3]
-        )
-        tangent_vector_o3 = view_coords(
-            tangent_vector_o3[a1], tangent_vector_o3[a2], tangent_vector_o3[a3]
-        )
-        tangent_vector_o4 = view_coords(
-            tangent_vector_o4[a1], tangent_vector_o4[a2], tangent_vector_o4[a3]
-        )
+        transform = view_transform()
+        if transform is None:
+            return tuple(Vector((0, 0, 0)) for _ in tangent_vectors)
+        view_locations = np.array([(v[a1], v[a2], v[a3]) for v in tangent_vectors])
+        return tuple(Vector(co) for co in transform.to_world(view_locations).tolist())
 
-    return (tangent_vector_o1, tangent_vector_o2, tangent_vector_o3, tangent_vector_o4)
+    return tangent_vectors
 
 
 def tangent_setup(context, pg, plane, obj_data, centre_0, centre_1, centre_2, radius_0, radius_1):
@@ -25,18 +25,49 @@
 #
 import bpy
 import bmesh
-from mathutils.geometry import intersect_line_line as LineIntersect
 import itertools
+import os
+import time
+import numpy as np
+from math import floor
+from mathutils import Vector
 from collections import defaultdict
-from . import pdt_cad_module as cm
-from .pdt_functions import oops
+from .pdt_xall_kernel import edge_keys, intersect_segments, valid_pairs
+from .pdt_xall_tiles import can_fork, tiled_intersections
+from .pdt_functions import popup_message, sync_edit_mesh
 from .pdt_msg_strings import (
-    PDT_ERR_EDOB_MODE
+    PDT_ERR_EDOB_MODE,
+    PDT_ERR_SEL_2_MESHES,
 )
 
+# Intersection points closer than this share one vertex (was the remove_doubles distance).
+WELD_DISTANCE = 0.0001
 
-def order_points(edge, point_list):
-    """Order these edges from distance to v1, then sandwich the sorted list with v1, v2."""
+# Grid cell offsets searched around a point for an existing vertex to weld to.
+WELD_NEIGHBOURS = tuple(itertools.product((-1, 0, 1), repeat=3))
+
+# Keys of the edges left by the last Intersect All on each object, by Object pointer.
+# These edges are known not to cross each other, so only edges that have been added
+# or moved since need to be tested again, see intersect_all.
+intersection_cache = {}
+
+# Modal Intersect All: pairs tested per kernel call, seconds of work per timer event,
+# seconds between timer events, and events passed on so the view can still be moved.
+MODAL_CHUNK_SIZE = 4096
+MODAL_TIME_BUDGET = 0.05
+MODAL_TIMER_STEP = 0.01
+MODAL_PASS_EVENTS = {
+    "MIDDLEMOUSE", "WHEELUPMOUSE", "WHEELDOWNMOUSE", "TRACKPADPAN", "TRACKPADZOOM"
+}
+
+
+def order_points(edge, point_list, params=None):
+    """Order these edges from distance to v1, then sandwich the sorted list with v1, v2.
+
+    Note:
+        When params holds each point's parameter along the edge the points are
+        sorted by it, rather than by measuring distances.
+    """
     v1, v2 = edge
 
     def dist(coord):
@@ -44,36 +75,41 @@ def order_points(edge, point_list):
 
         return (v1 - coord).length
 
-    point_list = sorted(point_list, key=dist)
+    if params is not None:
+        order = sorted(range(len(point_list)), key=params.__getitem__)
+        point_list = [point_list[i] for i in order]
+    else:
+        point_list = sorted(point_list, key=dist)
     return [v1] + point_list + [v2]
 
 
-def remove_permutations_that_share_a_vertex(bm, permutations):
-    """Get useful Permutations.
+def edge_arrays(edges):
+    """Return the Coordinates and Vertex Indices of Edges as Arrays.
 
     Args:
-        bm: Object's Bmesh
-        permutations: Possible Intersection Edges as a list
+        edges: List of Bmesh Edges
 
     Returns:
-        List of Edges.
+        Float Array of shape (N, 2, 3) and Integer Array of shape (N, 2).
     """
 
-    final_permutations = []
-    for edges in permutations:
-        raw_vert_indices = cm.vertex_indices_from_edges_tuple(bm, edges)
-        if len(set(raw_vert_indices)) < 4:
-            continue
-
-        # reaches this point if they do not share.
-        final_permutations.append(edges)
-
-    return final_permutations
+    coords = np.empty((len(edges), 2, 3), dtype=np.float64)
+    vert_indices = np.empty((len(edges), 2), dtype=np.int64)
+    for row, edge in enumerate(edges):
+        vert_a, vert_b = edge.verts
+        coords[row, 0] = vert_a.co
+        coords[row, 1] = vert_b.co
+        vert_indices[row] = vert_a.index, vert_b.index
+    return coords, vert_indices
 
 
 def get_valid_permutations(bm, edge_indices):
     """Get useful Permutations.
 
+    Note:
+        Only pairs of edges whose bounding boxes overlap, and that do not share a
+        vertex, are returned, see pdt_xall_kernel.valid_pairs.
+
     Args:
         bm: Object's Bmesh
         edge_indices: List of indices of Edges to consider
@@ -82,105 +118,207 @@ def get_valid_permutations(bm, edge_indices):
         List of suitable Edges.
     """
 
-    raw_permutations = itertools.permutations(edge_indices, 2)
-    permutations = [r for r in raw_permutations if r[0] < r[1]]
-    return remove_permutations_that_share_a_vertex(bm, permutations)
+    edge_indices = sorted(edge_indices)
+    pairs = valid_pairs(*edge_arrays([bm.edges[idx] for idx in edge_indices]))
+    return [(edge_indices[first], edge_indices[second]) for first, second in pairs]
 
 
-def can_skip(closest_points, vert_vectors):
-    """Check if the intersection lies on both edges and return True
-    when criteria are not met, and thus this point can be skipped.
+def intersection_arrays(bm, edge_indices, known_keys=None):
+    """Return the Arrays describing the Edges to test for Intersection.
 
     Args:
-        closest_points: List of Coordinates of points to consider
-        vert_vectors: List of Coordinates of vertices to consider
+        bm, Object's Bmesh
+        edge_indices: List of Edge Indices
+        known_keys: Optional set of Edge keys, see pdt_xall_kernel.edge_keys, of edges
+            already known not to cross each other, pairs of these are not tested
 
     Returns:
-        Boolean.
+        Sorted List of Edge Indices, Float Array of their Coordinates, shape (N, 2, 3),
+        Integer Array of their Vertex Indices, shape (N, 2), and Boolean Array of the
+        Edges that need testing, or None for all of them.
     """
 
-    if not closest_points:
-        return True
-    if not isinstance(closest_points[0].x, float):
-        return True
-    if cm.num_edges_point_lies_on(closest_points[0], vert_vectors) < 2:
-        return True
+    bm.verts.ensure_lookup_table()
+    bm.edges.ensure_lookup_table()
 
-    # if this distance is larger than than 1.0e-5, we can skip it.
-    cpa, cpb = closest_points
-    return (cpa - cpb).length > 1.0e-5
+    edge_indices = sorted(edge_indices)
+    coords, vert_indices = edge_arrays([bm.edges[idx] for idx in edge_indices])
+    active = None
+    if known_keys:
+        active = np.array([key not in known_keys for key in edge_keys(coords)], dtype=bool)
+    return edge_indices, coords, vert_indices, active
 
 
-def get_intersection_dictionary(bm, edge_indices):
-    """Return a dictionary of edge indices and points found on those edges.
+def intersection_pairs(bm, edge_indices, known_keys=None):
+    """Return the Edge Coordinates and Pairs of Edges to test for Intersection.
 
     Args:
         bm, Object's Bmesh
         edge_indices: List of Edge Indices
+        known_keys: Optional set of Edge keys, see intersection_arrays
 
     Returns:
-        Dictionary of Vectors.
+        Sorted List of Edge Indices, Float Array of their Coordinates, shape (N, 2, 3),
+        and Integer Array of Pairs of positions in that List, shape (M, 2).
     """
 
-    bm.verts.ensure_lookup_table()
-    bm.edges.ensure_lookup_table()
+    edge_indices, coords, vert_indices, active = intersection_arrays(
+        bm, edge_indices, known_keys
+    )
+    return edge_indices, coords, valid_pairs(coords, vert_indices, active=active)
+
+
+def intersection_points(bm, edge_indices, pairs, points, on_both, t_a, t_b):
+    """Return a dictionary of edge indices and ordered points found on those edges.
 
-    permutations = get_valid_permutations(bm, edge_indices)
+    Args:
+        bm, Object's Bmesh
+        edge_indices: Sorted List of Edge Indices, see intersection_pairs
+        pairs: Integer Array of Pairs of positions in edge_indices, shape (M, 2)
+        points, on_both, t_a, t_b: Results of pdt_xall_kernel.intersect_segments
+
+    Returns:
+        Dictionary of Vectors.
+    """
 
     list_k = defaultdict(list)
-    list_d = defaultdict(list)
+    list_t = defaultdict(list)
 
-    for edges in permutations:
-        raw_vert_indices = cm.vertex_indices_from_edges_tuple(bm, edges)
-        vert_vectors = cm.vectors_from_indices(bm, raw_vert_indices)
+    # reaches this point only when an intersection happens on both edges.
+    for row in np.flatnonzero(on_both):
+        point = Vector(points[row])
+        for position, param in ((pairs[row, 0], t_a[row]), (pairs[row, 1], t_b[row])):
+            edge = edge_indices[position]
+            list_k[edge].append(point)
+            list_t[edge].append(param)
 
-        points = LineIntersect(*vert_vectors)
+    return order_edge_points(bm, list_k, list_t)
 
-        # some can be skipped.    (NaN, None, not on both edges)
-        if can_skip(points, vert_vectors):
-            continue
 
-        # reaches this point only when an intersection happens on both edges.
-        [list_k[edge].append(points[0]) for edge in edges]
+def order_edge_points(bm, list_k, list_t):
+    """Return a dictionary of edge indices and ordered points found on those edges.
+
+    Args:
+        bm, Object's Bmesh
+        list_k: Dictionary of Edge Indices and Lists of points found on them
+        list_t: Dictionary of Edge Indices and the Parameters of those points
+
+    Returns:
+        Dictionary of Vectors.
+    """
+
+    list_d = defaultdict(list)
 
     # list_k will contain a dict of edge indices and points found on those edges.
     for edge_idx, unordered_points in list_k.items():
         tv1, tv2 = bm.edges[edge_idx].verts
         v1 = bm.verts[tv1.index].co
         v2 = bm.verts[tv2.index].co
-        ordered_points = order_points((v1, v2), unordered_points)
+        ordered_points = order_points((v1, v2), unordered_points, list_t[edge_idx])
         list_d[edge_idx].extend(ordered_points)
 
     return list_d
 
 
-def update_mesh(bm, int_dict):
-    """Make new geometry (delete old first).
+def get_intersection_dictionary(bm, edge_indices, known_keys=None, processes=1):
+    """Return a dictionary of edge indices and points found on those edges.
+
+    Note:
+        All candidate pairs are tested together by pdt_xall_kernel.intersect_segments,
+        the points found on each edge are then ordered by their parameter along it.
+        With more than one process the work is split into tiles, see pdt_xall_tiles.
 
     Args:
         bm, Object's Bmesh
-        int_dict: Dictionary of Indices of Vertices
+        edge_indices: List of Edge Indices
+        known_keys: Optional set of Edge keys, see pdt_xall_kernel.edge_keys, of edges
+            already known not to cross each other, pairs of these are not tested
+        processes: Number of worker processes to use
 
     Returns:
-        Nothing.
+        Dictionary of Vectors.
     """
 
-    orig_e = bm.edges
-    orig_v = bm.verts
+    if processes > 1 and can_fork():
+        edge_indices, coords, vert_indices, active = intersection_arrays(
+            bm, edge_indices, known_keys
+        )
+        pairs, points, t_a, t_b = tiled_intersections(coords, vert_indices, processes, active)
+        on_both = np.ones(len(pairs), dtype=bool)
+        return intersection_points(bm, edge_indices, pairs, points, on_both, t_a, t_b)
+
+    edge_indices, coords, pairs = intersection_pairs(bm, edge_indices, known_keys)
+    results = intersect_segments(coords[pairs[:, 0]], coords[pairs[:, 1]])
+    return intersection_points(bm, edge_indices, pairs, *results)
+
+
+def update_mesh(bm, int_dict):
+    """Make new geometry, replacing the intersected Edges.
+
+    Note:
+        Each intersection point becomes a single vertex shared by all the edges that
+        cross there, points within WELD_DISTANCE of a vertex already made, or of an
+        end of an intersected edge, reuse that vertex. The new edges are then made
+        in one go and the intersected edges deleted, so no mesh wide weld is needed.
+
+    Args:
+        bm, Object's Bmesh
+        int_dict: Dictionary of Indices of Vertices
 
-    new_verts = []
-    collect = new_verts.extend
-    for _, point_list in int_dict.items():
-        num_edges_to_add = len(point_list) - 1
-        for i in range(num_edges_to_add):
-            coord_a = orig_v.new(point_list[i])
-            coord_b = orig_v.new(point_list[i + 1])
-            orig_e.new((coord_a, coord_b))
-            bm.normal_update()
-            collect([coord_a, coord_b])
+    Returns:
+        List of new Edges.
+    """
 
-    bmesh.ops.delete(bm, geom=[edge for edge in bm.edges if edge.select], context="EDGES")
-    bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=0.0001)
+    bm.edges.ensure_lookup_table()
+    weld_cells = defaultdict(list)
+
+    def cell_of(co):
+        """Return the weld grid cell holding a coordinate."""
+
+        return tuple(floor(value / WELD_DISTANCE) for value in co)
+
+    def vertex_at(co):
+        """Return the vertex at a coordinate, making it if there is none."""
+
+        cell = cell_of(co)
+        for offset in WELD_NEIGHBOURS:
+            near = (cell[0] + offset[0], cell[1] + offset[1], cell[2] + offset[2])
+            for vert in weld_cells.get(near, ()):
+                if (vert.co - co).length <= WELD_DISTANCE:
+                    return vert
+        vert = bm.verts.new(co)
+        weld_cells[cell].append(vert)
+        return vert
+
+    old_edges = [bm.edges[edge_idx] for edge_idx in int_dict]
+    for vert in {vert for edge in old_edges for vert in edge.verts}:
+        weld_cells[cell_of(vert.co)].append(vert)
+
+    replaced = set()
+    new_pairs = {}
+    for edge, point_list in zip(old_edges, int_dict.values()):
+        chain = [edge.verts[0]] + [vertex_at(co) for co in point_list[1:-1]] + [edge.verts[1]]
+        segments = [(vert_a, vert_b) for vert_a, vert_b in zip(chain, chain[1:])
+                    if vert_a != vert_b]
+        if len(segments) == 1 and set(segments[0]) == set(edge.verts):
+            # Every point welded to an end of this edge, so there is nothing to split.
+            continue
+        replaced.add(edge)
+        for vert_a, vert_b in segments:
+            new_pairs.setdefault(frozenset((vert_a, vert_b)), (vert_a, vert_b))
+
+    # Make the new edges before deleting, so vertices they use are not left isolated.
+    new_edges = []
+    for pair in new_pairs.values():
+        existing = bm.edges.get(pair)
+        if existing is None:
+            new_edges.append(bm.edges.new(pair))
+        else:
+            replaced.discard(existing)
+            new_edges.append(existing)
+    bmesh.ops.delete(bm, geom=list(replaced), context="EDGES")
+    bm.normal_update()
+    return new_edges
 
 
 def unselect_nonintersecting(bm, d_edges, edge_indices):
@@ -201,11 +339,140 @@ def unselect_nonintersecting(bm, d_edges, edge_indices):
             bm.edges[edge].select = False
 
 
+def apply_intersections(obj, bm, edge_indices, int_dict):
+    """Split the intersected Edges and write the Edit Mesh.
+
+    Args:
+        obj: Active Object, in Edit Mode
+        bm, Object's Bmesh
+        edge_indices: List of Edge Indices that were tested
+        int_dict: Dictionary of Edge Indices and points found on them
+
+    Returns:
+        Nothing.
+    """
+
+    selected_edges = [bm.edges[edge_idx] for edge_idx in edge_indices]
+    unselect_nonintersecting(bm, int_dict.keys(), edge_indices)
+    new_edges = update_mesh(bm, int_dict)
+
+    # Remember the edges that are left, none of them cross each other now.
+    result_edges = [edge for edge in selected_edges if edge.is_valid] + new_edges
+    intersection_cache[obj.as_pointer()] = set(edge_keys(edge_arrays(result_edges)[0]))
+
+    sync_edit_mesh(obj.data)
+
+
+def object_edge_arrays(objects):
+    """Return the World Coordinates and Vertex Indices of the Edges of Objects.
+
+    Args:
+        objects: List of Mesh Objects
+
+    Returns:
+        Float Array of shape (N, 2, 3), Integer Array of shape (N, 2) with vertex
+        indices made unique across the objects, and Integer Arrays of shape (N,) of
+        each edge's position in objects and its index in that object's mesh.
+    """
+
+    coords = []
+    vert_indices = []
+    owners = []
+    vert_offset = 0
+    for position, obj in enumerate(objects):
+        mesh = obj.data
+        verts = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+        mesh.vertices.foreach_get("co", verts)
+        ends = np.empty(len(mesh.edges) * 2, dtype=np.int64)
+        mesh.edges.foreach_get("vertices", ends)
+        ends = ends.reshape(-1, 2)
+
+        matrix = np.array(obj.matrix_world)
+        world = verts.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+        coords.append(world[ends])
+        vert_indices.append(ends + vert_offset)
+        owners.append(np.full(len(ends), position, dtype=np.int64))
+        vert_offset += len(mesh.vertices)
+
+    owners = np.concatenate(owners)
+    local_indices = np.concatenate([np.arange(np.count_nonzero(owners == position))
+                                    for position in range(len(objects))])
+    return np.concatenate(coords), np.concatenate(vert_indices), owners, local_indices
+
+
+def intersect_objects(context, processes=1):
+    """Cut the Edges of all Selected Mesh Objects where they cross each other.
+
+    Note:
+        All edges are tested together in world space, only crossings between edges
+        of different objects are used. Each mesh is then split in place, once even
+        when several objects share it, so the objects need not be joined and
+        separated again.
+
+    Args:
+        context: Blender bpy.context instance.
+        processes: Number of worker processes to use, see pdt_xall_tiles
+
+    Returns:
+        Nothing.
+    """
+
+    pg = context.scene.pdt_pg
+    objects = [obj for obj in context.selected_objects if obj.type == "MESH"]
+    if len(objects) < 2:
+        pg.error = f"{PDT_ERR_SEL_2_MESHES} {len(objects)})"
+        popup_message(context)
+        return
+
+    coords, vert_indices, owners, local_indices = object_edge_arrays(objects)
+    if processes > 1 and can_fork():
+        pairs, points, t_a, t_b = tiled_intersections(
+            coords, vert_indices, processes, owners=owners
+        )
+        on_both = np.ones(len(pairs), dtype=bool)
+    else:
+        pairs = valid_pairs(coords, vert_indices)
+        pairs = pairs[owners[pairs[:, 0]] != owners[pairs[:, 1]]]
+        points, on_both, t_a, t_b = intersect_segments(coords[pairs[:, 0]], coords[pairs[:, 1]])
+
+    hits = defaultdict(lambda: (defaultdict(list), defaultdict(list)))
+    for row in np.flatnonzero(on_both):
+        for position, param in ((pairs[row, 0], t_a[row]), (pairs[row, 1], t_b[row])):
+            list_k, list_t = hits[owners[position]]
+            list_k[local_indices[position]].append(points[row])
+            list_t[local_indices[position]].append(param)
+
+    # Objects sharing a Mesh have their cuts gathered onto it, in its local space,
+    # so each Mesh is split once and one object's cuts do not overwrite another's.
+    mesh_hits = {}
+    for position, (list_k, list_t) in hits.items():
+        obj = objects[position]
+        to_local = obj.matrix_world.inverted_safe()
+        _, mesh_k, mesh_t = mesh_hits.setdefault(
+            obj.data.as_pointer(), (obj.data, defaultdict(list), defaultdict(list))
+        )
+        for edge_idx, world_points in list_k.items():
+            mesh_k[edge_idx].extend(to_local @ Vector(point) for point in world_points)
+            mesh_t[edge_idx].extend(list_t[edge_idx])
+
+    for mesh, list_k, list_t in mesh_hits.values():
+        bm = bmesh.new()
+        bm.from_mesh(mesh)
+        bm.verts.ensure_lookup_table()
+        bm.edges.ensure_lookup_table()
+        update_mesh(bm, order_edge_points(bm, list_k, list_t))
+        bm.to_mesh(mesh)
+        bm.free()
+        mesh.update()
+
+
 def intersect_all(context):
     """Computes All intersections with Crossing Geometry.
 
     Note:
-        Deletes original edges and replaces with new intersected edges
+        Deletes original edges and replaces with new intersected edges. In Object
+        mode the edges of all selected mesh objects are cut where they cross each
+        other, see intersect_objects.
 
     Args:
         context: Blender bpy.context instance.
@@ -216,34 +483,47 @@ def intersect_all(context):
 
     pg = context.scene.pdt_pg
     obj = context.active_object
-    if all([bool(obj), obj.type == "MESH", obj.mode == "EDIT"]):
+    prefs = context.preferences.addons[__package__].preferences
+    if all([bool(obj), obj.type == "MESH", obj.mode in {"EDIT", "OBJECT"}]):
+        if obj.mode == "OBJECT":
+            num_edges = sum(len(o.data.edges) for o in context.selected_objects if o.type == "MESH")
+            processes = 1
+            if num_edges >= prefs.pdt_xall_tile_edges:
+                processes = prefs.pdt_xall_processes or os.cpu_count() or 1
+            intersect_objects(context, processes)
+            return
+
         # must force edge selection mode here
         bpy.context.tool_settings.mesh_select_mode = (False, True, False)
 
-
         if obj.mode == "EDIT":
             bm = bmesh.from_edit_mesh(obj.data)
+            bm.verts.index_update()
+            bm.edges.index_update()
 
             selected_edges = [edge for edge in bm.edges if edge.select]
             edge_indices = [i.index for i in selected_edges]
 
-            int_dict = get_intersection_dictionary(bm, edge_indices)
-
-            unselect_nonintersecting(bm, int_dict.keys(), edge_indices)
-            update_mesh(bm, int_dict)
+            processes = 1
+            if len(edge_indices) >= prefs.pdt_xall_tile_edges:
+                processes = prefs.pdt_xall_processes or os.cpu_count() or 1
 
-            bmesh.update_edit_mesh(obj.data)
+            int_dict = get_intersection_dictionary(
+                bm, edge_indices, intersection_cache.get(obj.as_pointer()), processes
+            )
+            apply_intersections(obj, bm, edge_indices, int_dict)
         else:
             pg.error = f"{PDT_ERR_EDOB_MODE},{obj.mode})"
-            context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+            popup_message(context)
             return
 
         return
     else:
         pg.error = f"{PDT_ERR_EDOB_MODE},{obj.mode})"
-        context.window_manager.popup_menu(oops, title="Error", icon="ERROR")
+        popup_message(context)
         return
 
+
 class PDT_OT_IntersectAllEdges(bpy.types.Operator):
     """Cut Selected Edges at All Intersections."""
 
@@ -264,7 +544,7 @@ class PDT_OT_IntersectAllEdges(bpy.types.Operator):
         obj = context.active_object
         if obj is None:
             return False
-        return obj is not None and obj.type == "MESH" and obj.mode == "EDIT"
+        return obj is not None and obj.type == "MESH" and obj.mode in {"EDIT", "OBJECT"}
 
     def execute(self, context):
         """Computes All intersections with Crossing Geometry.
@@ -282,3 +562,122 @@ class PDT_OT_IntersectAllEdges(bpy.types.Operator):
         pg = context.scene.pdt_pg
         pg.command = f"intall"
         return {"FINISHED"}
+
+
+class PDT_OT_IntersectAllModal(bpy.types.Operator):
+    """Cut Selected Edges at All Intersections, in Steps, Esc to Cancel."""
+
+    bl_idname = "pdt.intersectall_modal"
+    bl_label = "Intersect All Edges (Modal)"
+    bl_options = {"REGISTER", "UNDO"}
+
+    _timer = None
+
+    @classmethod
+    def poll(cls, context):
+        """Check to see object is in correct condition.
+
+        Args:
+            context: Blender bpy.context instance.
+
+        Returns:
+            Boolean
+        """
+        obj = context.active_object
+        if obj is None:
+            return False
+        return obj.type == "MESH" and obj.mode == "EDIT"
+
+    def invoke(self, context, event):
+        """Find the Pairs of Edges to test and start the Timer.
+
+        Note:
+            The mesh is only read here, nothing is changed until every pair has been
+            tested, so cancelling leaves the mesh as it was.
+
+        Args:
+            context: Blender bpy.context instance.
+            event: Blender event that started the operator.
+
+        Returns:
+            Status Set.
+        """
+
+        obj = context.active_object
+        context.tool_settings.mesh_select_mode = (False, True, False)
+        bm = bmesh.from_edit_mesh(obj.data)
+        bm.verts.index_update()
+        bm.edges.index_update()
+
+        self.obj = obj
+        self.selected = [edge.index for edge in bm.edges if edge.select]
+        self.edge_indices, self.coords, self.pairs = intersection_pairs(
+            bm, self.selected, intersection_cache.get(obj.as_pointer())
+        )
+        self.results = []
+        self.done = 0
+
+        wm = context.window_manager
+        wm.progress_begin(0, max(len(self.pairs), 1))
+        self._timer = wm.event_timer_add(MODAL_TIMER_STEP, window=context.window)
+        wm.modal_handler_add(self)
+        return {"RUNNING_MODAL"}
+
+    def modal(self, context, event):
+        """Test Pairs of Edges for up to MODAL_TIME_BUDGET per Timer Event.
+
+        Args:
+            context: Blender bpy.context instance.
+            event: Blender event being handled.
+
+        Returns:
+            Status Set.
+        """
+
+        if event.type == "ESC" or self.obj.mode != "EDIT":
+            self.finish(context)
+            return {"CANCELLED"}
+        if event.type in MODAL_PASS_EVENTS:
+            return {"PASS_THROUGH"}
+        if event.type != "TIMER":
+            # Other input is blocked, the mesh must not change until the end.
+            return {"RUNNING_MODAL"}
+
+        started = time.perf_counter()
+        while self.done < len(self.pairs):
+            chunk = self.pairs[self.done:self.done + MODAL_CHUNK_SIZE]
+            segments_a = self.coords[chunk[:, 0]]
+            segments_b = self.coords[chunk[:, 1]]
+            self.results.append(intersect_segments(segments_a, segments_b))
+            self.done += len(chunk)
+            if time.perf_counter() - started > MODAL_TIME_BUDGET:
+                context.window_manager.progress_update(self.done)
+                return {"RUNNING_MODAL"}
+
+        self.finish(context)
+        bm = bmesh.from_edit_mesh(self.obj.data)
+        bm.verts.ensure_lookup_table()
+        bm.edges.ensure_lookup_table()
+        if self.results:
+            results = [np.concatenate(arrays) for arrays in zip(*self.results)]
+        else:
+            results = intersect_segments(self.coords[:0], self.coords[:0])
+        int_dict = intersection_points(bm, self.edge_indices, self.pairs, *results)
+        apply_intersections(self.obj, bm, self.selected, int_dict)
+        return {"FINISHED"}
+
+    def finish(self, context):
+        """Remove the Timer and end the Progress Report.
+
+        Args:
+            context: Blender bpy.context instance.
+
+        Returns:
+            Nothing.
+        """
+
+        wm = context.window_manager
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
@@ -0,0 +1,303 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Array based geometry for Intersect All.
+#
+# Nothing in here may import bpy, bmesh or mathutils, these functions work on plain
+# NumPy arrays of edge coordinates, shape (N, 2, 3), so that they can also be used
+# outside of Blender.
+#
+import numpy as np
+
+from .pdt_predicates import TOLERANCE, segments_cross
+
+# Edge bounding boxes are grown by this fraction of the edge's length, so that edges
+# that only just touch are still passed on to the narrow phase.
+BOX_TOLERANCE = TOLERANCE
+
+# Upper limit on the average number of grid cells an edge may be entered into, the
+# cell size is increased until the grid fits within this budget.
+CELLS_PER_EDGE = 8
+
+# Decimal places of the coordinates used in edge keys, see edge_keys.
+KEY_DECIMALS = 6
+
+
+def edge_bounds(coords, tolerance=BOX_TOLERANCE):
+    """Return the Axis Aligned Bounding Boxes of Edges.
+
+    Args:
+        coords: Array of Edge Coordinates, shape (N, 2, 3)
+        tolerance: Fraction of each edge's length to grow its box by on every side
+
+    Returns:
+        Minimum and Maximum corners as two (N, 3) Arrays.
+    """
+
+    grow = tolerance * edge_lengths(coords)[:, None]
+    return coords.min(axis=1) - grow, coords.max(axis=1) + grow
+
+
+def edge_lengths(coords):
+    """Return the Length of each Edge.
+
+    Args:
+        coords: Array of Edge Coordinates, shape (N, 2, 3)
+
+    Returns:
+        Float Array, shape (N,).
+    """
+
+    return np.linalg.norm(coords[:, 1] - coords[:, 0], axis=1)
+
+
+def grid_cell_size(box_min, box_max):
+    """Choose the Cell Size for the Broad Phase Grid.
+
+    Note:
+        Starts from the mean of the largest box dimension of each edge, then doubles
+        the size until the total number of cells covered by all boxes is no more than
+        CELLS_PER_EDGE per edge, so long edges do not flood the grid.
+
+    Args:
+        box_min: Minimum corners of Edge Boxes, shape (N, 3)
+        box_max: Maximum corners of Edge Boxes, shape (N, 3)
+
+    Returns:
+        Cell Size as a Float.
+    """
+
+    extent = (box_max - box_min).max(axis=1)
+    cell_size = float(extent.mean()) if len(extent) else 1.0
+    if not np.isfinite(cell_size) or cell_size <= 0.0:
+        cell_size = 1.0
+    budget = CELLS_PER_EDGE * len(box_min)
+    while True:
+        spans = np.floor(box_max / cell_size) - np.floor(box_min / cell_size) + 1
+        if spans.prod(axis=1).sum() <= budget:
+            return cell_size
+        cell_size *= 2.0
+
+
+def boxes_overlap(box_min, box_max, first, second):
+    """Test Pairs of Boxes for Overlap.
+
+    Args:
+        box_min: Minimum corners of Edge Boxes, shape (N, 3)
+        box_max: Maximum corners of Edge Boxes, shape (N, 3)
+        first, second: Integer Arrays of Box positions to compare
+
+    Returns:
+        Boolean Array, True where the two boxes overlap.
+    """
+
+    return np.all(
+        (box_min[first] <= box_max[second]) & (box_min[second] <= box_max[first]), axis=1
+    )
+
+
+def candidate_pairs(coords, tolerance=BOX_TOLERANCE, active=None):
+    """Broad Phase: find Pairs of Edges whose Bounding Boxes overlap.
+
+    Note:
+        Edges are entered into a uniform grid keyed by the cells their boxes cover,
+        only edges sharing a cell are paired, then pairs are checked for real box
+        overlap. The work done depends on the number of overlapping boxes rather
+        than on the square of the number of edges.
+
+        When active is given only pairs with at least one active edge are returned,
+        cells holding no active edge are skipped altogether.
+
+    Args:
+        coords: Array of Edge Coordinates, shape (N, 2, 3)
+        tolerance: Fraction of each edge's length to grow its box by on every side
+        active: Optional Boolean Array, shape (N,), of Edges that need testing
+
+    Returns:
+        Integer Array of positions into coords, shape (M, 2), first < second, sorted.
+    """
+
+    num_edges = len(coords)
+    if num_edges < 2:
+        return np.empty((0, 2), dtype=np.int64)
+
+    box_min, box_max = edge_bounds(coords, tolerance)
+    cell_size = grid_cell_size(box_min, box_max)
+    cell_min = np.floor(box_min / cell_size).astype(np.int64)
+    cell_max = np.floor(box_max / cell_size).astype(np.int64)
+    spans = cell_max - cell_min + 1
+
+    # Enter every edge once for each cell its box covers.
+    counts = spans.prod(axis=1)
+    edge_ids = np.repeat(np.arange(num_edges), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    span_x = spans[edge_ids, 0]
+    span_y = spans[edge_ids, 1]
+    cell_x = cell_min[edge_ids, 0] + offsets % span_x
+    cell_y = cell_min[edge_ids, 1] + (offsets // span_x) % span_y
+    cell_z = cell_min[edge_ids, 2] + offsets // (span_x * span_y)
+
+    # Sort the entries by cell so each cell's edges are contiguous.
+    order = np.lexsort((edge_ids, cell_z, cell_y, cell_x))
+    edge_ids = edge_ids[order]
+    cells = np.stack((cell_x[order], cell_y[order], cell_z[order]), axis=1)
+    starts = np.flatnonzero(np.any(cells[1:] != cells[:-1], axis=1)) + 1
+    starts = np.concatenate(([0], starts, [len(edge_ids)]))
+
+    # Pair up the members of every cell, cells holding the same number of edges
+    # are handled together as the rows of one (cells, size) array.
+    sizes = np.diff(starts)
+    starts = starts[:-1]
+    if active is not None:
+        keep_cell = np.add.reduceat(active[edge_ids].astype(np.int64), starts) > 0
+        starts = starts[keep_cell]
+        sizes = sizes[keep_cell]
+    first = []
+    second = []
+    for size in np.unique(sizes[sizes > 1]):
+        rows = starts[sizes == size][:, None] + np.arange(size)
+        members = edge_ids[rows]
+        upper_a, upper_b = np.triu_indices(size, 1)
+        first.append(members[:, upper_a].ravel())
+        second.append(members[:, upper_b].ravel())
+    if not first:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # The same pair can meet in several cells, keep it once.
+    first = np.concatenate(first)
+    second = np.concatenate(second)
+    keys = np.unique(first * num_edges + second)
+    first, second = keys // num_edges, keys % num_edges
+    keep = boxes_overlap(box_min, box_max, first, second)
+    if active is not None:
+        keep &= active[first] | active[second]
+    return np.stack((first[keep], second[keep]), axis=1)
+
+
+def edge_keys(coords, decimals=KEY_DECIMALS):
+    """Return a Key for each Edge made from its Coordinates.
+
+    Note:
+        Coordinates are rounded to decimals places and the two ends put in order,
+        so an edge keeps its key however its vertices are numbered, and any move
+        of either end gives it a new key.
+
+    Args:
+        coords: Array of Edge Coordinates, shape (N, 2, 3)
+        decimals: Number of decimal places kept in the key
+
+    Returns:
+        List of bytes Keys.
+    """
+
+    rounded = np.round(coords, decimals) + 0.0
+    difference = rounded[:, 0] - rounded[:, 1]
+    first_diff = np.argmax(difference != 0.0, axis=1)
+    swap = difference[np.arange(len(rounded)), first_diff] > 0.0
+    rounded[swap] = rounded[swap, ::-1]
+    return [row.tobytes() for row in rounded.reshape(len(rounded), 6)]
+
+
+def shared_vertex_mask(vert_indices, first, second):
+    """Flag Pairs of Edges that share a Vertex.
+
+    Args:
+        vert_indices: Integer Array of each Edge's Vertex indices, shape (N, 2)
+        first, second: Integer Arrays of Edge positions to compare
+
+    Returns:
+        Boolean Array, True where the two edges have a vertex in common.
+    """
+
+    verts_a = vert_indices[first]
+    verts_b = vert_indices[second]
+    return (
+        (verts_a[:, 0] == verts_b[:, 0])
+        | (verts_a[:, 0] == verts_b[:, 1])
+        | (verts_a[:, 1] == verts_b[:, 0])
+        | (verts_a[:, 1] == verts_b[:, 1])
+    )
+
+
+def valid_pairs(coords, vert_indices, tolerance=BOX_TOLERANCE, active=None):
+    """Return the Candidate Pairs of Edges that do not share a Vertex.
+
+    Args:
+        coords: Array of Edge Coordinates, shape (N, 2, 3)
+        vert_indices: Integer Array of each Edge's Vertex indices, shape (N, 2)
+        tolerance: Fraction of each edge's length to grow its box by on every side
+        active: Optional Boolean Array of Edges that need testing, see candidate_pairs
+
+    Returns:
+        Integer Array of positions into coords, shape (M, 2).
+    """
+
+    pairs = candidate_pairs(coords, tolerance, active)
+    return pairs[~shared_vertex_mask(vert_indices, pairs[:, 0], pairs[:, 1])]
+
+
+def intersect_segments(segments_a, segments_b):
+    """Narrow Phase: intersect Pairs of Segments in one vectorised pass.
+
+    Note:
+        The intersection is the point of the first line closest to the second line.
+        Whether it counts is decided by pdt_predicates.segments_cross: the edges must
+        not be parallel, the lines must pass within tolerance of each other, and the
+        point must lie on both edges, or within tolerance of their ends. Tolerances
+        are relative to the edge lengths, rows too close to call in floating point
+        are decided exactly.
+
+    Args:
+        segments_a: First Segments, Float Array of shape (M, 2, 3)
+        segments_b: Second Segments, Float Array of shape (M, 2, 3)
+
+    Returns:
+        points: Intersection points on the first segments, shape (M, 3)
+        on_both: Boolean Array, True where the point lies on both segments
+        t_a: Parameter of each point along the first segment (0 at start, 1 at end)
+        t_b: Parameter of each point along the second segment.
+    """
+
+    start_a = segments_a[:, 0]
+    start_b = segments_b[:, 0]
+    dir_a = segments_a[:, 1] - start_a
+    dir_b = segments_b[:, 1] - start_b
+    offset = start_a - start_b
+
+    len_a = np.einsum("ij,ij->i", dir_a, dir_a)
+    len_b = np.einsum("ij,ij->i", dir_b, dir_b)
+    dot_ab = np.einsum("ij,ij->i", dir_a, dir_b)
+    dot_ao = np.einsum("ij,ij->i", dir_a, offset)
+    dot_bo = np.einsum("ij,ij->i", dir_b, offset)
+    normal = np.cross(dir_a, dir_b)
+    denom = np.einsum("ij,ij->i", normal, normal)
+
+    on_both = segments_cross(start_a, segments_a[:, 1], start_b, segments_b[:, 1])
+
+    # Points within tolerance beyond an end are moved onto that end.
+    safe_denom = np.where(on_both, denom, 1.0)
+    t_a = np.clip((dot_ab * dot_bo - dot_ao * len_b) / safe_denom, 0.0, 1.0)
+    t_b = np.clip((len_a * dot_bo - dot_ab * dot_ao) / safe_denom, 0.0, 1.0)
+    points = start_a + t_a[:, None] * dir_a
+    return points, on_both, t_a, t_b
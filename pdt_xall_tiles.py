@@ -0,0 +1,229 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Multi-process Intersect All for very large edge sets.
+#
+# The edge arrays are put in shared memory and the two widest axes of their bounding
+# box are cut into tiles, each tile is then intersected by a pool of worker processes
+# using pdt_xall_kernel. Like the kernel, nothing in here may import bpy, bmesh or
+# mathutils, the workers only ever see NumPy arrays.
+#
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.sharedctypes import RawArray
+
+import numpy as np
+
+from .pdt_xall_kernel import (
+    BOX_TOLERANCE, edge_bounds, edge_lengths, intersect_segments, valid_pairs
+)
+
+# Number of tiles made for each worker process, more tiles balance the load better
+# when the edges are not spread evenly.
+TILES_PER_PROCESS = 4
+
+# Shared arrays of the pool's worker processes, filled in by init_worker.
+_shared = {}
+
+
+def can_fork():
+    """Check that Worker Processes can be started by Forking.
+
+    Returns:
+        Boolean.
+    """
+
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def share_array(array):
+    """Copy an Array into Shared Memory.
+
+    Args:
+        array: Float64, Int64 or Boolean NumPy Array
+
+    Returns:
+        Shared ctypes Array, its NumPy dtype and shape.
+    """
+
+    array = np.ascontiguousarray(array)
+    type_code = {"f": "d", "i": "q", "b": "b"}[array.dtype.kind]
+    shared = RawArray(type_code, array.size)
+    np.frombuffer(shared, dtype=array.dtype)[:] = array.ravel()
+    return shared, array.dtype.str, array.shape
+
+
+def init_worker(layout, arrays):
+    """Set up a Worker Process, wrapping the Shared Arrays as NumPy Arrays.
+
+    Args:
+        layout: Tile axes, origin, size, counts and reach, see tile_layout
+        arrays: Dictionary of Shared Arrays, as returned by share_array, by name
+
+    Returns:
+        Nothing.
+    """
+
+    _shared.clear()
+    for name, (shared, dtype, shape) in arrays.items():
+        _shared[name] = np.frombuffer(shared, dtype=dtype).reshape(shape)
+    _shared["layout"] = layout
+
+
+def tile_of(points, tile_origin, tile_size, tile_counts):
+    """Return the Tile that owns each Point.
+
+    Note:
+        Tiles are half open, so a point on a boundary belongs to just one tile,
+        points beyond the outer tiles belong to the nearest one.
+
+    Args:
+        points: Array of Coordinates on the two tile axes, shape (M, 2)
+        tile_origin, tile_size, tile_counts: Tile layout, see tile_layout
+
+    Returns:
+        Integer Array of Tile positions, shape (M, 2).
+    """
+
+    cells = np.floor((points - tile_origin) / tile_size).astype(np.int64)
+    return np.clip(cells, 0, tile_counts - 1)
+
+
+def tile_worker(tile):
+    """Intersect the Edges of one Tile.
+
+    Note:
+        Hits whose point lies in another tile are dropped here, that tile finds
+        the same hit from the same pair, so every hit is returned only once. When
+        owners are shared, pairs of edges with the same owner are not intersected.
+
+    Args:
+        tile: Position of the Tile, (column, row)
+
+    Returns:
+        Pairs of Edge positions, shape (K, 2), their Intersection points, shape (K, 3),
+        and the Parameters of the points along each of the two Edges.
+    """
+
+    coords = _shared["coords"]
+    tile_axes, tile_origin, tile_size, tile_counts, reach = _shared["layout"]
+    tile = np.asarray(tile)
+
+    # Take every edge that comes within reach of the tile, edges are kept in order
+    # so each pair is tested the same way whichever tile it is found in.
+    low = tile_origin + tile * tile_size - reach
+    high = tile_origin + (tile + 1) * tile_size + reach
+    ends = coords[:, :, tile_axes]
+    inside = (ends.max(axis=1) >= low) & (ends.min(axis=1) <= high)
+    members = np.flatnonzero(np.all(inside, axis=1))
+
+    active = _shared.get("active")
+    pairs = valid_pairs(
+        coords[members], _shared["vert_indices"][members],
+        active=None if active is None else active[members],
+    )
+    pairs = members[pairs]
+    owners = _shared.get("owners")
+    if owners is not None:
+        pairs = pairs[owners[pairs[:, 0]] != owners[pairs[:, 1]]]
+    points, on_both, t_a, t_b = intersect_segments(coords[pairs[:, 0]], coords[pairs[:, 1]])
+    owner = tile_of(points[:, tile_axes], tile_origin, tile_size, tile_counts)
+    keep = on_both & np.all(owner == tile, axis=1)
+    return pairs[keep], points[keep], t_a[keep], t_b[keep]
+
+
+def tile_layout(coords, processes):
+    """Lay out the Tiles over the two widest Axes of the Edges.
+
+    Args:
+        coords: Array of Edge Coordinates, shape (N, 2, 3)
+        processes: Number of worker processes
+
+    Returns:
+        The two axes the tiles are laid out on, the lowest corner of the tiles on
+        those axes, the size of a tile, the number of tiles along each axis and how
+        far beyond a tile an edge may be and still touch an edge within it.
+    """
+
+    box_min, box_max = edge_bounds(coords)
+    low = box_min.min(axis=0)
+    high = box_max.max(axis=0)
+    extent = np.maximum(high - low, 1.0e-9)
+    tile_axes = np.sort(np.argsort(extent)[-2:])
+    extent = extent[tile_axes]
+    num_tiles = max(processes * TILES_PER_PROCESS, 1)
+
+    # Share the tiles between the two axes in proportion to their extent.
+    ratio = extent[0] / extent[1]
+    columns = int(np.clip(np.round(np.sqrt(num_tiles * ratio)), 1, num_tiles))
+    rows = max(num_tiles // columns, 1)
+    tile_counts = np.array([columns, rows], dtype=np.int64)
+    reach = 2.0 * BOX_TOLERANCE * edge_lengths(coords).max()
+    return tile_axes, low[tile_axes], extent / tile_counts, tile_counts, reach
+
+
+def tiled_intersections(coords, vert_indices, processes, active=None, owners=None):
+    """Intersect all Pairs of Edges using a Pool of Worker Processes.
+
+    Note:
+        Uses the "fork" start method, so the workers share the arrays without
+        copying and without importing Blender modules again. This is available on
+        Linux and macOS, including background Blender (blender -b).
+
+    Args:
+        coords: Array of Edge Coordinates, shape (N, 2, 3)
+        vert_indices: Integer Array of each Edge's Vertex indices, shape (N, 2)
+        processes: Number of worker processes
+        active: Optional Boolean Array of Edges that need testing, see candidate_pairs
+        owners: Optional Integer Array, shape (N,), only Edges of different owners
+            are intersected
+
+    Returns:
+        Pairs of Edge positions, shape (K, 2), their Intersection points, shape (K, 3),
+        and the Parameters of the points along each of the two Edges, like
+        intersect_segments but holding only the pairs that intersect.
+    """
+
+    layout = tile_layout(coords, processes)
+    tile_counts = layout[3]
+    arrays = {
+        "coords": share_array(coords.astype(np.float64)),
+        "vert_indices": share_array(vert_indices.astype(np.int64)),
+    }
+    if active is not None:
+        arrays["active"] = share_array(active.astype(bool))
+    if owners is not None:
+        arrays["owners"] = share_array(owners.astype(np.int64))
+    tiles = [(column, row) for column in range(tile_counts[0]) for row in range(tile_counts[1])]
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=init_worker,
+        initargs=(layout, arrays),
+    ) as pool:
+        results = list(pool.map(tile_worker, tiles))
+
+    pairs, points, t_a, t_b = (np.concatenate(parts) for parts in zip(*results))
+    return pairs, points, t_a, t_b
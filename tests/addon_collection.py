@@ -0,0 +1,50 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Pytest Plugin, loaded by pytest.ini, that collects the Add-on's Folder as a plain
+# Directory. The Folder holds an __init__.py, so pytest would otherwise collect it
+# as a Package and import that __init__, which registers the Add-on with Blender.
+#
+import os
+
+import pytest
+
+ADDON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collect_directory(path, parent):
+    """Collect the Add-on's Folder as a Directory rather than a Package.
+
+    Args:
+        path: Path of the Directory
+        parent: Parent Collector
+
+    Returns:
+        Directory Collector, or None to leave other directories to pytest.
+    """
+
+    if str(path) == ADDON_DIR:
+        return pytest.Dir.from_parent(parent, path=path)
+    return None
@@ -0,0 +1,48 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Test Set-up, run with plain Python:
+#     python -m pytest tests
+#
+# The stand-ins in benchmarks/standins.py take the place of the Blender modules,
+# and the Add-on's folder is imported as the package "pdt_addon", without running
+# its __init__, so only modules that work outside Blender can be tested.
+#
+import os
+import sys
+import types
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+ADDON_DIR = os.path.dirname(TESTS_DIR)
+
+sys.path.insert(0, os.path.join(ADDON_DIR, "benchmarks"))
+import standins  # noqa: E402
+
+standins.install()
+
+if "pdt_addon" not in sys.modules:
+    package = types.ModuleType("pdt_addon")
+    package.__path__ = [ADDON_DIR]
+    sys.modules["pdt_addon"] = package
+
@@ -0,0 +1,118 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Tests of the M command's Expression Whitelist, see pdt_maths.
+#
+import types
+
+import pytest
+
+from mathutils import Vector
+from pdt_addon import pdt_maths
+
+
+def make_context():
+    """A Context holding the PDT Settings the Expressions can read."""
+    pg = types.SimpleNamespace(
+        distance=2.0, angle=30.0, percent=50.0, cartesian_coords=(1.0, 2.0, 3.0),
+        pivot_loc=(0.0, 0.0, 0.0),
+    )
+    cursor = types.SimpleNamespace(location=types.SimpleNamespace(copy=lambda: Vector()))
+    return types.SimpleNamespace(scene=types.SimpleNamespace(pdt_pg=pg, cursor=cursor))
+
+
+@pytest.fixture
+def context():
+    pdt_maths.user_variables.clear()
+    yield make_context()
+    pdt_maths.user_variables.clear()
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("sqrt(3**2 + 4**2)", 5.0),
+        ("round(2.567, 2)", 2.57),
+        ("ldexp(1, 3)", 8.0),
+        ("isqrt(16)", 4.0),
+        ("gcd(4, 6)", 2.0),
+        ("distance * 2", 4.0),
+        ("7 // 2 + 7 % 2", 4.0),
+    ],
+)
+def test_evaluate(context, expression, expected):
+    assert pdt_maths.evaluate(expression, context) == pytest.approx(expected)
+
+
+def test_tuples_are_vectors(context):
+    result = pdt_maths.evaluate("(1, 2, 3)", context)
+    assert isinstance(result, Vector)
+    assert tuple(result) == (1.0, 2.0, 3.0)
+
+
+@pytest.mark.parametrize(
+    "expression",
+    [
+        "__import__('os')",
+        "(1).__class__",
+        "coords.__class__",
+        "lambda: 1",
+        "[x for x in (1, 2)]",
+        "{x for x in (1, 2)}",
+        "sum(x for x in (1, 2))",
+        "'text'",
+        "b'bytes'",
+        "round(2.5, ndigits=1)",
+        "_power(2, 3)",
+        "open('file')",
+        "x if 1 else 2",
+        "1 < 2",
+        "r = 2",
+    ],
+)
+def test_rejected(context, expression):
+    with pytest.raises(pdt_maths.PDT_MathsError):
+        pdt_maths.evaluate(expression, context)
+
+
+def test_huge_power_fails(context):
+    with pytest.raises(pdt_maths.PDT_MathsError):
+        pdt_maths.evaluate("9**9**9", context)
+
+
+def test_variable_round_trip(context):
+    assert pdt_maths.assign("r = 2.5", context) == 2.5
+    assert pdt_maths.assign("r*2", context) == 5.0
+
+
+@pytest.mark.parametrize("name", ["sqrt", "distance", "_hidden", "pi"])
+def test_reserved_names_not_assigned(context, name):
+    with pytest.raises(pdt_maths.PDT_MathsError):
+        pdt_maths.assign(f"{name} = 1", context)
+
+
+def test_plot_values(context):
+    t_values, result = pdt_maths.plot_values("(t, t**2)", 0.0, 1.0, 3, context)
+    assert t_values.tolist() == [0.0, 0.5, 1.0]
+    assert result.tolist() == [[0.0, 0.0], [0.5, 0.25], [1.0, 1.0]]
@@ -0,0 +1,149 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Tests of the Robust Edge Predicates, see pdt_predicates.
+#
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from pdt_addon import pdt_predicates
+
+
+def cross(start_a, end_a, start_b, end_b):
+    """Whether one Pair of Edges crosses."""
+    return bool(pdt_predicates.segments_cross([start_a], [end_a], [start_b], [end_b])[0])
+
+
+def exact_cross(start_a, end_a, start_b, end_b):
+    """Whether one Pair of Edges crosses, worked out with Fractions only."""
+    points = [tuple(Fraction(float(value)) for value in point)
+              for point in (start_a, end_a, start_b, end_b)]
+    terms = pdt_predicates.crossing_terms(*points, True)
+    return pdt_predicates.crossing_rule(terms, lambda term: term < 0, lambda term: term <= 0)
+
+
+@pytest.fixture
+def fraction_count(monkeypatch):
+    """Count the Fractions made, that is the uses of the exact fallback."""
+    count = [0]
+
+    class CountedFraction(Fraction):
+        def __new__(cls, *args):
+            count[0] += 1
+            return Fraction.__new__(cls, *args)
+
+    monkeypatch.setattr(pdt_predicates, "Fraction", CountedFraction)
+    return count
+
+
+@pytest.mark.parametrize(
+    "edges, expected",
+    [
+        # Crossing in the middle, and apart.
+        (((0, 0, 0), (2, 2, 0), (0, 2, 0), (2, 0, 0)), True),
+        (((0, 0, 0), (1, 0, 0), (0, 1, 0), (1, 1, 0)), False),
+        # T-junction, the end of one edge on the middle of the other.
+        (((0, 0, 0), (2, 0, 0), (1, 0, 0), (1, 1, 0)), True),
+        # Endpoints touching, at a corner.
+        (((0, 0, 0), (1, 0, 0), (1, 0, 0), (1, 1, 0)), True),
+        # Collinear overlap, parallel edges never cross.
+        (((0, 0, 0), (2, 0, 0), (1, 0, 0), (3, 0, 0)), False),
+        # Just past an end, outside and inside tolerance.
+        (((0, 0, 0), (1, 0, 0), (1.001, -1, 0), (1.001, 1, 0)), False),
+        (((0, 0, 0), (1, 0, 0), (1.000001, -1, 0), (1.000001, 1, 0)), True),
+        # Skew lines, apart and within tolerance.
+        (((0, 0, 0), (2, 0, 0), (1, -1, 1), (1, 1, 1)), False),
+        (((0, 0, 0), (2, 0, 0), (1, -1, 1e-6), (1, 1, 1e-6)), True),
+        # Near parallel, below and above PARALLEL_TOLERANCE.
+        (((-1, 0, 0), (1, 0, 0), (-1, -1e-7, 0), (1, 1e-7, 0)), False),
+        (((-1, 0, 0), (1, 0, 0), (-1, -1e-5, 0), (1, 1e-5, 0)), True),
+    ],
+)
+def test_segments_cross(edges, expected):
+    assert cross(*edges) is expected
+    assert exact_cross(*edges) is expected
+
+
+def test_near_parallel_falls_back_to_exact(fraction_count):
+    # The lines' angle is within a few ulps of PARALLEL_TOLERANCE, too close for the
+    # floating point filter, the answer changes between neighbouring floats.
+    boundary = 1.0e-6 / np.sqrt(1.0 - 1.0e-12)
+    answers = []
+    for step in range(-3, 4):
+        offset = boundary + step * np.spacing(boundary)
+        edges = ((-1, 0, 0), (1, 0, 0), (-1, -offset, 0), (1, offset, 0))
+        fraction_count[0] = 0
+        answers.append(cross(*edges))
+        assert fraction_count[0] > 0
+        assert answers[-1] is exact_cross(*edges)
+    assert answers[0] is False and answers[-1] is True
+
+
+def test_clear_cases_need_no_fallback(fraction_count):
+    cross((0, 0, 0), (2, 2, 0), (0, 2, 0), (2, 0, 0))
+    cross((0, 0, 0), (2, 0, 0), (1, 0, 0), (1, 1, 0))
+    assert fraction_count[0] == 0
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_filter_matches_exact(seed):
+    # Small integer grids give many touches, T-junctions and collinear overlaps,
+    # nearly parallel pairs and tiny offsets give rows near every threshold.
+    rng = np.random.default_rng(seed)
+    grid = rng.integers(0, 4, (200, 4, 3)).astype(np.float64)
+    grid[:100, :, 2] = 0.0
+    angle = 10.0 ** rng.uniform(-8.0, -4.0, 100)
+    near = np.zeros((100, 4, 3))
+    near[:, 0, 0], near[:, 1, 0] = -1.0, 1.0
+    near[:, 2] = np.stack((-np.cos(angle), -np.sin(angle), np.zeros(100)), axis=1)
+    near[:, 3] = -near[:, 2]
+    nudged = grid[:100] + rng.normal(0.0, 1.0e-12, (100, 4, 3))
+    points = np.concatenate((grid, near, nudged))
+
+    result = pdt_predicates.segments_cross(*points.transpose(1, 0, 2))
+    expected = [exact_cross(*row) for row in points]
+    assert result.tolist() == expected
+
+
+def test_lines_close():
+    assert pdt_predicates.lines_close(((0, 0, 0), (1, 0, 0)), ((0, 1, 0), (1, 1, 0))) is None
+    assert pdt_predicates.lines_close(((0, 0, 0), (1, 0, 0)), ((5, -1, 0), (5, 1, 0))) is True
+    assert pdt_predicates.lines_close(((0, 0, 0), (1, 0, 0)), ((5, -1, 1), (5, 1, 1))) is False
+
+
+@pytest.mark.parametrize(
+    "point, edge, expected",
+    [
+        ((0.5, 0, 0), ((0, 0, 0), (1, 0, 0)), True),
+        ((1, 0, 0), ((0, 0, 0), (1, 0, 0)), True),
+        ((1.001, 0, 0), ((0, 0, 0), (1, 0, 0)), False),
+        ((0.5, 0.001, 0), ((0, 0, 0), (1, 0, 0)), False),
+        ((1, 1, 1), ((1, 1, 1), (1, 1, 1)), True),
+        ((1, 1, 1.0 + 1e-12), ((1, 1, 1), (1, 1, 1)), False),
+    ],
+)
+def test_point_on_segment(point, edge, expected):
+    assert bool(pdt_predicates.point_on_segment(point, *edge)) is expected
@@ -0,0 +1,71 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Tests of Finding the Regions to Fill, see pdt_regions.
+#
+import numpy as np
+
+from pdt_addon import pdt_regions
+
+
+def square(low, high):
+    """Corners of a Square, and the Edges round it."""
+    coords = [(low, low), (high, low), (high, high), (low, high)]
+    return coords, [(0, 1), (1, 2), (2, 3), (3, 0)]
+
+
+def test_region_cycles_grid():
+    # Two squares side by side, sharing an edge, with a dangling edge.
+    coords = [(0, 0), (1, 0), (2, 0), (0, 1), (1, 1), (2, 1), (3, 1)]
+    edges = [(0, 1), (1, 2), (0, 3), (1, 4), (2, 5), (3, 4), (4, 5), (5, 6)]
+    cycles = pdt_regions.region_cycles(coords, edges)
+    assert sorted(sorted(cycle) for cycle in cycles) == [[0, 1, 3, 4], [1, 2, 4, 5]]
+    assert not pdt_regions.island_regions(coords, cycles).any()
+
+
+def test_island_regions():
+    # A room with a column standing in it, and a second room beside it.
+    room, room_edges = square(0, 10)
+    column, column_edges = square(4, 6)
+    other, other_edges = square(20, 30)
+    coords = room + column + other
+    edges = room_edges + [(a + 4, b + 4) for a, b in column_edges]
+    edges += [(a + 8, b + 8) for a, b in other_edges]
+    cycles = pdt_regions.region_cycles(coords, edges)
+    islands = pdt_regions.island_regions(coords, cycles)
+    holding = [sorted(cycle) for cycle, island in zip(cycles, islands) if island]
+    assert len(cycles) == 3
+    assert holding == [[0, 1, 2, 3]]
+
+
+def test_island_regions_concave():
+    # The notch of a U shape is outside it, a square standing in the notch is no island.
+    coords = [(0, 0), (3, 0), (3, 3), (2, 3), (2, 1), (1, 1), (1, 3), (0, 3)]
+    edges = [(index, (index + 1) % 8) for index in range(8)]
+    block, block_edges = square(1.25, 1.75)
+    coords = coords + [(x, y + 1) for x, y in block]
+    edges += [(a + 8, b + 8) for a, b in block_edges]
+    cycles = pdt_regions.region_cycles(np.array(coords), edges)
+    assert len(cycles) == 2
+    assert not pdt_regions.island_regions(coords, cycles).any()
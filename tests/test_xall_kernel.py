@@ -0,0 +1,113 @@
+# ##### BEGIN GPL LICENSE BLOCK #####
+#
+#  This program is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either version 2
+#  of the License, or (at your option) any later version.
+#
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public License
+#  along with this program; if not, write to the Free Software Foundation,
+#  Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
+#
+# ##### END GPL LICENSE BLOCK #####
+#
+# <pep8 compliant>
+#
+# -----------------------------------------------------------------------
+# Author: Alan Odom (Clockmender), Rune Morling (ermo) Copyright (c) 2019
+# -----------------------------------------------------------------------
+#
+# Tests of the Broad Phase Grid and Narrow Phase, see pdt_xall_kernel.
+#
+import numpy as np
+import pytest
+
+from pdt_addon import pdt_xall_kernel
+
+
+def edge_soup(seed, num_edges=300):
+    """Random Edges of very mixed lengths, some axis aligned and some degenerate."""
+    rng = np.random.default_rng(seed)
+    starts = rng.uniform(-10.0, 10.0, (num_edges, 3))
+    lengths = 10.0 ** rng.uniform(-3.0, 1.5, (num_edges, 1))
+    ends = starts + lengths * rng.normal(size=(num_edges, 3))
+    ends[::7, 2] = starts[::7, 2]
+    ends[::23] = starts[::23]
+    return np.stack((starts, ends), axis=1), rng
+
+
+def brute_force_pairs(coords, active=None):
+    """All Pairs i < j whose Boxes overlap, checking every pair."""
+    box_min, box_max = pdt_xall_kernel.edge_bounds(coords)
+    first, second = np.triu_indices(len(coords), k=1)
+    keep = pdt_xall_kernel.boxes_overlap(box_min, box_max, first, second)
+    if active is not None:
+        keep &= active[first] | active[second]
+    return np.stack((first[keep], second[keep]), axis=1)
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_grid_cell_size_budget(seed):
+    coords, _ = edge_soup(seed)
+    box_min, box_max = pdt_xall_kernel.edge_bounds(coords)
+    cell_size = pdt_xall_kernel.grid_cell_size(box_min, box_max)
+    spans = np.floor(box_max / cell_size) - np.floor(box_min / cell_size) + 1
+    assert cell_size > 0.0
+    assert spans.prod(axis=1).sum() <= pdt_xall_kernel.CELLS_PER_EDGE * len(coords)
+
+
+def test_grid_cell_size_degenerate():
+    points = np.zeros((4, 3))
+    assert pdt_xall_kernel.grid_cell_size(points, points) == 1.0
+    empty = np.empty((0, 3))
+    assert pdt_xall_kernel.grid_cell_size(empty, empty) == 1.0
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_candidate_pairs_match_brute_force(seed):
+    coords, _ = edge_soup(seed)
+    pairs = pdt_xall_kernel.candidate_pairs(coords)
+    assert len(pairs)
+    assert np.all(pairs[:, 0] < pairs[:, 1])
+    np.testing.assert_array_equal(pairs, brute_force_pairs(coords))
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_candidate_pairs_active(seed):
+    coords, rng = edge_soup(seed)
+    active = rng.random(len(coords)) < 0.2
+    pairs = pdt_xall_kernel.candidate_pairs(coords, active=active)
+    np.testing.assert_array_equal(pairs, brute_force_pairs(coords, active))
+
+
+def test_candidate_pairs_few_edges():
+    coords = np.zeros((1, 2, 3))
+    assert pdt_xall_kernel.candidate_pairs(coords).shape == (0, 2)
+
+
+def test_valid_pairs_skip_shared_vertices():
+    coords = np.array(
+        [[[0, 0, 0], [2, 0, 0]], [[2, 0, 0], [2, 2, 0]], [[1, -1, 0], [1, 1, 0]]], dtype=float
+    )
+    vert_indices = np.array([[0, 1], [1, 2], [3, 4]])
+    pairs = pdt_xall_kernel.valid_pairs(coords, vert_indices)
+    assert pairs.tolist() == [[0, 2]]
+
+
+def test_intersect_segments():
+    segments_a = np.array(
+        [[[0, 0, 0], [2, 2, 0]], [[0, 0, 0], [2, 0, 0]], [[0, 0, 0], [1, 0, 0]]], dtype=float
+    )
+    segments_b = np.array(
+        [[[0, 2, 0], [2, 0, 0]], [[1, 0, 0], [1, 1, 0]], [[0, 1, 0], [1, 1, 0]]], dtype=float
+    )
+    points, on_both, t_a, t_b = pdt_xall_kernel.intersect_segments(segments_a, segments_b)
+    assert on_both.tolist() == [True, True, False]
+    np.testing.assert_allclose(points[:2], [[1, 1, 0], [1, 0, 0]])
+    np.testing.assert_allclose(t_a[:2], [0.5, 0.5])
+    np.testing.assert_allclose(t_b[:2], [0.5, 0.0])